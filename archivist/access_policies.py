@@ -35,6 +35,7 @@ from .constants import (
     ACCESS_POLICIES_LABEL,
     ASSETS_LABEL,
 )
+from .cursor import ListCursor
 from .dictmerge import _deepmerge
 
 
@@ -206,7 +207,12 @@ class _AccessPoliciesClient:
         return self._archivist.count(self._label, params=params)
 
     def list(
-        self, *, page_size: Optional[int] = None, display_name: Optional[str] = None
+        self,
+        *,
+        page_size: Optional[int] = None,
+        prefetch: int = 0,
+        cursor: Optional[ListCursor] = None,
+        display_name: Optional[str] = None,
     ) -> Generator[AccessPolicy, None, None]:
         """List access policies.
 
@@ -215,25 +221,35 @@ class _AccessPoliciesClient:
         Args:
             display_name (str): display name (optional0
             page_size (int): optional page size. (Rarely used).
+            prefetch (int): optional number of pages fetched in the background.
+            cursor (ListCursor): optional cursor to record or resume the listing.
 
         Returns:
             iterable that returns :class:`AccessPolicy` instances
 
         """
         params = {"display_name": display_name} if display_name is not None else None
-        return (
+        # a generator function so that no request is made until iterated
+        yield from (
             AccessPolicy(**a)
             for a in self._archivist.list(
                 self._label,
                 ACCESS_POLICIES_LABEL,
                 page_size=page_size,
+                prefetch=prefetch,
+                cursor=cursor,
                 params=params,
             )
         )
 
     # additional queries on different endpoints
     def list_matching_assets(
-        self, access_policy_id: str, *, page_size: Optional[int] = None
+        self,
+        access_policy_id: str,
+        *,
+        page_size: Optional[int] = None,
+        prefetch: int = 0,
+        cursor: Optional[ListCursor] = None,
     ) -> Generator[Asset, None, None]:
         """List matching assets.
 
@@ -242,22 +258,32 @@ class _AccessPoliciesClient:
         Args:
             access_policy_id (str): e.g. access_policies/xxxxxxxxxxxxxxx
             page_size (int): optional page size. (Rarely used).
+            prefetch (int): optional number of pages fetched in the background.
+            cursor (ListCursor): optional cursor to record or resume the listing.
 
         Returns:
             iterable that returns :class:`Asset` instances
 
         """
-        return (
+        # a generator function so that no request is made until iterated
+        yield from (
             Asset(**a)
             for a in self._archivist.list(
                 f"{self._subpath}/{access_policy_id}/{ASSETS_LABEL}",
                 ASSETS_LABEL,
                 page_size=page_size,
+                prefetch=prefetch,
+                cursor=cursor,
             )
         )
 
     def list_matching_access_policies(
-        self, asset_id: str, *, page_size: Optional[int] = None
+        self,
+        asset_id: str,
+        *,
+        page_size: Optional[int] = None,
+        prefetch: int = 0,
+        cursor: Optional[ListCursor] = None,
     ) -> Generator[AccessPolicy, None, None]:
         """List matching access policies.
 
@@ -266,16 +292,21 @@ class _AccessPoliciesClient:
         Args:
             asset_id (str): e.g. assets/xxxxxxxxxxxxxxx
             page_size (int): optional page size. (Rarely used).
+            prefetch (int): optional number of pages fetched in the background.
+            cursor (ListCursor): optional cursor to record or resume the listing.
 
         Returns:
             iterable that returns :class:`AccessPolicy` instances
 
         """
-        return (
+        # a generator function so that no request is made until iterated
+        yield from (
             AccessPolicy(**a)
             for a in self._archivist.list(
                 f"{self._subpath}/{asset_id}/{ACCESS_POLICIES_LABEL}",
                 ACCESS_POLICIES_LABEL,
                 page_size=page_size,
+                prefetch=prefetch,
+                cursor=cursor,
             )
         )
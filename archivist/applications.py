@@ -33,6 +33,7 @@ from .constants import (
     APPLICATIONS_LABEL,
     APPLICATIONS_REGENERATE,
 )
+from .cursor import ListCursor
 from .dictmerge import _deepmerge
 
 
@@ -177,6 +178,8 @@ class _ApplicationsClient:
         self,
         *,
         page_size: Optional[int] = None,
+        prefetch: int = 0,
+        cursor: Optional[ListCursor] = None,
         display_name: Optional[str] = None,
     ):
         """List applications.
@@ -186,6 +189,8 @@ class _ApplicationsClient:
         Args:
             display_name (str): display name (optional)
             page_size (int): optional page size. (Rarely used).
+            prefetch (int): optional number of pages fetched in the background.
+            cursor (ListCursor): optional cursor to record or resume the listing.
 
         Returns:
             iterable that returns :class:`Application` instances
@@ -197,6 +202,8 @@ class _ApplicationsClient:
                 self._label,
                 APPLICATIONS_LABEL,
                 page_size=page_size,
+                prefetch=prefetch,
+                cursor=cursor,
                 params=self.__params(display_name=display_name),
             )
         )
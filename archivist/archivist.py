@@ -32,23 +32,33 @@
 from __future__ import annotations
 from logging import getLogger
 from copy import deepcopy
-from time import time
 from typing import Any, BinaryIO, Optional, Tuple
 
+from requests.models import Response
 from requests_toolbelt.multipart.encoder import MultipartEncoder
 
-from .confirmer import MAX_TIME
+from .confirmer import MAX_TIME, _BackgroundConfirmer
 from .constants import (
     ROOT,
     SEP,
+    UPLOAD_CONCURRENCY,
 )
+from .conditional import ConditionalCache
+from .blobcache import BlobCache
 from .dictmerge import _dotdict
+from .entitycache import EntityCache
 from .errors import (
     _parse_response,
     ArchivistError,
 )
 from .archivistpublic import ArchivistPublic
-from .retry429 import retry_429
+from .pool import PoolOptions
+from .hooks import Hooks
+from .ratelimit import RateLimiter
+from .retry import RetryPolicy, _retry
+from .ringbuffer import RingBufferMode
+from .tokencache import FileTokenCache, _token_key
+from .tokens import _TokenManager
 
 from .access_policies import _AccessPoliciesClient
 from .appidp import _AppIDPClient
@@ -82,6 +92,25 @@ class Archivist(ArchivistPublic):  # pylint: disable=too-many-instance-attribute
         Appregistration ID and secret.
         verify: if True the certificate is verified
         max_time (float): maximum time in seconds to wait for confirmation
+        pool (PoolOptions): optional connection pool options. The session
+            is safe to share between threads.
+        retry (RetryPolicy): optional policy for retrying failed requests.
+        rate_limiter (RateLimiter): optional client-side rate limiter. May be
+            shared between instances.
+        hooks (list): optional list of :class:`Hooks` called for every request
+            e.g. a :class:`MetricsCollector`.
+        ring_buffer (RingBufferMode): what is retained of the most recent
+            responses. Defaults to the full responses.
+        conditional_cache (ConditionalCache): optional cache of response
+            validators and bodies for conditional GETs. Shared with copies.
+        token_cache (FileTokenCache): optional on-disk cache of app registration
+            tokens shared with other processes.
+        entity_cache (EntityCache): optional cache of entities read by identity.
+            Shared with copies.
+        blob_cache (BlobCache): optional on-disk cache of downloaded blobs
+            keyed by their SHA-256. Shared with copies.
+        upload_concurrency (int): maximum number of attachments uploaded
+            concurrently when creating an asset or event.
 
     """
 
@@ -104,7 +133,7 @@ class Archivist(ArchivistPublic):  # pylint: disable=too-many-instance-attribute
         "tenancies": _TenanciesClient,
     }
 
-    def __init__(
+    def __init__(  # pylint: disable=too-many-arguments
         self,
         url: str,
         auth: str | Tuple[str, str] | None,
@@ -112,21 +141,47 @@ class Archivist(ArchivistPublic):  # pylint: disable=too-many-instance-attribute
         fixtures: Optional[dict[str, dict[Any, Any]]] = None,
         verify: bool = True,
         max_time: float = MAX_TIME,
+        pool: Optional[PoolOptions] = None,
+        retry: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        hooks: Optional[list[Hooks]] = None,
+        ring_buffer: RingBufferMode = RingBufferMode.FULL,
+        conditional_cache: Optional[ConditionalCache] = None,
+        token_cache: Optional[FileTokenCache] = None,
+        entity_cache: Optional[EntityCache] = None,
+        upload_concurrency: int = UPLOAD_CONCURRENCY,
+        blob_cache: Optional[BlobCache] = None,
     ):
         super().__init__(
             fixtures=fixtures,
             verify=verify,
             max_time=max_time,
+            pool=pool,
+            retry=retry,
+            rate_limiter=rate_limiter,
+            hooks=hooks,
+            ring_buffer=ring_buffer,
+            conditional_cache=conditional_cache,
+            blob_cache=blob_cache,
         )
 
         if isinstance(auth, tuple):
             self._machine_auth = auth
             self._auth = None
+            self._tokens = _TokenManager(
+                lambda: self.appidp.token(*auth),
+                cache=token_cache,
+                key=_token_key(url, auth[0]),
+            )
         else:
             self._auth = auth
             self._machine_auth = None
+            self._tokens = None
 
-        self._expires_at = 0
+        self._token_cache = token_cache
+        self._entity_cache = entity_cache
+        self._upload_concurrency = upload_concurrency
+        self._confirmer = _BackgroundConfirmer()
         if url.endswith("/"):
             raise ArchivistError(f"URL {url} has trailing /")
 
@@ -171,6 +226,15 @@ class Archivist(ArchivistPublic):  # pylint: disable=too-many-instance-attribute
         super().__setattr__(value, c)
         return c
 
+    def close(self):
+        """stops confirming in the background and closes current session if open
+
+        Futures returned by submit() methods that are not yet resolved fail.
+        """
+        confirmer, self._confirmer = self._confirmer, _BackgroundConfirmer()
+        confirmer.close()
+        super().close()
+
     @property
     def public(self) -> bool:
         """Not a public interface"""
@@ -188,18 +252,15 @@ class Archivist(ArchivistPublic):  # pylint: disable=too-many-instance-attribute
 
     @property
     def auth(self) -> str | None:
-        """str: authorization token"""
+        """str: authorization token
 
-        if self._auth is None and self._machine_auth is None:
-            return None
+        An app registration token is refreshed in the background before it
+        expires. Only the first request or a request after expiry waits for
+        the token.
+        """
 
-        if self._machine_auth and self._expires_at < time():
-            apptoken = self.appidp.token(*self._machine_auth)
-            self._auth = apptoken.get("access_token")
-            if self._auth is None:
-                raise ArchivistError("Auth token from client id,secret is invalid")
-            self._expires_at = time() + apptoken["expires_in"] - 10  # fudge factor
-            LOGGER.info("Refresh token")
+        if self._tokens is not None:
+            return self._tokens.token()
 
         return self._auth
 
@@ -210,16 +271,88 @@ class Archivist(ArchivistPublic):  # pylint: disable=too-many-instance-attribute
             fixtures=deepcopy(self._fixtures),
             verify=self._verify,
             max_time=self._max_time,
+            pool=self._pool,
+            retry=self._retrier.policy,
+            rate_limiter=self._rate_limiter,
+            hooks=self._hooks,
+            ring_buffer=self._response_ring_buffer.mode,
+            conditional_cache=self._conditional_cache,
+            blob_cache=self._blob_cache,
         )
 
     def __copy__(self) -> Archivist:
-        return Archivist(
+        arch = Archivist(
             self._url,
-            self.auth,
+            self._machine_auth or self._auth,
             fixtures=deepcopy(self._fixtures),
             verify=self._verify,
             max_time=self._max_time,
+            pool=self._pool,
+            retry=self._retrier.policy,
+            rate_limiter=self._rate_limiter,
+            hooks=self._hooks,
+            ring_buffer=self._response_ring_buffer.mode,
+            conditional_cache=self._conditional_cache,
+            token_cache=self._token_cache,
+            entity_cache=self._entity_cache,
+            upload_concurrency=self._upload_concurrency,
+            blob_cache=self._blob_cache,
         )
+        # copies share the app registration token
+        arch._tokens = self._tokens  # pylint: disable=protected-access
+        # copies share the learned confirmation latencies
+        arch._poller = self._poller  # pylint: disable=protected-access
+        return arch
+
+    @property
+    def entity_cache(self) -> EntityCache | None:
+        """EntityCache: Returns the entity cache if any"""
+        return self._entity_cache
+
+    @property
+    def upload_concurrency(self) -> int:
+        """int: Returns the maximum number of concurrent attachment uploads"""
+        return self._upload_concurrency
+
+    def _request(self, method: str, url: str, **kwargs) -> Response:
+        try:
+            return super()._request(method, url, **kwargs)
+        finally:
+            # a write may have been applied even if no response was received
+            if method != "get" and self._entity_cache is not None:
+                self._entity_cache.invalidate(url)
+
+    def get(
+        self,
+        url: str,
+        *,
+        headers: Optional[dict[str, str]] = None,
+        params: Optional[dict[str, Any]] = None,
+    ) -> dict[str, Any]:
+        """GET method (REST)
+
+        Entities are read through the entity cache if any.
+
+        Args:
+            url (str): e.g. https://app.rkvst.io/archivist/v2/assets/xxxxxxxxxxxxxxxxxxxxxx
+            headers (dict): optional REST headers
+            params (dict): optional params strings
+
+        Returns:
+            dict representing the response body (entity).
+
+        """
+        cache = self._entity_cache
+        if cache is None or headers is not None or params is not None:
+            return super().get(url, headers=headers, params=params)
+
+        entity = cache.get(url)
+        if entity is None:
+            generation = cache.generation
+            entity = super().get(url)
+            cache.put(url, entity, generation=generation)
+
+        return entity
 
     def _add_headers(self, headers: dict[str, str] | None) -> dict[str, Any]:
 
@@ -237,7 +370,7 @@ class Archivist(ArchivistPublic):  # pylint: disable=too-many-instance-attribute
 
     # currently only the archivist endpoint is allowed to create/modify data.
     # this may change...
-    @retry_429
+    @_retry(idempotent=False)
     def post(
         self,
         url: str,
@@ -260,17 +393,17 @@ class Archivist(ArchivistPublic):  # pylint: disable=too-many-instance-attribute
             dict representing the response body (entity).
         """
         if data:
-            response = self.session.post(
+            response = self._request(
+                "post",
                 url,
                 data=request,
-                verify=self.verify,
             )
         else:
-            response = self.session.post(
+            response = self._request(
+                "post",
                 url,
                 json=request,
                 headers=self._add_headers(headers),
-                verify=self.verify,
             )
 
         error = _parse_response(response)
@@ -279,7 +412,6 @@ class Archivist(ArchivistPublic):  # pylint: disable=too-many-instance-attribute
 
         return response.json()
 
-    @retry_429
     def post_file(
         self,
         url: str,
@@ -291,7 +423,9 @@ class Archivist(ArchivistPublic):  # pylint: disable=too-many-instance-attribute
     ) -> dict[str, Any]:
         """POST method (REST) - upload binary
 
-        Uploads a file to an endpoint
+        Uploads a file to an endpoint. A retry uploads the file again from
+        its original position - a file that cannot be rewound (e.g. from
+        open_url()) raises ArchivistError instead.
 
         Args:
             url (str): e.g. v2/assets
@@ -302,6 +436,27 @@ class Archivist(ArchivistPublic):  # pylint: disable=too-many-instance-attribute
         Returns:
             dict representing the response body (entity).
         """
+        try:
+            start: Optional[int] = fd.tell()
+        except (AttributeError, OSError):
+            start = None
+
+        return self.__post_file(url, fd, mtype, start, form=form, params=params)
+
+    @_retry(idempotent=False)
+    def __post_file(
+        self,
+        url: str,
+        fd: BinaryIO,
+        mtype: str | None,
+        start: Optional[int],
+        *,
+        form: str,
+        params: Optional[dict],
+    ) -> dict[str, Any]:
+        if start is not None:
+            fd.seek(start)
+
         multipart = MultipartEncoder(
             fields={
                 form: ("filename", fd, mtype),
@@ -311,23 +466,21 @@ class Archivist(ArchivistPublic):  # pylint: disable=too-many-instance-attribute
             "content-type": multipart.content_type,
         }
 
-        response = self.session.post(
+        response = self._request(
+            "post",
             url,
             data=multipart,  # type: ignore    https://github.com/requests/toolbelt/issues/312
             headers=self._add_headers(headers),
-            verify=self.verify,
             params=_dotdict(params),
         )
 
-        self._response_ring_buffer.appendleft(response)
-
         error = _parse_response(response)
         if error is not None:
             raise error
 
         return response.json()
 
-    @retry_429
+    @_retry()
     def delete(
         self, url: str, *, headers: Optional[dict[str, Any]] = None
     ) -> dict[str, Any]:
@@ -342,21 +495,19 @@ class Archivist(ArchivistPublic):  # pylint: disable=too-many-instance-attribute
         Returns:
             dict representing the response body (entity).
         """
-        response = self.session.delete(
+        response = self._request(
+            "delete",
             url,
             headers=self._add_headers(headers),
-            verify=self.verify,
         )
 
-        self._response_ring_buffer.appendleft(response)
-
         error = _parse_response(response)
         if error is not None:
             raise error
 
         return response.json()
 
-    @retry_429
+    @_retry(idempotent=False)
     def patch(
         self,
         url: str,
@@ -377,15 +528,13 @@ class Archivist(ArchivistPublic):  # pylint: disable=too-many-instance-attribute
             dict representing the response body (entity).
         """
 
-        response = self.session.patch(
+        response = self._request(
+            "patch",
             url,
             json=request,
             headers=self._add_headers(headers),
-            verify=self.verify,
         )
 
-        self._response_ring_buffer.appendleft(response)
-
         error = _parse_response(response)
         if error is not None:
             raise error
@@ -24,9 +24,11 @@
 
 from __future__ import annotations
 from logging import getLogger
-from collections import deque
+import os
 from copy import deepcopy
-from typing import Any, BinaryIO, Optional
+from threading import Lock
+from time import perf_counter
+from typing import Any, Optional
 
 import requests
 from requests.models import Response
@@ -37,7 +39,9 @@ from .constants import (
     HEADERS_REQUEST_TOTAL_COUNT,
     HEADERS_TOTAL_COUNT,
 )
+from .cursor import ListCursor
 from .dictmerge import _deepmerge, _dotdict
+from .download import DownloadOptions, Target, _download, _download_ranges, _write
 from .errors import (
     _parse_response,
     ArchivistBadFieldError,
@@ -46,7 +50,16 @@ from .errors import (
     ArchivistNotFoundError,
 )
 from .headers import _headers_get
-from .retry429 import retry_429
+from .hooks import Hooks, _call_hooks
+from .parallel import _prefetch
+from .partition import TimePartition, ValuePartition, _list_partitioned
+from .poller import Poller
+from .pool import PoolOptions
+from .conditional import ConditionalCache
+from .blobcache import BlobCache
+from .ratelimit import RateLimiter
+from .ringbuffer import RingBufferMode, ResponseRecord, _ResponseRingBuffer
+from .retry import RetryPolicy, _Retrier, _retry
 
 from .assets import _AssetsPublic
 from .events import _EventsPublic
@@ -55,7 +68,7 @@ from .assetattachments import _AssetAttachmentsClient
 LOGGER = getLogger(__name__)
 
 
-class ArchivistPublic:  # pylint: disable=too-many-instance-attributes
+class ArchivistPublic:  # pylint: disable=too-many-instance-attributes,too-many-public-methods
     """Base class for public Archivist endpoints.
 
     This class manages the connection to an Archivist instance and provides
@@ -64,6 +77,19 @@ class ArchivistPublic:  # pylint: disable=too-many-instance-attributes
     Args:
         verify: if True the certificate is verified
         max_time (float): maximum time in seconds to wait for confirmation
+        pool (PoolOptions): optional connection pool options. The session
+            is safe to share between threads.
+        retry (RetryPolicy): optional policy for retrying failed requests.
+        rate_limiter (RateLimiter): optional client-side rate limiter. May be
+            shared between instances.
+        hooks (list): optional list of :class:`Hooks` called for every request
+            e.g. a :class:`MetricsCollector`.
+        ring_buffer (RingBufferMode): what is retained of the most recent
+            responses. Defaults to the full responses.
+        conditional_cache (ConditionalCache): optional cache of response
+            validators and bodies for conditional GETs.
+        blob_cache (BlobCache): optional on-disk cache of downloaded blobs
+            keyed by their SHA-256.
 
     """
 
@@ -82,12 +108,29 @@ class ArchivistPublic:  # pylint: disable=too-many-instance-attributes
         fixtures: Optional[dict[str, Any]] = None,
         verify: bool = True,
         max_time: float = MAX_TIME,
+        pool: Optional[PoolOptions] = None,
+        retry: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        hooks: Optional[list[Hooks]] = None,
+        ring_buffer: RingBufferMode = RingBufferMode.FULL,
+        conditional_cache: Optional[ConditionalCache] = None,
+        blob_cache: Optional[BlobCache] = None,
     ):
 
         self._verify = verify
-        self._response_ring_buffer = deque(maxlen=self.RING_BUFFER_MAX_LEN)
+        self._response_ring_buffer = _ResponseRingBuffer(
+            ring_buffer, self.RING_BUFFER_MAX_LEN
+        )
+        self._pool = pool or PoolOptions()
         self._session = None
+        self._session_lock = Lock()
+        self._hooks = list(hooks or [])
+        self._retrier = _Retrier(retry or RetryPolicy(), self._hooks)
+        self._rate_limiter = rate_limiter
+        self._conditional_cache = conditional_cache
+        self._blob_cache = blob_cache
         self._max_time = max_time
+        self._poller = Poller(max_time, hooks=self._hooks)
         self._fixtures = fixtures or {}
 
         # Type hints for IDE autocomplete, keep in sync with CLIENTS map above
@@ -122,14 +165,19 @@ class ArchivistPublic:  # pylint: disable=too-many-instance-attributes
     def session(self) -> requests.Session:
         """creates and returns session"""
         if self._session is None:
-            self._session = requests.Session()
+            # more than one thread may get here at the same time
+            with self._session_lock:
+                if self._session is None:
+                    self._session = self._pool.session()
+
         return self._session
 
     def close(self):
         """closes current session if open"""
-        if self._session is not None:
-            self._session.close()
-            self._session = None
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
 
     @property
     def public(self) -> bool:
@@ -151,6 +199,51 @@ class ArchivistPublic:  # pylint: disable=too-many-instance-attributes
         """bool: Returns maximum time in seconds to wait for confirmation"""
         return self._max_time
 
+    @property
+    def poller(self) -> Poller:
+        """Poller: Returns the poller used to wait for entities"""
+        return self._poller
+
+    @property
+    def pool(self) -> PoolOptions:
+        """PoolOptions: Returns the connection pool options"""
+        return self._pool
+
+    @property
+    def retry(self) -> RetryPolicy:
+        """RetryPolicy: Returns the policy for retrying failed requests"""
+        return self._retrier.policy
+
+    @property
+    def retries(self) -> dict[str, int]:
+        """dict: Returns the number of retries made keyed by reason"""
+        return self._retrier.counts
+
+    @property
+    def rate_limiter(self) -> RateLimiter | None:
+        """RateLimiter: Returns the client-side rate limiter if any"""
+        return self._rate_limiter
+
+    @property
+    def hooks(self) -> list[Hooks]:
+        """list: Returns the instrumentation hooks"""
+        return self._hooks
+
+    @property
+    def conditional_cache(self) -> ConditionalCache | None:
+        """ConditionalCache: Returns the conditional GET cache if any"""
+        return self._conditional_cache
+
+    @property
+    def blob_cache(self) -> BlobCache | None:
+        """BlobCache: Returns the on-disk cache of downloaded blobs if any"""
+        return self._blob_cache
+
+    @property
+    def ring_buffer(self) -> RingBufferMode:
+        """RingBufferMode: Returns what is retained of the most recent responses"""
+        return self._response_ring_buffer.mode
+
     @property
     def fixtures(self) -> dict[str, Any]:
         """dict: Contains predefined attributes for each endpoint"""
@@ -162,11 +255,21 @@ class ArchivistPublic:  # pylint: disable=too-many-instance-attributes
         self._fixtures = _deepmerge(self._fixtures, fixtures)
 
     def __copy__(self):
-        return ArchivistPublic(
+        arch = ArchivistPublic(
             fixtures=deepcopy(self._fixtures),
             verify=self._verify,
             max_time=self._max_time,
+            pool=self._pool,
+            retry=self._retrier.policy,
+            rate_limiter=self._rate_limiter,
+            hooks=self._hooks,
+            ring_buffer=self._response_ring_buffer.mode,
+            conditional_cache=self._conditional_cache,
+            blob_cache=self._blob_cache,
         )
+        # copies share the learned confirmation latencies
+        arch._poller = self._poller
+        return arch
 
     def _add_headers(self, headers: Optional[dict]) -> dict[str, str]:
         if headers is not None:
@@ -176,10 +279,35 @@ class ArchivistPublic:  # pylint: disable=too-many-instance-attributes
 
         return newheaders
 
+    def _request(self, method: str, url: str, **kwargs) -> Response:
+        """Make a REST request - every request to upstream is made here"""
+        if self._rate_limiter is not None:
+            self._rate_limiter.acquire()
+
+        self._retrier.requested(method, url)
+        _call_hooks(self._hooks, "on_request", method, url)
+        start = perf_counter()
+        try:
+            response = getattr(self.session, method)(url, verify=self.verify, **kwargs)
+        except Exception as ex:
+            _call_hooks(
+                self._hooks, "on_error", method, url, ex, perf_counter() - start
+            )
+            raise
+
+        elapsed = perf_counter() - start
+        self._response_ring_buffer.append(method, response, elapsed)
+        _call_hooks(self._hooks, "on_response", method, url, response, elapsed)
+
+        if self._rate_limiter is not None:
+            self._rate_limiter.update_from_response(response)
+
+        return response
+
     # the public endpoint is currently readonly so only read-type methods are
     # defined here. This may change - the Public endpoint may allow writes
     # in future...
-    @retry_429
+    @_retry()
     def get(
         self,
         url: str,
@@ -198,30 +326,43 @@ class ArchivistPublic:  # pylint: disable=too-many-instance-attributes
             dict representing the response body (entity).
 
         """
-        response = self.session.get(
+        cache = self._conditional_cache
+        validated = cache.get(url, params) if cache is not None else None
+        headers = self._add_headers(headers)
+        if validated is not None:
+            headers.update(validated.headers())
+
+        response = self._request(
+            "get",
             url,
-            headers=self._add_headers(headers),
-            verify=self.verify,
+            headers=headers,
             params=_dotdict(params),
         )
 
-        self._response_ring_buffer.appendleft(response)
+        if validated is not None and response.status_code == 304:
+            return cache.validated(validated)  # type: ignore[union-attr]
 
         error = _parse_response(response)
         if error is not None:
             raise error
 
-        return response.json()
+        body = response.json()
+        if cache is not None:
+            cache.modified()
+            cache.put(url, params, response, deepcopy(body))
+
+        return body
 
-    @retry_429
     def get_file(
         self,
         url: str,
-        fd: BinaryIO,
+        fd: Target,
         *,
         headers: Optional[dict[str, str]] = None,
         params: Optional[dict[str, Any]] = None,
-    ) -> Response:
+        options: Optional[DownloadOptions] = None,
+        hash_value: Optional[str] = None,
+    ) -> Optional[Response]:
         """GET method (REST) - chunked
 
         Downloads a binary object from upstream storage.
@@ -230,76 +371,172 @@ class ArchivistPublic:  # pylint: disable=too-many-instance-attributes
             url (str): e.g. assets/xxxxxxxxxxxxxxxxxxxxxx
             identity (str): e.g. blobs/xxxxxxxxxxxxxxxxxxxxxxxxxxxx`
             fd (file): an iterable representing a file (usually from open())
-                the file must be opened in binary mode
+                the file must be opened in binary mode. Or the path of the file.
             headers (dict): optional REST headers
             params (dict): optional params strings
+            options (DownloadOptions): optional chunk size and how a path
+                is written. A path downloaded with resume or ranges uses
+                Range requests and bypasses the conditional cache.
+            hash_value (str): optional expected SHA-256 of the object e.g. the
+                arc_blob_hash_value of an attachment. Raises
+                ArchivistHashMismatchError if it differs. Required to use
+                the blob cache.
 
         Returns:
-            REST response (not the response body)
+            REST response (not the response body). The status code is 304 if
+            the cached body was written. None if the blob was delivered from
+            the blob cache without a request.
 
         """
-        response = self.session.get(
+        blob_cache = self._blob_cache
+        if blob_cache is not None and hash_value is not None:
+            return blob_cache.fetch(
+                hash_value,
+                fd,
+                lambda path: self.__get_file(
+                    url,
+                    path,
+                    headers=headers,
+                    params=params,
+                    options=options,
+                    hash_value=hash_value,
+                ),
+            )
+
+        return self.__get_file(
             url,
-            headers=self._add_headers(headers),
-            verify=self.verify,
-            stream=True,
-            params=_dotdict(params),
+            fd,
+            headers=headers,
+            params=params,
+            options=options,
+            hash_value=hash_value,
         )
 
-        self._response_ring_buffer.appendleft(response)
+    def __get_file(
+        self,
+        url: str,
+        fd: Target,
+        *,
+        headers: Optional[dict[str, str]],
+        params: Optional[dict[str, Any]],
+        options: Optional[DownloadOptions],
+        hash_value: Optional[str],
+    ) -> Response:
+        # ranged() is only True for a path - isinstance narrows the type
+        if (
+            options is not None
+            and options.ranged(fd)
+            and isinstance(fd, (str, os.PathLike))
+        ):
+            headers = self._add_headers(headers)
+            return _download_ranges(
+                lambda extra: self.__get_stream(url, {**headers, **extra}, params),
+                fd,
+                options=options,
+                hash_value=hash_value,
+            )
+
+        cache = self._conditional_cache
+        validated = cache.get(url, params) if cache is not None else None
+        headers = self._add_headers(headers)
+        if validated is not None:
+            headers.update(validated.headers())
+
+        response = self.__get_stream(url, headers, params)
+        if validated is not None and response.status_code == 304:
+            # bytes are immutable
+            _write(
+                cache.validated(validated, copy=False),  # type: ignore[union-attr]
+                fd,
+                hash_value=hash_value,
+            )
+            return response
 
         error = _parse_response(response)
         if error is not None:
             raise error
 
-        for chunk in response.iter_content(chunk_size=4096):
-            if chunk:
-                fd.write(chunk)
+        # retain the body if it is small enough to be cached
+        body = _download(
+            response,
+            fd,
+            options=options,
+            hash_value=hash_value,
+            retain=cache.max_file_size if cache is not None else 0,
+        )
+        if cache is not None:
+            cache.modified()
+            if body is not None:
+                cache.put(url, params, response, body)
 
         return response
 
-    @retry_429
+    # chunks already written to a file cannot be rewound so only the request
+    # is retried - not the download of the body
+    @_retry()
+    def __get_stream(
+        self, url: str, headers: dict[str, str], params: Optional[dict[str, Any]]
+    ) -> Response:
+        response = self._request(
+            "get",
+            url,
+            headers=headers,
+            stream=True,
+            params=_dotdict(params),
+        )
+
+        # a range beyond the end of a partial download is handled by the caller
+        error = _parse_response(response)
+        if error is not None and response.status_code != 416:
+            raise error
+
+        return response
+
+    @_retry()
     def __list(
         self,
         url: str,
         params: Optional[dict[str, Any]],
         *,
         page_size: Optional[int] = None,
+        page_token: Optional[str] = None,
         headers: Optional[dict[str, str]] = None,
     ) -> Response:
+        # every page is requested with the original selector
         if page_size is not None:
-            if params is not None:
-                params["page_size"] = page_size
-            else:
-                params = {"page_size": page_size}
+            params = {**(params or {}), "page_size": page_size}
 
-        response = self.session.get(
+        if page_token is not None:
+            params = {**(params or {}), "page_token": page_token}
+
+        response = self._request(
+            "get",
             url,
             headers=self._add_headers(headers),
-            verify=self.verify,
             params=_dotdict(params),
         )
 
-        self._response_ring_buffer.appendleft(response)
-
         error = _parse_response(response)
         if error is not None:
             raise error
 
         return response
 
-    def last_response(self, *, responses: int = 1) -> list[Response]:
-        """Returns the requested number of response objects from the response ring buffer
+    def last_response(self, *, responses: int = 1) -> list[Response | ResponseRecord]:
+        """Returns the requested number of responses from the response ring buffer
+
+        Depending on the ring_buffer mode these are requests.Response objects or
+        :class:`ResponseRecord` objects. If the mode is OFF the list is empty.
 
         Args:
             responses (int): Number of responses to be returned in a list
 
         Returns:
-            list of responses.
+            list of responses - the most recent first.
 
         """
 
-        return list(self._response_ring_buffer)[:responses]
+        return self._response_ring_buffer.last(responses)
 
     def get_by_signature(
         self,
@@ -393,6 +630,9 @@ class ArchivistPublic:  # pylint: disable=too-many-instance-attributes
         page_size: Optional[int] = None,
         params: Optional[dict[str, Any]] = None,
         headers: Optional[dict[str, str]] = None,
+        prefetch: int = 0,
+        cursor: Optional[ListCursor] = None,
+        partition: Optional[TimePartition | ValuePartition] = None,
     ):
         """GET method (REST) with params string
 
@@ -404,40 +644,100 @@ class ArchivistPublic:  # pylint: disable=too-many-instance-attributes
         If page size is unspecified return up to the internal limit of records.
         (different for each endpoint)
 
+        If prefetch is specified up to prefetch pages are requested on a background
+        thread while the records of the current page are returned to the caller.
+
+        If a cursor is specified it is advanced after all records of a page have been
+        returned so that an interrupted listing can be resumed from the last
+        complete page.
+
+        If a partition is specified the listing is split into disjoint queries that
+        are paginated concurrently and merged. A partitioned listing cannot use a
+        cursor.
+
         Args:
             url (str): e.g. https://app.rkvst.io/archivist/v2/assets
             field (str): name of collection of entities e.g assets
             page_size (int): optional number of items per request e.g. 500
             params (dict): selector e.g. {"confirmation_status": "CONFIRMED", }
             headers (dict): optional REST headers
+            prefetch (int): optional number of pages to fetch ahead of the caller.
+            cursor (ListCursor): optional cursor that records the progress of the
+                listing. If the cursor has already been used the listing resumes
+                from the cursor's position with the cursor's params and page_size.
+            partition (TimePartition|ValuePartition): optional partition of the
+                listing into disjoint queries that are paginated concurrently.
 
         Returns:
             iterable that lists entities
 
         Raises:
-            ArchivistBadFieldError: field has incorrect value.
+            ArchivistBadFieldError: field has incorrect value or cursor is for a
+                different listing.
 
         """
+        if partition is not None:
+            if cursor is not None:
+                raise ArchivistBadFieldError("Cannot use cursor with partition")
 
-        while True:
-            response = self.__list(
+            yield from _list_partitioned(
+                self,
+                partition,
                 url,
-                params,
+                field,
                 page_size=page_size,
+                params=params,
+                headers=headers,
+                prefetch=prefetch,
+            )
+            return
+
+        if cursor is None:
+            cursor = ListCursor()
+
+        if not cursor.started:
+            cursor.start(url, field, params=params, page_size=page_size)
+
+        elif (cursor.url, cursor.field) != (url, field):
+            raise ArchivistBadFieldError(
+                f"Cursor is for {cursor.url} {cursor.field} not {url} {field}"
+            )
+
+        if cursor.done:
+            return
+
+        pages = self._pages(cursor, headers=headers)
+        if prefetch > 0:
+            pages = _prefetch(pages, prefetch)
+
+        for records, page_token in pages:
+            yield from records
+            cursor.advance(page_token)
+
+    def _pages(self, cursor: ListCursor, *, headers: Optional[dict[str, str]] = None):
+        """Generates the list of records and the next page token of each page
+
+        Starts at the cursor's page but does not move the cursor - that is only
+        done when the caller has consumed the page.
+        """
+        page_token = cursor.page_token
+        while True:
+            response = self.__list(
+                cursor.url,
+                cursor.params,
+                page_size=cursor.page_size,
+                page_token=page_token,
                 headers=headers,
             )
             data = response.json()
 
             try:
-                records = data[field]
+                records = data[cursor.field]
             except KeyError as ex:
-                raise ArchivistBadFieldError(f"No {field} found") from ex
-
-            for record in records:
-                yield record
+                raise ArchivistBadFieldError(f"No {cursor.field} found") from ex
 
             page_token = data.get("next_page_token")
+            yield records, page_token
+
             if not page_token:
                 break
-
-            params = {"page_token": page_token}
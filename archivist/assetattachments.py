@@ -20,14 +20,34 @@
       with open("something.jpg") as fd:
           attachment = arch.attachments.upload(fd)
 
+   Many attachments can be downloaded concurrently. Files that already exist
+   with the expected hash are skipped:
+
+   .. code-block:: python
+
+      report = arch.assetattachments.download_many(
+          (
+              asset["identity"],
+              attachment["arc_blob_identity"],
+              f"export/{attachment['arc_file_name']}",
+              attachment["arc_blob_hash_value"],
+          )
+          for asset in arch.assets.list()
+          for attachment in asset["attributes"].get("arc_attachments", [])
+      )
+      print(report.downloaded, report.skipped, report.failed, report.throughput)
+
 """
 
 # pylint:disable=too-few-public-methods
 
 from __future__ import annotations
 from copy import deepcopy
+from dataclasses import dataclass, field
 from logging import getLogger
-from typing import Any, BinaryIO, Optional
+import os
+from time import perf_counter
+from typing import Any, Iterable, Optional, Sequence
 from urllib.parse import urlparse
 
 from requests.models import Response
@@ -40,12 +60,96 @@ from .constants import (
     ASSETATTACHMENTS_SUBPATH,
     ASSETATTACHMENTS_LABEL,
     ATTACHMENTS_LABEL,
+    DOWNLOAD_CONCURRENCY,
 )
 from .dictmerge import _deepmerge
+from .download import DownloadOptions, Target, _sha256_file
+from .parallel import _bounded_map
 
 LOGGER = getLogger(__name__)
 
 
+@dataclass(frozen=True)
+class AttachmentDownload:
+    """
+    Outcome of downloading one attachment of a batch
+
+    Args:
+        identity (str): identity of the asset or event
+        attachment_id (str): blobs/aaaaaaaaaaaaa
+        target (file or path): where the attachment was written
+        size (int): bytes downloaded - 0 if skipped or failed
+        skipped (bool): True if the file already existed with the expected hash
+        seconds (float): duration of the download
+        error (Exception): reason the attachment was not downloaded
+    """
+
+    identity: str
+    attachment_id: str
+    target: Target
+    size: int = 0
+    skipped: bool = False
+    seconds: float = 0.0
+    error: Optional[Exception] = None
+
+    @property
+    def succeeded(self) -> bool:
+        """bool: True if the attachment was downloaded or skipped"""
+        return self.error is None
+
+
+@dataclass(frozen=True)
+class DownloadReport:
+    """
+    Outcome of downloading a batch of attachments
+
+    Args:
+        results (list): :class:`AttachmentDownload` of every attachment in the
+            order given
+        seconds (float): duration of the batch
+    """
+
+    results: list[AttachmentDownload] = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def downloaded(self) -> int:
+        """int: number of attachments downloaded"""
+        return sum(1 for r in self.results if r.succeeded and not r.skipped)
+
+    @property
+    def skipped(self) -> int:
+        """int: number of files that already existed with the expected hash"""
+        return sum(1 for r in self.results if r.skipped)
+
+    @property
+    def failed(self) -> int:
+        """int: number of attachments not downloaded"""
+        return sum(1 for r in self.results if not r.succeeded)
+
+    @property
+    def size(self) -> int:
+        """int: bytes downloaded"""
+        return sum(r.size for r in self.results)
+
+    @property
+    def throughput(self) -> float:
+        """float: bytes downloaded per second of the batch"""
+        return self.size / self.seconds if self.seconds > 0 else 0.0
+
+
+def _is_path(target: Target) -> bool:
+    return isinstance(target, (str, os.PathLike))
+
+
+def _position(target: Target) -> Optional[int]:
+    """current offset of a file - None if not known"""
+    try:
+        return target.tell()  # type: ignore[union-attr]
+    except (AttributeError, OSError):
+        return None
+
+
 class _AssetAttachmentsClient:
     """AssetAttachmentsClient
 
@@ -106,10 +210,12 @@ class _AssetAttachmentsClient:
         self,
         identity: str,
         attachment_id: str,
-        fd: BinaryIO,
+        fd: Target,
         *,
         params: Optional[dict[str, Any]] = None,
-    ) -> Response:
+        options: Optional[DownloadOptions] = None,
+        hash_value: Optional[str] = None,
+    ) -> Optional[Response]:
         """Read attachment
 
         Reads attachment into data sink (usually a file opened for write).
@@ -119,11 +225,17 @@ class _AssetAttachmentsClient:
         Args:
             identity (str): identity
             attachment_id (str): blobs/aaaaaaaaaaaaa
-            fd (file): opened file descriptor or other file-type sink.
+            fd (file): opened file descriptor or other file-type sink or the
+                path of the file.
             params (dict): e.g. {"allow_insecure": "true"} OR {"strict": "true" }
+            options (DownloadOptions): optional chunk size and how a path is
+                written.
+            hash_value (str): optional expected SHA-256 e.g. arc_blob_hash_value.
+                Raises ArchivistHashMismatchError if the attachment differs.
 
         Returns:
-            JSON as dict
+            REST response - None if the blob was delivered from the blob
+            cache.
 
         identity has one of the following 4 forms:
 
@@ -136,9 +248,111 @@ class _AssetAttachmentsClient:
         """
 
         return self._archivist.get_file(
-            self._identity(identity, attachment_id), fd, params=self.__params(params)
+            self._identity(identity, attachment_id),
+            fd,
+            params=self.__params(params),
+            options=options,
+            hash_value=hash_value,
+        )
+
+    def __download_one(
+        self,
+        item: Sequence[Any],
+        params: Optional[dict[str, Any]],
+        options: Optional[DownloadOptions],
+    ) -> AttachmentDownload:
+        identity, attachment_id, target = item[:3]
+        hash_value = item[3] if len(item) > 3 else None
+        start = perf_counter()
+        if _is_path(target) and os.path.exists(target):
+            if hash_value is None:
+                hash_value = self.info(identity, attachment_id)["hash"]["value"]
+
+            if _sha256_file(os.fspath(target)) == hash_value.lower():
+                LOGGER.debug("%s already downloaded", target)
+                return AttachmentDownload(
+                    identity,
+                    attachment_id,
+                    target,
+                    skipped=True,
+                    seconds=perf_counter() - start,
+                )
+
+        before = None if _is_path(target) else _position(target)
+        self.download(
+            identity,
+            attachment_id,
+            target,
+            params=params,
+            options=options,
+            hash_value=hash_value,
+        )
+        if _is_path(target):
+            size = os.path.getsize(target)
+        else:
+            after = _position(target)
+            size = after - before if before is not None and after is not None else 0
+
+        return AttachmentDownload(
+            identity,
+            attachment_id,
+            target,
+            size=size,
+            seconds=perf_counter() - start,
         )
 
+    def download_many(
+        self,
+        items: Iterable[Sequence[Any]],
+        *,
+        concurrency: int = DOWNLOAD_CONCURRENCY,
+        params: Optional[dict[str, Any]] = None,
+        options: Optional[DownloadOptions] = None,
+    ) -> DownloadReport:
+        """Download many attachments concurrently
+
+        Each item is (identity, attachment_id, target) or (identity,
+        attachment_id, target, hash_value) where target is a path or a file
+        opened for write and hash_value is the expected SHA-256 e.g. the
+        arc_blob_hash_value of the attachment.
+
+        A path that already exists is skipped if its hash matches. The hash is
+        read from the attachment info if not given. Every download is verified
+        if the hash is known.
+
+        Items are read as earlier downloads complete so items may be a
+        generator. At most concurrency attachments are downloaded at any time
+        over the connection pool of the Archivist instance - size the pool
+        with PoolOptions to at least concurrency.
+
+        Args:
+            items (iterable): attachments to download
+            concurrency (int): maximum number of downloads in flight
+            params (dict): e.g. {"allow_insecure": "true"} OR {"strict": "true" }
+            options (DownloadOptions): optional chunk size and how a path is
+                written.
+
+        Returns:
+            :class:`DownloadReport`. Failure is reported in the error
+            attribute of each result - no exception is raised and the batch
+            continues.
+
+        """
+        start = perf_counter()
+        results = []
+        for item, future in _bounded_map(
+            lambda item: self.__download_one(item, params, options),
+            items,
+            concurrency,
+        ):
+            try:
+                results.append(future.result())
+            except Exception as ex:  # pylint: disable=broad-except
+                LOGGER.debug("Download %s of %s failed: %s", item[1], item[0], ex)
+                results.append(AttachmentDownload(*item[:3], error=ex))
+
+        return DownloadReport(results, perf_counter() - start)
+
     def info(
         self,
         identity: str,
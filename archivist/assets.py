@@ -22,8 +22,12 @@
 """
 
 from __future__ import annotations
+from concurrent.futures import Future
+from dataclasses import dataclass
+from functools import partial
+from json import dumps as json_dumps
 from logging import getLogger
-from typing import Any, Optional, Tuple
+from typing import Any, Iterable, Iterator, Optional, Tuple
 from copy import deepcopy
 
 # pylint:disable=cyclic-import      # but pylint doesn't understand this feature
@@ -35,15 +39,50 @@ from .constants import (
     ASSETS_SUBPATH,
     ASSETS_LABEL,
     CONFIRMATION_STATUS,
+    CONFIRMATION_WORKERS,
+    CREATE_CONCURRENCY,
 )
 from . import confirmer
+from .cursor import ListCursor
 from .dictmerge import _deepmerge
 from .errors import ArchivistBadFieldError, ArchivistNotFoundError
+from .parallel import _bounded_map, _call_all, _Once
+from .partition import TimePartition, ValuePartition
 from .utils import selector_signature
 
 LOGGER = getLogger(__name__)
 
 
+def _signature(data: dict[str, Any]) -> str:
+    """selector signature of a request body as a hashable key"""
+    return json_dumps(
+        selector_signature(data["selector"], data), sort_keys=True, default=str
+    )
+
+
+@dataclass(frozen=True)
+class Creation:
+    """
+    Outcome of creating one asset of a batch
+
+    Args:
+        data (dict): request body of asset as given to create_many()
+        asset (Asset): the created (or existing) asset
+        existed (bool): True if the asset already existed
+        error (Exception): reason the asset was not created or confirmed
+    """
+
+    data: dict[str, Any]
+    asset: Optional[Asset] = None
+    existed: bool = False
+    error: Optional[Exception] = None
+
+    @property
+    def succeeded(self) -> bool:
+        """bool: True if the asset was created or already existed"""
+        return self.error is None
+
+
 class _AssetsPublic:
     """AssetsReader
 
@@ -162,6 +201,48 @@ class _AssetsRestricted(_AssetsPublic):
 
         return self.wait_for_confirmation(asset["identity"])
 
+    def submit(
+        self,
+        *,
+        props: Optional[dict[str, Any]] = None,
+        attrs: Optional[dict[str, Any]] = None,
+    ) -> Future:
+        """Create asset without waiting for confirmation
+
+        Creates asset with defined properties and attributes. See submit_from_data().
+
+        Args:
+            props (dict): Properties - usually only the proof_mechanism setting
+            attrs (dict): attributes of created asset.
+
+        Returns:
+            Future of the confirmed :class:`Asset` instance
+
+        """
+        newprops = _deepmerge({"behaviours": ASSET_BEHAVIOURS}, props)
+        return self.submit_from_data(self.__params(newprops, attrs))
+
+    def submit_from_data(self, data: dict[str, Any]) -> Future:
+        """Create asset without waiting for confirmation
+
+        Returns as soon as the asset is created. A background confirmer shared
+        by the Archivist instance resolves the future with the confirmed asset
+        or fails it with ArchivistUnconfirmedError. Many futures can be waited
+        for with concurrent.futures.wait() or as_completed().
+
+        Args:
+            data (dict): request body of asset.
+
+        Returns:
+            Future of the confirmed :class:`Asset` instance
+
+        """
+        asset = self.create_from_data(data, confirm=False)
+        # pylint: disable=protected-access
+        return self._archivist._confirmer.submit(
+            self, asset["identity"], self._archivist.max_time
+        )
+
     def create_if_not_exists(
         self, data: dict[str, Any], *, confirm: bool = True
     ) -> Tuple[Asset, bool]:
@@ -249,17 +330,19 @@ class _AssetsRestricted(_AssetsPublic):
                 )
                 data["attributes"]["arc_home_location_identity"] = loc["identity"]
 
-        # any attachments ?
+        # any attachments ? - uploaded concurrently
         if attachments is not None:
-            for a in attachments:
+            results = _call_all(
+                [partial(self._archivist.attachments.create, a) for a in attachments],
+                self._archivist.upload_concurrency,
+            )
+            for a, result in zip(attachments, results):
                 # attempt to get attachment to use as a key
                 attachment_key = a.get("attachment", None)
                 if attachment_key is None:
                     # failing that create a key from filename or url
                     attachment_key = self._archivist.attachments.get_default_key(a)
-                data["attributes"][attachment_key] = self._archivist.attachments.create(
-                    a
-                )
+                data["attributes"][attachment_key] = result
 
         asset = self.create_from_data(
             data=data,
@@ -268,6 +351,75 @@ class _AssetsRestricted(_AssetsPublic):
 
         return asset, existed
 
+    def create_many(
+        self,
+        data: Iterable[dict[str, Any]],
+        *,
+        concurrency: int = CREATE_CONCURRENCY,
+        confirm: bool = True,
+        ordered: bool = True,
+    ) -> Iterator[Creation]:
+        """Create many assets concurrently
+
+        Request bodies are read from data as earlier assets complete, so data
+        may be a generator over a large file. At most concurrency assets are
+        being created (and confirmed if confirm is True) at any time.
+
+        The fixtures and default behaviours are merged into every request body
+        as in create(). A request body with a 'selector' is created only if it
+        does not already exist and its location and attachments are created
+        as in create_if_not_exists(). Bodies with the same selector signature
+        and locations with the same selector signature are created only once
+        - the later ones report the asset as existing.
+
+        Args:
+            data (iterable): request bodies of assets
+            concurrency (int): maximum number of assets in flight
+            confirm (bool): if True wait for each asset to be confirmed
+            ordered (bool): if True yield in the order of data otherwise as
+                each asset completes
+
+        Returns:
+            iterable of :class:`Creation`. Failure is reported in the error
+            attribute - no exception is raised and the batch continues.
+
+        """
+        defaults = _deepmerge(
+            {"behaviours": ASSET_BEHAVIOURS},
+            self._archivist.fixtures.get(f"{ASSETS_LABEL}"),
+        )
+        locations = _Once()
+        assets = _Once()
+
+        def create(body: dict[str, Any]) -> Tuple[Asset, bool]:
+            body = _deepmerge(defaults, body)
+            if "selector" not in body:
+                return self.create_from_data(body, confirm=confirm), False
+
+            location = body.get("location")
+            if location is not None and "identity" not in location:
+                (loc, _), _ = locations.call(
+                    _signature(location),
+                    lambda: self._archivist.locations.create_if_not_exists(location),
+                )
+                body["location"] = {"identity": loc["identity"]}
+
+            (asset, existed), earlier = assets.call(
+                _signature(body),
+                lambda: self.create_if_not_exists(body, confirm=confirm),
+            )
+            return asset, existed or earlier
+
+        for body, future in _bounded_map(create, data, concurrency, ordered=ordered):
+            try:
+                asset, existed = future.result()
+            except Exception as ex:  # pylint: disable=broad-except
+                LOGGER.debug("Create asset failed: %s", ex)
+                yield Creation(body, error=ex)
+                continue
+
+            yield Creation(body, asset=asset, existed=existed)
+
     def wait_for_confirmation(self, identity: str) -> Asset:
         """Wait for asset to be confirmed.
 
@@ -280,10 +432,35 @@ class _AssetsRestricted(_AssetsPublic):
             True if asset is confirmed.
 
         """
-        confirmer.MAX_TIME = self._archivist.max_time
         # pylint: disable=protected-access
         return confirmer._wait_for_confirmation(self, identity)
 
+    def wait_for_confirmation_many(
+        self,
+        identities: Iterable[str],
+        *,
+        workers: int = CONFIRMATION_WORKERS,
+    ) -> Iterator[confirmer.Confirmation]:
+        """Wait for many assets to be confirmed.
+
+        Pending assets are read concurrently and share one backoff between
+        polls. A Confirmation is yielded as soon as each asset is confirmed,
+        FAILED or times out - so the order is not the order of identities.
+
+        Args:
+            identities (iterable): identities of assets
+            workers (int): maximum number of concurrent reads
+
+        Returns:
+            iterable of :class:`Confirmation`. Failure is reported in the
+            error attribute - no exception is raised.
+
+        """
+        # pylint: disable=protected-access
+        return confirmer._wait_for_confirmation_many(
+            self, identities, max_time=self._archivist.max_time, workers=workers
+        )
+
     def wait_for_confirmed(
         self,
         *,
@@ -311,7 +488,6 @@ class _AssetsRestricted(_AssetsPublic):
         if count == 0:
             raise ArchivistNotFoundError("No assets exist")
 
-        confirmer.MAX_TIME = self._archivist.max_time
         # pylint: disable=protected-access
         return confirmer._wait_for_confirmed(self, props=newprops, attrs=attrs)
 
@@ -339,6 +515,9 @@ class _AssetsRestricted(_AssetsPublic):
         self,
         *,
         page_size: Optional[int] = None,
+        prefetch: int = 0,
+        cursor: Optional[ListCursor] = None,
+        partition: Optional[TimePartition | ValuePartition] = None,
         props: Optional[dict[str, Any]] = None,
         attrs: Optional[dict[str, Any]] = None,
     ):
@@ -350,6 +529,10 @@ class _AssetsRestricted(_AssetsPublic):
             props (dict): optional e.g. {"tracked": "TRACKED" }
             attrs (dict): optional e.g. {"arc_display_type": "door" }
             page_size (int): optional page size. (Rarely used).
+            prefetch (int): optional number of pages fetched in the background.
+            cursor (ListCursor): optional cursor to record or resume the listing.
+            partition (TimePartition|ValuePartition): optional partition of the
+                listing into disjoint queries that are paginated concurrently.
 
         Returns:
             iterable that returns :class:`Asset` instances
@@ -361,6 +544,9 @@ class _AssetsRestricted(_AssetsPublic):
                 self._label,
                 ASSETS_LABEL,
                 page_size=page_size,
+                prefetch=prefetch,
+                cursor=cursor,
+                partition=partition,
                 params=self.__params(props, attrs),
             )
         )
@@ -0,0 +1,491 @@
+# -*- coding: utf-8 -*-
+"""Asynchronous Archivist connection interface
+
+   This module contains the AsyncArchivistPublic and AsyncArchivist classes.
+   They expose the same endpoints as the ArchivistPublic and Archivist classes
+   but every method is a coroutine and every list() method (and every other
+   method returning a generator) is an asynchronous generator:
+
+   .. code-block:: python
+
+      async def main(authtoken):
+          async with AsyncArchivist("https://app.rkvst.io", authtoken) as arch:
+              asset = await arch.assets.create(attrs={...})
+              events = await asyncio.gather(
+                  *(
+                      arch.events.create(asset["identity"], props, attrs)
+                      for props, attrs in data
+                  )
+              )
+              async for event in arch.events.list(asset_id=asset["identity"]):
+                  ...
+
+   The REST calls are made on a bounded thread pool that shares a single
+   connection pool so that one event loop can keep up to max_workers requests
+   in flight. Waiting for confirmation of assets and events does not occupy a
+   worker thread - the polling is scheduled on the event loop and only the
+   individual reads are made on the thread pool.
+
+"""
+
+from __future__ import annotations
+from asyncio import Future, get_running_loop, wrap_future
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from inspect import isgeneratorfunction
+from itertools import islice
+from logging import getLogger
+from typing import Any, Callable, Iterable, Iterator, Optional, Tuple
+
+# archivist must be imported first to avoid an import loop
+from .archivist import Archivist
+from .archivistpublic import ArchivistPublic
+from . import confirmer
+from .confirmer import MAX_TIME
+from .constants import UPLOAD_CONCURRENCY
+from .hooks import Hooks
+from .pool import PoolOptions
+from .ratelimit import RateLimiter
+from .retry import RetryPolicy
+from .ringbuffer import RingBufferMode
+from .conditional import ConditionalCache
+from .blobcache import BlobCache
+from .entitycache import EntityCache
+from .tokencache import FileTokenCache
+
+LOGGER = getLogger(__name__)
+
+MAX_WORKERS = 32
+
+# number of records fetched from a list() generator in one trip to the thread
+# pool.
+LIST_BATCH_SIZE = 100
+
+
+def _take(iterator, size: int) -> list:
+    return list(islice(iterator, size))
+
+
+class _AsyncClient:
+    """AsyncClient
+
+    Asynchronous wrapper of an endpoint client. Every public method of the
+    wrapped client is a coroutine. The list() method and every generator
+    method e.g. list_matching_assets() is an asynchronous generator. This
+    class is usually accessed as an attribute of the AsyncArchivist class.
+
+    Args:
+        async_archivist (AsyncArchivistPublic): asynchronous archivist instance
+        client: synchronous endpoint client
+
+    """
+
+    def __init__(self, async_archivist: AsyncArchivistPublic, client: Any):
+        self._async_archivist = async_archivist
+        self._client = client
+
+    def __str__(self) -> str:
+        return f"Async{self._client}"
+
+    def __getattr__(self, value: str) -> Any:
+        if value.startswith("_"):
+            raise AttributeError(value)
+
+        # pylint: disable=protected-access
+        return self._async_archivist._wrap(value, getattr(self._client, value))
+
+
+class _AsyncConfirmingClient(_AsyncClient):
+    """AsyncConfirmingClient
+
+    Asynchronous wrapper of the assets and events clients. When confirm is
+    True the create methods wait for confirmation on the event loop.
+
+    """
+
+    @property
+    def pending_count(self) -> int:
+        """int: number of pending entities when wait_for_confirmed() last polled"""
+        return self._client.pending_count
+
+    async def _create(self, method: Callable, *args, confirm: bool, **kwargs):
+        # pylint: disable=protected-access
+        entity = await self._async_archivist._run(
+            method, *args, confirm=False, **kwargs
+        )
+        if not confirm:
+            return entity
+
+        return await self.wait_for_confirmation(entity["identity"])
+
+    async def create(self, *args, confirm: bool = True, **kwargs):
+        """Create entity - see the synchronous create method"""
+        return await self._create(self._client.create, *args, confirm=confirm, **kwargs)
+
+    async def create_from_data(self, *args, confirm: bool = True, **kwargs):
+        """Create entity from data - see the synchronous create_from_data method"""
+        return await self._create(
+            self._client.create_from_data, *args, confirm=confirm, **kwargs
+        )
+
+    async def create_if_not_exists(
+        self, data: dict[str, Any], *, confirm: bool = True
+    ) -> Tuple[Any, bool]:
+        """Create asset if not exists - see the synchronous create_if_not_exists method"""
+        # pylint: disable=protected-access
+        entity, existed = await self._async_archivist._run(
+            self._client.create_if_not_exists, data, confirm=False
+        )
+        if existed or not confirm:
+            return entity, existed
+
+        return await self.wait_for_confirmation(entity["identity"]), existed
+
+    async def submit(self, *args, **kwargs) -> Future:
+        """Create entity without waiting for confirmation
+
+        See the synchronous submit method.
+
+        Returns:
+            asyncio future of the confirmed entity - use asyncio.gather() to
+            wait for many.
+
+        """
+        # pylint: disable=protected-access
+        return wrap_future(
+            await self._async_archivist._run(self._client.submit, *args, **kwargs)
+        )
+
+    async def submit_from_data(self, *args, **kwargs) -> Future:
+        """Create entity from data without waiting for confirmation
+
+        See the synchronous submit_from_data method.
+
+        Returns:
+            asyncio future of the confirmed entity - use asyncio.gather() to
+            wait for many.
+
+        """
+        # pylint: disable=protected-access
+        return wrap_future(
+            await self._async_archivist._run(
+                self._client.submit_from_data, *args, **kwargs
+            )
+        )
+
+    async def wait_for_confirmation(self, identity: str):
+        """Wait for entity to be confirmed.
+
+        The read requests are made on the thread pool but the
+        waiting between reads is done on the event loop.
+
+        Args:
+            identity (str): identity of asset or event
+
+        Returns:
+            confirmed asset or event
+
+        """
+        # pylint: disable=protected-access
+        return await confirmer._async_wait_for_confirmation(self, identity)
+
+    async def wait_for_confirmation_many(self, identities: Iterable[str], **kwargs):
+        """Wait for many entities to be confirmed.
+
+        An asynchronous generator of :class:`Confirmation` - see the
+        synchronous wait_for_confirmation_many method.
+
+        """
+        iterator = iter(self._client.wait_for_confirmation_many(identities, **kwargs))
+        async for confirmation in self._each(iterator):
+            yield confirmation
+
+    async def create_many(self, data: Iterable[dict[str, Any]], **kwargs):
+        """Create many assets concurrently.
+
+        An asynchronous generator of :class:`Creation` - see the
+        synchronous create_many method.
+
+        """
+        iterator = iter(self._client.create_many(data, **kwargs))
+        async for creation in self._each(iterator):
+            yield creation
+
+    async def _each(self, iterator: Iterator[Any]):
+        while True:
+            # one at a time so that each result is yielded immediately
+            # pylint: disable=protected-access
+            batch = await self._async_archivist._run(_take, iterator, 1)
+            if not batch:
+                return
+
+            yield batch[0]
+
+
+class AsyncArchivistPublic:  # pylint: disable=too-many-instance-attributes
+    """Base class for asynchronous public Archivist endpoints.
+
+    Args:
+        fixtures (dict): predefined attributes for each endpoint
+        verify: if True the certificate is verified
+        max_time (float): maximum time in seconds to wait for confirmation
+        pool (PoolOptions): optional connection pool options. Defaults to
+            a blocking pool of max_workers connections.
+        retry (RetryPolicy): optional policy for retrying failed requests.
+        rate_limiter (RateLimiter): optional client-side rate limiter.
+        hooks (list): optional list of :class:`Hooks` called for every request.
+        ring_buffer (RingBufferMode): what is retained of the most recent responses.
+        conditional_cache (ConditionalCache): optional cache for conditional GETs.
+        token_cache (FileTokenCache): optional on-disk cache of app registration
+            tokens shared with other processes.
+        entity_cache (EntityCache): optional cache of entities read by identity.
+        upload_concurrency (int): maximum number of attachments uploaded
+            concurrently when creating an asset or event.
+        blob_cache (BlobCache): optional on-disk cache of downloaded blobs.
+        max_workers (int): maximum number of requests in flight
+
+    """
+
+    # also change the type hints in __init__ below
+    CLIENTS = {
+        "assets": _AsyncConfirmingClient,
+        "events": _AsyncConfirmingClient,
+        "assetattachments": _AsyncClient,
+    }
+
+    def __init__(
+        self,
+        *,
+        fixtures: Optional[dict[str, Any]] = None,
+        verify: bool = True,
+        max_time: float = MAX_TIME,
+        pool: Optional[PoolOptions] = None,
+        retry: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        hooks: Optional[list[Hooks]] = None,
+        ring_buffer: RingBufferMode = RingBufferMode.FULL,
+        conditional_cache: Optional[ConditionalCache] = None,
+        blob_cache: Optional[BlobCache] = None,
+        max_workers: int = MAX_WORKERS,
+    ):
+        self._archivist = self._connect(
+            fixtures=fixtures,
+            verify=verify,
+            max_time=max_time,
+            pool=pool or PoolOptions(maxsize=max_workers, block=True),
+            retry=retry,
+            rate_limiter=rate_limiter,
+            hooks=hooks,
+            ring_buffer=ring_buffer,
+            conditional_cache=conditional_cache,
+            blob_cache=blob_cache,
+        )
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="archivist",
+        )
+
+        # Type hints for IDE autocomplete, keep in sync with CLIENTS map above
+        self.assets: _AsyncConfirmingClient
+        self.events: _AsyncConfirmingClient
+        self.assetattachments: _AsyncClient
+
+    def _connect(self, **kwargs) -> ArchivistPublic:
+        return ArchivistPublic(**kwargs)
+
+    def __str__(self) -> str:
+        return "AsyncArchivistPublic()"
+
+    def __getattr__(self, value: str) -> Any:
+        """Create endpoints on demand"""
+        if value.startswith("_"):
+            raise AttributeError(value)
+
+        client = self.CLIENTS.get(value)
+
+        if client is None:
+            return self._wrap(value, getattr(self._archivist, value))
+
+        c = client(self, getattr(self._archivist, value))
+        super().__setattr__(value, c)
+        return c
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def close(self):
+        """waits for outstanding requests and closes the session"""
+        await get_running_loop().run_in_executor(None, self._executor.shutdown)
+        self._archivist.close()
+
+    def _wrap(self, name: str, value: Any) -> Any:
+        """Convert a method of a synchronous client to a coroutine
+        or asynchronous generator
+        """
+        if not callable(value):
+            return value
+
+        # generators must not make blocking requests on the event loop
+        if name == "list" or isgeneratorfunction(value):
+            return partial(self._aiter, value)
+
+        return partial(self._run, value)
+
+    async def _run(self, method: Callable, *args, **kwargs) -> Any:
+        """Run a synchronous method on the thread pool"""
+        return await get_running_loop().run_in_executor(
+            self._executor, partial(method, *args, **kwargs)
+        )
+
+    async def _aiter(self, method: Callable, *args, **kwargs):
+        """Iterate over a synchronous generator on the thread pool"""
+        # creating the generator does not make any requests
+        iterator = iter(method(*args, **kwargs))
+        try:
+            while True:
+                batch = await self._run(_take, iterator, LIST_BATCH_SIZE)
+                if not batch:
+                    return
+
+                for record in batch:
+                    yield record
+
+        finally:
+            # stops e.g. prefetching of pages if the caller stops early
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                await self._run(close)
+
+    @property
+    def archivist(self) -> ArchivistPublic:
+        """ArchivistPublic: the underlying synchronous instance"""
+        return self._archivist
+
+    @property
+    def max_time(self) -> float:
+        """float: Returns maximum time in seconds to wait for confirmation"""
+        return self._archivist.max_time
+
+
+class AsyncArchivist(
+    AsyncArchivistPublic
+):  # pylint: disable=too-many-instance-attributes
+    """Base class for all asynchronous Archivist endpoints.
+
+    Args:
+        url (str): URL of archivist endpoint
+        auth: string representing JWT token, or a Tuple pair representing an
+        Appregistration ID and secret.
+        fixtures (dict): predefined attributes for each endpoint
+        verify: if True the certificate is verified
+        max_time (float): maximum time in seconds to wait for confirmation
+        pool (PoolOptions): optional connection pool options. Defaults to
+            a blocking pool of max_workers connections.
+        retry (RetryPolicy): optional policy for retrying failed requests.
+        rate_limiter (RateLimiter): optional client-side rate limiter.
+        hooks (list): optional list of :class:`Hooks` called for every request.
+        ring_buffer (RingBufferMode): what is retained of the most recent responses.
+        conditional_cache (ConditionalCache): optional cache for conditional GETs.
+        token_cache (FileTokenCache): optional on-disk cache of app registration
+            tokens shared with other processes.
+        entity_cache (EntityCache): optional cache of entities read by identity.
+        blob_cache (BlobCache): optional on-disk cache of downloaded blobs.
+        max_workers (int): maximum number of requests in flight
+
+    """
+
+    # also change the type hints in __init__ below
+    CLIENTS = {
+        "access_policies": _AsyncClient,
+        "assets": _AsyncConfirmingClient,
+        "assetattachments": _AsyncClient,
+        "appidp": _AsyncClient,
+        "applications": _AsyncClient,
+        "attachments": _AsyncClient,
+        "compliance": _AsyncClient,
+        "compliance_policies": _AsyncClient,
+        "composite": _AsyncClient,
+        "events": _AsyncConfirmingClient,
+        "locations": _AsyncClient,
+        "runner": _AsyncClient,
+        "sboms": _AsyncClient,
+        "subjects": _AsyncClient,
+        "tenancies": _AsyncClient,
+    }
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        url: str,
+        auth: str | Tuple[str, str] | None,
+        *,
+        fixtures: Optional[dict[str, dict[Any, Any]]] = None,
+        verify: bool = True,
+        max_time: float = MAX_TIME,
+        pool: Optional[PoolOptions] = None,
+        retry: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        hooks: Optional[list[Hooks]] = None,
+        ring_buffer: RingBufferMode = RingBufferMode.FULL,
+        conditional_cache: Optional[ConditionalCache] = None,
+        token_cache: Optional[FileTokenCache] = None,
+        entity_cache: Optional[EntityCache] = None,
+        upload_concurrency: int = UPLOAD_CONCURRENCY,
+        blob_cache: Optional[BlobCache] = None,
+        max_workers: int = MAX_WORKERS,
+    ):
+        self._url = url
+        self._auth = auth
+        self._token_cache = token_cache
+        self._entity_cache = entity_cache
+        self._upload_concurrency = upload_concurrency
+        super().__init__(
+            fixtures=fixtures,
+            verify=verify,
+            max_time=max_time,
+            pool=pool,
+            retry=retry,
+            rate_limiter=rate_limiter,
+            hooks=hooks,
+            ring_buffer=ring_buffer,
+            conditional_cache=conditional_cache,
+            blob_cache=blob_cache,
+            max_workers=max_workers,
+        )
+
+        # Type hints for IDE autocomplete, keep in sync with CLIENTS map above
+        self.access_policies: _AsyncClient
+        self.appidp: _AsyncClient
+        self.applications: _AsyncClient
+        self.assets: _AsyncConfirmingClient
+        self.assetattachments: _AsyncClient
+        self.attachments: _AsyncClient
+        self.compliance: _AsyncClient
+        self.compliance_policies: _AsyncClient
+        self.composite: _AsyncClient
+        self.events: _AsyncConfirmingClient
+        self.locations: _AsyncClient
+        self.runner: _AsyncClient
+        self.sboms: _AsyncClient
+        self.subjects: _AsyncClient
+        self.tenancies: _AsyncClient
+
+    def _connect(self, **kwargs) -> Archivist:
+        return Archivist(
+            self._url,
+            self._auth,
+            token_cache=self._token_cache,
+            entity_cache=self._entity_cache,
+            upload_concurrency=self._upload_concurrency,
+            **kwargs,
+        )
+
+    def __str__(self) -> str:
+        return f"AsyncArchivist({self._url})"
+
+    @property
+    def archivist(self) -> Archivist:
+        """Archivist: the underlying synchronous instance"""
+        return self._archivist  # type: ignore
@@ -26,7 +26,6 @@
 
 from __future__ import annotations
 from copy import deepcopy
-from io import BytesIO
 from logging import getLogger
 from os import path
 from typing import BinaryIO, Optional, Any
@@ -41,7 +40,8 @@ from .constants import (
     ATTACHMENTS_LABEL,
 )
 from .dictmerge import _deepmerge
-from .utils import get_url
+from .download import DownloadOptions, Target
+from .utils import open_url
 
 LOGGER = getLogger(__name__)
 
@@ -136,10 +136,9 @@ class _AttachmentsClient:
                 attachment = self.upload(fd, mtype=data.get("content_type"))
 
         else:
-            url = data["url"]
-            fd = BytesIO()
-            get_url(url, fd)
-            attachment = self.upload(fd, mtype=data.get("content_type"))
+            # uploaded whilst downloaded
+            with open_url(data["url"]) as fd:
+                attachment = self.upload(fd, mtype=data.get("content_type"))
 
         result = {
             "arc_attribute_type": "arc_attachment",
@@ -188,10 +187,12 @@ class _AttachmentsClient:
     def download(
         self,
         identity: str,
-        fd: BinaryIO,
+        fd: Target,
         *,
         params: Optional[dict[str, Any]] = None,
-    ) -> Response:
+        options: Optional[DownloadOptions] = None,
+        hash_value: Optional[str] = None,
+    ) -> Optional[Response]:
         """Read attachment
 
         Reads attachment into data sink (usually a file opened for write)..
@@ -200,17 +201,25 @@ class _AttachmentsClient:
 
         Args:
             identity (str): attachment identity e.g. blobs/xxxxxxxxxxxxxxxxxxxxxxx
-            fd (file): opened file descriptor or other file-type sink..
+            fd (file): opened file descriptor or other file-type sink or the
+                path of the file.
             params (dict): e.g. {"allow_insecure": "true"} OR {"strict": "true" }
+            options (DownloadOptions): optional chunk size and how a path is
+                written.
+            hash_value (str): optional expected SHA-256 e.g. arc_blob_hash_value.
+                Raises ArchivistHashMismatchError if the attachment differs.
 
         Returns:
-            JSON as dict
+            REST response - None if the blob was delivered from the blob
+            cache.
 
         """
         return self._archivist.get_file(
             f"{self._subpath}/{identity}",
             fd,
             params=self.__params(params),
+            options=options,
+            hash_value=hash_value,
         )
 
     def info(
@@ -0,0 +1,355 @@
+"""Blob cache
+
+   An opt-in content-addressed cache of downloaded blobs on local disk:
+
+   .. code-block:: python
+
+      arch = Archivist(
+          "https://app.rkvst.io",
+          authtoken,
+          blob_cache=BlobCache("/var/cache/archivist", max_size=10 * 1024**3),
+      )
+      arch.attachments.download(
+          attachment["arc_blob_identity"],
+          "manual.pdf",
+          hash_value=attachment["arc_blob_hash_value"],
+      )
+      ...
+      print(arch.blob_cache.stats())
+
+   Applies to get_file() - and therefore the download() methods of the
+   attachments, assetattachments and sboms clients - whenever the expected
+   SHA-256 hash_value (arc_blob_hash_value) is given. Blobs are stored under
+   their hash so the same blob attached to many assets is downloaded once.
+
+   A cached blob is delivered without a request - hard linked to a path if
+   possible, otherwise copied. Entries are read-only so a hard linked file
+   is read-only too - create the cache with link=False for writable copies.
+
+   An entry is verified against its hash the first time it is used by the
+   process and whenever its size or modification time changes. A corrupt
+   entry is discarded and downloaded again. The least recently used entries
+   are evicted when the cache is larger than max_size.
+
+   Processes may share the directory - a lock file per blob ensures a blob is
+   downloaded by one process at a time and is not evicted whilst another
+   process delivers it. Without fcntl (e.g. on Windows) the directory must
+   only be used by one process.
+
+"""
+
+# pylint:disable=too-few-public-methods
+
+from __future__ import annotations
+from collections import OrderedDict
+from contextlib import contextmanager
+from logging import getLogger
+import os
+import re
+from shutil import copyfile, copyfileobj
+import stat
+from threading import Lock
+from time import time_ns
+from typing import Any, Callable, Iterator, Optional
+
+from .download import CHUNK_SIZE, PART_SUFFIX, Target, _discard, _sha256_file
+
+try:
+    import fcntl
+
+    HAS_FCNTL = True
+except ImportError:  # pragma: no cover
+    HAS_FCNTL = False
+
+LOGGER = getLogger(__name__)
+
+# maximum total size in bytes of cached blobs
+MAX_SIZE = 1024 * 1024 * 1024
+
+# the only hash algorithm of blobs
+HASH_ALG = "sha256"
+
+HASH_RE = re.compile(r"^[0-9a-f]{64}$")
+
+READ_ONLY = stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH
+
+
+def _key(hash_value: str) -> Optional[str]:
+    """normalised hash - None if not a SHA-256 hex digest"""
+    key = hash_value.lower()
+    return key if HASH_RE.match(key) else None
+
+
+class BlobCache:  # pylint: disable=too-many-instance-attributes
+    """
+    Thread-safe size bounded LRU cache of blobs keyed by SHA-256
+
+    Entries already in the directory are reused.
+
+    Args:
+        directory (str): directory of the cache - created if necessary
+        max_size (int): maximum total size in bytes of cached blobs
+        link (bool): if True a blob is hard linked to a path where possible
+            otherwise it is copied
+    """
+
+    def __init__(self, directory: str, *, max_size: int = MAX_SIZE, link: bool = True):
+        self._directory = os.path.abspath(os.path.expanduser(directory))
+        self._max_size = max_size
+        self._link = link
+        self._lock = Lock()
+        self._keys: dict[str, Lock] = {}
+        self._entries: OrderedDict[str, int] = OrderedDict()
+        self._verified: dict[str, tuple[int, int]] = {}
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        os.makedirs(os.path.join(self._directory, "tmp"), exist_ok=True)
+        os.makedirs(os.path.join(self._directory, "locks"), exist_ok=True)
+        self._scan()
+
+    def __str__(self) -> str:
+        return f"BlobCache({self._directory})"
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def directory(self) -> str:
+        """str: directory of the cache"""
+        return self._directory
+
+    @property
+    def size(self) -> int:
+        """int: total size in bytes of cached blobs"""
+        return self._size
+
+    def _entry(self, key: str) -> str:
+        return os.path.join(self._directory, HASH_ALG, key[:2], key)
+
+    def _scan(self):
+        """index the entries in the directory - least recently used first"""
+        found = []
+        root = os.path.join(self._directory, HASH_ALG)
+        for dirpath, _, filenames in os.walk(root):
+            for filename in filenames:
+                if _key(filename) != filename:
+                    continue
+
+                status = os.stat(os.path.join(dirpath, filename))
+                found.append((status.st_atime, filename, status.st_size))
+
+        for _, key, size in sorted(found):
+            self._entries[key] = size
+            self._size += size
+
+    def _key_lock(self, key: str) -> Lock:
+        with self._lock:
+            lock = self._keys.get(key)
+            if lock is None:
+                lock = self._keys[key] = Lock()
+
+            return lock
+
+    @contextmanager
+    def _key_flock(self, key: str, blocking: bool = True) -> Iterator[bool]:
+        """exclude other processes from the key - True if the lock is held"""
+        if not HAS_FCNTL:  # pragma: no cover
+            yield True
+            return
+
+        fd = os.open(
+            os.path.join(self._directory, "locks", key), os.O_RDWR | os.O_CREAT, 0o600
+        )
+        try:
+            try:
+                fcntl.flock(
+                    fd, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB
+                )
+            except BlockingIOError:
+                yield False
+                return
+
+            yield True
+
+        finally:
+            # closing the file releases the lock
+            os.close(fd)
+
+    def _forget(self, key: str):
+        with self._lock:
+            size = self._entries.pop(key, None)
+            if size is not None:
+                self._size -= size
+
+            self._verified.pop(key, None)
+
+    def _remove(self, key: str):
+        self._forget(key)
+        entry = self._entry(key)
+        if os.path.exists(entry):
+            os.chmod(entry, READ_ONLY | stat.S_IWUSR)
+            os.remove(entry)
+
+    def _get(self, key: str) -> Optional[str]:
+        """path of the verified entry - None if not cached"""
+        entry = self._entry(key)
+        try:
+            status = os.stat(entry)
+        except FileNotFoundError:
+            self._forget(key)
+            return None
+
+        fingerprint = (status.st_size, status.st_mtime_ns)
+        if self._verified.get(key) != fingerprint:
+            if _sha256_file(entry) != key:
+                LOGGER.warning("Discard corrupt blob cache entry %s", entry)
+                self._remove(key)
+                return None
+
+            self._verified[key] = fingerprint
+
+        # the access time orders the entries when the cache is next created
+        os.utime(entry, ns=(time_ns(), status.st_mtime_ns))
+        with self._lock:
+            if key not in self._entries:
+                self._size += status.st_size
+
+            self._entries[key] = status.st_size
+            self._entries.move_to_end(key)
+
+        return entry
+
+    def _put(self, key: str, path: str) -> str:
+        """move the verified file at path into the cache"""
+        entry = self._entry(key)
+        os.makedirs(os.path.dirname(entry), exist_ok=True)
+        os.chmod(path, READ_ONLY)
+        os.replace(path, entry)
+        status = os.stat(entry)
+        with self._lock:
+            self._size += status.st_size - self._entries.get(key, 0)
+            self._entries[key] = status.st_size
+            self._entries.move_to_end(key)
+            self._verified[key] = (status.st_size, status.st_mtime_ns)
+
+        return entry
+
+    def _evict(self):
+        """remove least recently used entries not in use until small enough"""
+        with self._lock:
+            candidates = list(self._entries)
+
+        for key in candidates:
+            if self._size <= self._max_size:
+                return
+
+            lock = self._key_lock(key)
+            if not lock.acquire(blocking=False):  # pylint: disable=consider-using-with
+                continue
+
+            try:
+                with self._key_flock(key, blocking=False) as locked:
+                    if not locked:
+                        continue
+
+                    LOGGER.debug("Evict blob %s", key)
+                    self._remove(key)
+                    with self._lock:
+                        self._evictions += 1
+
+            finally:
+                lock.release()
+
+    def _deliver(self, entry: str, target: Target):
+        if not isinstance(target, (str, os.PathLike)):
+            with open(entry, "rb") as fd:
+                copyfileobj(fd, target, CHUNK_SIZE)
+
+            return
+
+        path = os.fspath(target)
+        if os.path.exists(path) and os.path.samefile(entry, path):
+            return
+
+        part = f"{path}{PART_SUFFIX}"
+        _discard(part)
+        if self._link:
+            try:
+                os.link(entry, part)
+                os.replace(part, path)
+                return
+
+            except OSError as ex:  # e.g. another filesystem
+                LOGGER.debug("Hard link of %s failed: %s", entry, ex)
+
+        # the copy is writable
+        copyfile(entry, part)
+        os.replace(part, path)
+
+    def fetch(
+        self, hash_value: str, target: Target, download: Callable[[Target], Any]
+    ) -> Any:
+        """Deliver the blob to target - downloading it on a miss
+
+        Args:
+            hash_value (str): expected SHA-256 of the blob as hex
+            target: binary file opened for write or a path
+            download (Callable): downloads the blob to the given path (or
+                target if hash_value is not a SHA-256) and verifies it against
+                hash_value
+
+        Returns:
+            the value returned by download - None if the blob was cached
+        """
+        key = _key(hash_value)
+        if key is None:
+            return download(target)
+
+        with self._key_lock(key), self._key_flock(key):
+            entry = self._get(key)
+            result = None
+            if entry is None:
+                with self._lock:
+                    self._misses += 1
+
+                # the same path every time so that a ranged download resumes -
+                # only the process holding the lock of the key writes to it
+                path = os.path.join(self._directory, "tmp", key)
+                result = download(path)
+                entry = self._put(key, path)
+
+            else:
+                with self._lock:
+                    self._hits += 1
+
+            self._deliver(entry, target)
+
+        self._evict()
+        return result
+
+    def clear(self):
+        """Remove all entries and reset the counters"""
+        with self._lock:
+            keys = list(self._entries)
+
+        for key in keys:
+            with self._key_lock(key), self._key_flock(key):
+                self._remove(key)
+
+        with self._lock:
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
+
+    def stats(self) -> dict[str, int]:
+        """Number of hits, misses, evictions and entries and their total size"""
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "entries": len(self._entries),
+                "size": self._size,
+            }
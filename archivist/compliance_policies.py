@@ -44,6 +44,7 @@ from .constants import (
     COMPLIANCE_POLICIES_SUBPATH,
     COMPLIANCE_POLICIES_LABEL,
 )
+from .cursor import ListCursor
 from .dictmerge import _deepmerge
 
 
@@ -179,7 +180,12 @@ class _CompliancePoliciesClient:
         )
 
     def list(
-        self, *, page_size: Optional[int] = None, props: Optional[dict[str, Any]] = None
+        self,
+        *,
+        page_size: Optional[int] = None,
+        prefetch: int = 0,
+        cursor: Optional[ListCursor] = None,
+        props: Optional[dict[str, Any]] = None,
     ):
         """List compliance policies.
 
@@ -188,6 +194,8 @@ class _CompliancePoliciesClient:
         Args:
             props (dict): optional e.g. {"compliance_type": "COMPLIANCE_DYNAMIC_TOLERANCE" }
             page_size (int): optional page size. (Rarely used).
+            prefetch (int): optional number of pages fetched in the background.
+            cursor (ListCursor): optional cursor to record or resume the listing.
 
         Returns:
             iterable that returns :class:`CompliancePolicy` instances
@@ -199,6 +207,8 @@ class _CompliancePoliciesClient:
                 self._label,
                 COMPLIANCE_POLICIES_LABEL,
                 page_size=page_size,
+                prefetch=prefetch,
+                cursor=cursor,
                 params=self.__params(props),
             )
         )
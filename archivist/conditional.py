@@ -0,0 +1,148 @@
+"""Conditional GET
+
+   An opt-in cache of response validators (ETag and Last-Modified) and bodies.
+   Repeated reads of the same url send If-None-Match and If-Modified-Since
+   headers and a 304 Not Modified response returns the cached body without
+   downloading or decoding it again:
+
+   .. code-block:: python
+
+      arch = Archivist(
+          "https://app.rkvst.io",
+          authtoken,
+          conditional_cache=ConditionalCache(),
+      )
+      asset = arch.assets.read(identity)  # 200 OK
+      asset = arch.assets.read(identity)  # 304 Not Modified - no body
+
+   Applies to get() - and therefore read() on every client - and to
+   get_file(). File bodies larger than max_file_size are not cached.
+
+"""
+
+# pylint:disable=too-few-public-methods
+
+from __future__ import annotations
+from collections import OrderedDict
+from copy import deepcopy
+from dataclasses import dataclass
+from logging import getLogger
+from threading import Lock
+from typing import Any, Optional
+
+from requests.models import Response
+
+from .constants import HEADERS_ETAG, HEADERS_LAST_MODIFIED
+from .headers import _headers_get
+
+LOGGER = getLogger(__name__)
+
+MAXSIZE = 1024
+MAX_FILE_SIZE = 1024 * 1024
+
+
+def _key(url: str, params: Optional[dict[str, Any]]) -> str:
+    if not params:
+        return url
+
+    return f"{url}?{sorted((k, str(v)) for k, v in params.items())}"
+
+
+@dataclass(frozen=True)
+class _Validated:
+    """A cached body and its validators"""
+
+    etag: Optional[str]
+    last_modified: Optional[str]
+    body: Any
+
+    def headers(self) -> dict[str, str]:
+        """conditional request headers"""
+        headers = {}
+        if self.etag is not None:
+            headers["If-None-Match"] = self.etag
+
+        if self.last_modified is not None:
+            headers["If-Modified-Since"] = self.last_modified
+
+        return headers
+
+
+class ConditionalCache:
+    """
+    Thread-safe LRU cache of response validators and bodies
+
+    Args:
+        maxsize (int): maximum number of responses cached
+        max_file_size (int): maximum size in bytes of a cached file body
+    """
+
+    def __init__(self, *, maxsize: int = MAXSIZE, max_file_size: int = MAX_FILE_SIZE):
+        self._maxsize = maxsize
+        self._max_file_size = max_file_size
+        self._lock = Lock()
+        self._responses: OrderedDict[str, _Validated] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    def __str__(self) -> str:
+        return f"ConditionalCache({self._maxsize})"
+
+    def __len__(self) -> int:
+        return len(self._responses)
+
+    @property
+    def max_file_size(self) -> int:
+        """int: maximum size in bytes of a cached file body"""
+        return self._max_file_size
+
+    def get(self, url: str, params: Optional[dict[str, Any]]) -> Optional[_Validated]:
+        """cached response for url and params"""
+        key = _key(url, params)
+        with self._lock:
+            validated = self._responses.get(key)
+            if validated is not None:
+                self._responses.move_to_end(key)
+
+            return validated
+
+    def put(
+        self, url: str, params: Optional[dict[str, Any]], response: Response, body: Any
+    ):
+        """cache body if the response has validators"""
+        etag = _headers_get(response.headers, HEADERS_ETAG)
+        last_modified = _headers_get(response.headers, HEADERS_LAST_MODIFIED)
+        key = _key(url, params)
+        with self._lock:
+            if etag is None and last_modified is None:
+                self._responses.pop(key, None)
+                return
+
+            self._responses[key] = _Validated(etag, last_modified, body)
+            self._responses.move_to_end(key)
+            while len(self._responses) > self._maxsize:
+                self._responses.popitem(last=False)
+
+    def validated(self, validated: _Validated, *, copy: bool = True) -> Any:
+        """record a 304 Not Modified and return the cached body"""
+        with self._lock:
+            self._hits += 1
+
+        return deepcopy(validated.body) if copy else validated.body
+
+    def modified(self):
+        """record a full response"""
+        with self._lock:
+            self._misses += 1
+
+    def clear(self):
+        """Discard all responses and counters"""
+        with self._lock:
+            self._responses.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def stats(self) -> dict[str, int]:
+        """Number of 304 Not Modified (hits) and full responses (misses)"""
+        with self._lock:
+            return {"hits": self._hits, "misses": self._misses}
@@ -2,26 +2,31 @@
 """
 
 from __future__ import annotations
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 from logging import getLogger
+from threading import Condition, Thread
 
 from copy import deepcopy
-from typing import Any, Optional, overload, Union
-
-import backoff
+from time import monotonic, sleep
+from typing import Any, Callable, Iterable, Iterator, Optional, overload, Union
 
 from .constants import (
     CONFIRMATION_CONFIRMED,
     CONFIRMATION_FAILED,
     CONFIRMATION_PENDING,
     CONFIRMATION_STATUS,
+    CONFIRMATION_WORKERS,
+    PROOF_MECHANISM,
+    SEP,
 )
-from .errors import ArchivistUnconfirmedError
+from .errors import ArchivistError, ArchivistUnconfirmedError
+from .poller import _Wait
 
 
 # pylint:disable=cyclic-import      # but pylint doesn't understand this feature
 from . import assets
 from . import events
-from .utils import backoff_handler
 
 
 MAX_TIME = 1200
@@ -35,18 +40,31 @@ Managers = Union[PublicManagers, PrivateManagers]
 ReturnTypes = Union[assets.Asset, events.Event]
 
 
-def __lookup_max_time():
-    return MAX_TIME
-
-
-def __on_giveup_confirmation(details: dict[str, Any]):
-    identity: str = details["args"][1]
-    elapsed: str = details["elapsed"]
-    raise ArchivistUnconfirmedError(
+def __timed_out(identity: str) -> Callable[[float], Exception]:
+    return lambda elapsed: ArchivistUnconfirmedError(
         f"confirmation for {identity} timed out after {elapsed} seconds"
     )
 
 
+class _LatencyKey:
+    """Key of the confirmation latency of the entity last read
+
+    The proof mechanism if present (assets) else the kind of entity (events)
+    """
+
+    def __init__(self, identity: str):
+        self._kind = identity.split(SEP)[-2] if SEP in identity else identity
+        self._key: Optional[str] = None
+
+    def read(self, entity: ReturnTypes) -> ReturnTypes:
+        """remember the key of entity"""
+        self._key = entity.get(PROOF_MECHANISM) or self._kind
+        return entity
+
+    def __call__(self) -> Optional[str]:
+        return self._key
+
+
 # These overloads are used for type hinting, if self is events client then
 # an event will be returned. If self is Asset client then an asset will be
 # returned. Overloads are evaluated at startup but not at runtime, therefore
@@ -77,17 +95,37 @@ def _wait_for_confirmation(self: events._EventsPublic, identity: str) -> events.
     ...  # pragma: no cover
 
 
-@backoff.on_predicate(
-    backoff.expo,
-    logger=None,  # type: ignore
-    max_time=__lookup_max_time,
-    on_backoff=backoff_handler,
-    on_giveup=__on_giveup_confirmation,
-)
 def _wait_for_confirmation(self: Managers, identity: str) -> ReturnTypes:
-    """Return None until entity is confirmed"""
+    """Poll until entity is confirmed"""
+
+    key = _LatencyKey(identity)
+    return self._archivist.poller.poll(
+        "confirmation",
+        identity,
+        lambda: __confirmed(identity, key.read(self.read(identity))),
+        __timed_out(identity),
+        key=key,
+    )
+
+
+async def _async_wait_for_confirmation(self, identity: str) -> ReturnTypes:
+    """Poll until entity is confirmed
 
-    entity = self.read(identity)
+    self is an asynchronous client whose read() method is a coroutine
+    """
+
+    key = _LatencyKey(identity)
+
+    async def check():
+        return __confirmed(identity, key.read(await self.read(identity)))
+
+    return await self._async_archivist.archivist.poller.async_poll(
+        "confirmation", identity, check, __timed_out(identity), key=key
+    )
+
+
+def __confirmed(identity: str, entity: ReturnTypes) -> ReturnTypes:
+    """Return entity if confirmed, None if still pending"""
 
     LOGGER.debug("entity %s", entity)
     if CONFIRMATION_STATUS not in entity:
@@ -106,26 +144,281 @@ def _wait_for_confirmation(self: Managers, identity: str) -> ReturnTypes:
     return None  # type: ignore
 
 
-def __on_giveup_confirmed(details: dict[str, Any]):
-    self: PrivateManagers = details["args"][0]
-    count = self.pending_count
-    elapsed: int = details["elapsed"]
-    raise ArchivistUnconfirmedError(
-        f"{count} pending assets still present after {elapsed} seconds"
+@dataclass(frozen=True)
+class Confirmation:
+    """
+    Outcome of waiting for the confirmation of one identity
+
+    Args:
+        identity (str): identity of asset or event
+        entity (dict): the confirmed asset or event
+        error (Exception): reason the entity is not confirmed e.g.
+            :class:`ArchivistUnconfirmedError` if confirmation FAILED or
+            timed out, or the error raised reading the entity.
+    """
+
+    identity: str
+    entity: Optional[ReturnTypes] = None
+    error: Optional[Exception] = None
+
+    @property
+    def confirmed(self) -> bool:
+        """bool: True if the entity is confirmed"""
+        return self.error is None
+
+
+def _wait_for_confirmation_many(
+    self: Managers,
+    identities: Iterable[str],
+    *,
+    max_time: float,
+    workers: int = CONFIRMATION_WORKERS,
+) -> Iterator[Confirmation]:
+    """Yield a Confirmation for each identity as soon as it is known
+
+    Pending identities are read concurrently and then all wait for the same
+    poll of the poller - each identity is reported to the on_wait hook.
+    """
+    pending = list(dict.fromkeys(identities))
+    keys = {identity: _LatencyKey(identity) for identity in pending}
+    state = self._archivist.poller._start(
+        "confirmation", f"{len(pending)} identities", max_time
     )
+    with ThreadPoolExecutor(
+        max_workers=workers, thread_name_prefix="archivist-confirm"
+    ) as executor:
+        while pending:
+            futures = {
+                executor.submit(self.read, identity): identity for identity in pending
+            }
+            unconfirmed = set()
+            for future in as_completed(futures):
+                identity = futures[future]
+                key = keys[identity]
+                try:
+                    entity = __confirmed(identity, key.read(future.result()))
+                except Exception as ex:  # pylint: disable=broad-except
+                    state.done(False, identity=identity)
+                    yield Confirmation(identity, error=ex)
+                    continue
+
+                if entity is None:
+                    unconfirmed.add(identity)
+                else:
+                    state.done(True, key(), identity)
+                    yield Confirmation(identity, entity=entity)
+
+            pending = [identity for identity in pending if identity in unconfirmed]
+            if not pending:
+                return
+
+            # the next learned percentile of the first pending identity
+            wait = state.next(keys[pending[0]]())
+            if state.deadline.expired:
+                for identity in pending:
+                    state.done(False, identity=identity)
+                    yield Confirmation(
+                        identity,
+                        error=ArchivistUnconfirmedError(
+                            f"confirmation for {identity} timed out after {max_time} seconds"
+                        ),
+                    )
+                return
+
+            LOGGER.debug("%d pending - wait %s seconds", len(pending), wait)
+            sleep(wait)
+
+
+def _poll(manager: Managers, identity: str, key: _LatencyKey) -> Optional[ReturnTypes]:
+    """read entity - None if still pending"""
+    return __confirmed(identity, key.read(manager.read(identity)))
+
+
+@dataclass
+class _Pending:
+    """an entity waiting for confirmation in the background"""
+
+    manager: Managers
+    future: Future
+    state: _Wait
+    key: _LatencyKey
+    next_poll: float
+
+
+class _BackgroundConfirmer:
+    """Resolves futures when entities are confirmed
+
+    One thread schedules the polls of all pending entities and reads the
+    entities that are due concurrently on a thread pool. Each entity is polled
+    on its own schedule by the poller of its manager.
+
+    Args:
+        workers (int): maximum number of concurrent reads
+    """
+
+    def __init__(self, *, workers: int = CONFIRMATION_WORKERS):
+        self._workers = workers
+        self._cond = Condition()
+        self._pending: dict[str, _Pending] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._thread: Optional[Thread] = None
+        self._closed = False
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def submit(self, manager: Managers, identity: str, max_time: float) -> Future:
+        """Future resolved with the entity when confirmed"""
+        with self._cond:
+            if self._closed:
+                raise ArchivistError("confirmer is closed")
+
+            pending = self._pending.get(identity)
+            if pending is not None:
+                return pending.future
+
+            if self._thread is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._workers,
+                    thread_name_prefix="archivist-confirm",
+                )
+                self._thread = Thread(
+                    target=self._run, name="archivist-confirmer", daemon=True
+                )
+                self._thread.start()
+
+            future: Future = Future()
+            future.set_running_or_notify_cancel()
+            state = manager._archivist.poller._start("confirmation", identity, max_time)
+            key = _LatencyKey(identity)
+            self._pending[identity] = _Pending(
+                manager,
+                future,
+                state,
+                key,
+                next_poll=monotonic() + state.next(),
+            )
+            self._cond.notify()
+            return future
+
+    def _due(self) -> Optional[list[tuple[str, _Pending]]]:
+        """wait until some entities are due to be polled - None if closed"""
+        with self._cond:
+            while not self._closed:
+                now = monotonic()
+                due = [(i, p) for i, p in self._pending.items() if p.next_poll <= now]
+                if due:
+                    return due
+
+                timeout = None
+                if self._pending:
+                    timeout = min(p.next_poll for p in self._pending.values()) - now
+
+                self._cond.wait(timeout)
+
+            return None
+
+    def _resolve(self, identity: str, pending: _Pending, future: Future):
+        try:
+            entity = future.result()
+        except Exception as ex:  # pylint: disable=broad-except
+            pending.state.done(False)
+            self._finish(identity, pending, error=ex)
+            return
+
+        if entity is not None:
+            pending.state.done(True, pending.key())
+            self._finish(identity, pending, entity=entity)
+            return
+
+        wait = pending.state.next(pending.key())
+        if pending.state.deadline.expired:
+            pending.state.done(False)
+            self._finish(
+                identity,
+                pending,
+                error=ArchivistUnconfirmedError(
+                    f"confirmation for {identity} timed out"
+                ),
+            )
+            return
+
+        with self._cond:
+            pending.next_poll = monotonic() + wait
+
+    def _finish(
+        self,
+        identity: str,
+        pending: _Pending,
+        *,
+        entity: Optional[ReturnTypes] = None,
+        error: Optional[Exception] = None,
+    ):
+        with self._cond:
+            self._pending.pop(identity, None)
+
+        if error is not None:
+            pending.future.set_exception(error)
+        else:
+            pending.future.set_result(entity)
+
+    def _run(self):
+        while True:
+            due = self._due()
+            if due is None:
+                return
+
+            futures = {
+                self._executor.submit(  # type: ignore[union-attr]
+                    _poll, pending.manager, identity, pending.key
+                ): (identity, pending)
+                for identity, pending in due
+            }
+            for future in as_completed(futures):
+                self._resolve(*futures[future], future)
+
+    def close(self):
+        """Stop polling - unresolved futures fail"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+            thread, executor = self._thread, self._executor
+
+        if thread is not None:
+            thread.join()
+            executor.shutdown()  # type: ignore
+
+        with self._cond:
+            abandoned, self._pending = self._pending, {}
+
+        for identity, pending in abandoned.items():
+            pending.future.set_exception(
+                ArchivistUnconfirmedError(f"confirmation for {identity} abandoned")
+            )
 
 
-@backoff.on_predicate(
-    backoff.expo,
-    logger=None,  # type: ignore
-    max_time=__lookup_max_time,
-    on_backoff=backoff_handler,
-    on_giveup=__on_giveup_confirmed,
-)
 def _wait_for_confirmed(
     self: PrivateManagers, *, props: Optional[dict[str, Any]] = None, **kwargs: Any
 ) -> bool:
-    """Return False until all entities are confirmed"""
+    """Poll until all entities are confirmed"""
+
+    def giveup(elapsed: float) -> Exception:
+        return ArchivistUnconfirmedError(
+            f"{self.pending_count} pending assets still present after {elapsed} seconds"
+        )
+
+    return self._archivist.poller.poll(
+        "confirmed",
+        str(props),
+        lambda: __all_confirmed(self, props=props, **kwargs),
+        giveup,
+    )
+
+
+def __all_confirmed(
+    self: PrivateManagers, *, props: Optional[dict[str, Any]] = None, **kwargs: Any
+) -> Optional[bool]:
+    """Return None until all entities are confirmed"""
 
     # look for unconfirmed entities
     newprops = deepcopy(props) if props else {}
@@ -145,4 +438,4 @@ def _wait_for_confirmed(
         return True
 
     self.pending_count = count
-    return False
+    return None
@@ -18,11 +18,30 @@ ASSET_BEHAVIOURS = [
 HEADERS_REQUEST_TOTAL_COUNT = "X-Request-Total-Count"
 HEADERS_TOTAL_COUNT = "X-Total-Count"
 HEADERS_RETRY_AFTER = "Archivist-Rate-Limit-Reset"
+HEADERS_CONTENT_LENGTH = "Content-Length"
+HEADERS_ETAG = "ETag"
+HEADERS_LAST_MODIFIED = "Last-Modified"
+HEADERS_RANGE = "Range"
+HEADERS_CONTENT_RANGE = "Content-Range"
 
 CONFIRMATION_STATUS = "confirmation_status"
 CONFIRMATION_PENDING = "PENDING"
 CONFIRMATION_FAILED = "FAILED"
 CONFIRMATION_CONFIRMED = "CONFIRMED"
+# number of concurrent reads when waiting for many confirmations
+CONFIRMATION_WORKERS = 8
+# number of assets in flight when creating many assets
+CREATE_CONCURRENCY = 8
+# number of worker threads and maximum number of events queued or in flight
+# in an event ingestion pipeline
+INGEST_WORKERS = 8
+INGEST_MAXSIZE = 1024
+# number of attachments uploaded concurrently when creating an asset or event
+UPLOAD_CONCURRENCY = 4
+# number of attachments in flight when downloading many attachments
+DOWNLOAD_CONCURRENCY = 8
+
+PROOF_MECHANISM = "proof_mechanism"
 
 APPIDP_SUBPATH = "iam/v1"
 APPIDP_LABEL = "appidp"
@@ -0,0 +1,110 @@
+"""List cursor
+
+   A cursor records the progress of a list() method so that a long running
+   listing can be resumed after a crash or restart:
+
+   .. code-block:: python
+
+      try:
+          cursor = ListCursor.load("events.cursor")
+      except FileNotFoundError:
+          cursor = ListCursor()
+
+      for n, event in enumerate(arch.events.list(cursor=cursor)):
+          process(event)
+          if n % 1000 == 0:
+              cursor.save("events.cursor")
+
+      cursor.save("events.cursor")
+
+   The cursor is updated after the last record of each page has been returned
+   so on resumption the listing restarts from the first record of the last
+   incomplete page i.e. records may be repeated but are never lost.
+
+"""
+
+from __future__ import annotations
+from copy import deepcopy
+from dataclasses import asdict, dataclass
+from json import dump as json_dump, load as json_load
+from logging import getLogger
+from os import replace
+from typing import Any, Optional
+
+LOGGER = getLogger(__name__)
+
+
+@dataclass
+class ListCursor:
+    """
+    Position of a list() method.
+
+    A new cursor is empty and is initialised by the first list() method it is
+    passed to. Thereafter the url, field, params and page_size of the cursor
+    are used when resuming the listing.
+
+    Args:
+        url (str): url of the list endpoint
+        field (str): name of collection of entities e.g assets
+        params (dict): selector used by the listing
+        page_size (int): number of items per request
+        page_token (str): token of the next page to be fetched
+        done (bool): True when all pages have been returned
+    """
+
+    url: str = ""
+    field: str = ""
+    params: Optional[dict[str, Any]] = None
+    page_size: Optional[int] = None
+    page_token: Optional[str] = None
+    done: bool = False
+
+    @property
+    def started(self) -> bool:
+        """bool: True if the cursor has been initialised by a list() method"""
+        return bool(self.url)
+
+    def start(
+        self,
+        url: str,
+        field: str,
+        *,
+        params: Optional[dict[str, Any]] = None,
+        page_size: Optional[int] = None,
+    ):
+        """Initialise the cursor at the first page of a listing"""
+        self.url = url
+        self.field = field
+        self.params = deepcopy(params)
+        self.page_size = page_size
+        self.page_token = None
+        self.done = False
+
+    def advance(self, page_token: Optional[str]):
+        """Move the cursor to the next page"""
+        self.page_token = page_token or None
+        self.done = not page_token
+
+    def to_dict(self) -> dict[str, Any]:
+        """Emit cursor as a json-serializable dict"""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> ListCursor:
+        """Create cursor from dict emitted by to_dict()"""
+        return cls(**data)
+
+    def save(self, path: str):
+        """Atomically write the cursor to a file as json"""
+        tmp = f"{path}.tmp"
+        with open(tmp, mode="w", encoding="utf-8") as fd:
+            json_dump(self.to_dict(), fd)
+
+        replace(tmp, path)
+        LOGGER.debug("Saved cursor %s to %s", self, path)
+
+    @classmethod
+    def load(cls, path: str) -> ListCursor:
+        """Read cursor from a file written by save()"""
+        with open(path, mode="r", encoding="utf-8") as fd:
+            return cls.from_dict(json_load(fd))
@@ -0,0 +1,570 @@
+"""Downloads
+
+   Streams the body of a response to a file. This is the engine behind
+   get_file() and therefore the download() methods of the attachments,
+   assetattachments and sboms clients:
+
+   .. code-block:: python
+
+      arch.attachments.download(
+          attachment["arc_blob_identity"],
+          "firmware.bin",
+          hash_value=attachment["arc_blob_hash_value"],
+          options=DownloadOptions(chunk_size=8 * 1024 * 1024, mmap=True),
+      )
+
+   The body is read in large chunks into a reusable buffer. The target is
+   either an open binary file or a path. A path is written to a temporary
+   file alongside that is renamed once the download is complete and verified
+   - optionally preallocated or written through a memory map.
+
+   If the expected SHA-256 hash is given it is computed whilst downloading
+   and :class:`ArchivistHashMismatchError` is raised if it differs.
+
+   A path can also be fetched with HTTP Range requests:
+
+   .. code-block:: python
+
+      arch.attachments.download(
+          attachment["arc_blob_identity"],
+          "firmware.bin",
+          hash_value=attachment["arc_blob_hash_value"],
+          options=DownloadOptions(resume=True, ranges=8),
+      )
+
+   With resume the temporary file is kept if the download fails and the
+   next download of the same path continues from the bytes already on disk.
+   With ranges the body is fetched as that many concurrent byte ranges
+   written at their offsets in a preallocated temporary file. A server that
+   ignores the Range header is downloaded as a single stream. The hash of
+   a ranged download is computed by reading the file once it is complete.
+
+"""
+
+# pylint:disable=too-few-public-methods
+
+from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from hashlib import sha256
+from logging import getLogger
+from math import ceil
+from mmap import mmap
+import os
+from threading import Lock
+from typing import BinaryIO, Callable, Dict, Optional, Union
+
+from requests.models import Response
+
+from .constants import HEADERS_CONTENT_LENGTH, HEADERS_CONTENT_RANGE, HEADERS_RANGE
+from .errors import ArchivistError, ArchivistHashMismatchError, _parse_response
+from .headers import _headers_get
+
+LOGGER = getLogger(__name__)
+
+# bytes read from the response at a time
+CHUNK_SIZE = 1024 * 1024
+
+# suffix of the temporary file whilst a path is downloaded
+PART_SUFFIX = ".part"
+
+# suffix of the record of complete bytes whilst ranges are downloaded
+OFFSET_SUFFIX = ".offset"
+
+Path = Union[str, "os.PathLike[str]"]
+
+Target = Union[BinaryIO, Path]
+
+# makes a GET request of the download with the given extra headers
+Fetch = Callable[[Dict[str, str]], Response]
+
+
+@dataclass(frozen=True)
+class DownloadOptions:
+    """
+    Download options
+
+    Args:
+        chunk_size (int): bytes read from the response at a time
+        preallocate (bool): if True and the target is a path the file is
+            allocated to the content length before writing.
+        mmap (bool): if True and the target is a path the file is written
+            through a memory map. Requires a content length - otherwise the
+            file is written normally.
+        resume (bool): if True and the target is a path the temporary file
+            is kept when the download fails and a later download of the same
+            path continues from it with a Range request.
+        ranges (int): if more than 1 and the target is a path the body is
+            fetched as up to this many concurrent byte ranges. Each range is
+            at least chunk_size bytes.
+    """
+
+    chunk_size: int = CHUNK_SIZE
+    preallocate: bool = False
+    mmap: bool = False
+    resume: bool = False
+    ranges: int = 1
+
+    def ranged(self, target: Target) -> bool:
+        """True if target is downloaded with Range requests"""
+        return isinstance(target, (str, os.PathLike)) and (
+            self.resume or self.ranges > 1
+        )
+
+
+class _Copier:
+    """Copies the body of a response to a write function whilst hashing it
+
+    Up to retain bytes of the body are kept (e.g. for the conditional cache)
+    """
+
+    def __init__(self, response: Response, options: DownloadOptions, retain: int):
+        self._response = response
+        self._options = options
+        self._retain = retain
+        self._retained: list[bytes] = []
+        self.hash = sha256()
+        self.size = 0
+
+    def _readinto(self) -> Optional[Callable[[memoryview], int]]:
+        """readinto of the raw body - None if the body must be decoded"""
+        raw = getattr(self._response, "raw", None)
+        encoding = _headers_get(self._response.headers, "Content-Encoding")
+        if raw is None or not hasattr(raw, "readinto"):
+            return None
+
+        if encoding not in (None, "identity"):
+            return None
+
+        return raw.readinto
+
+    def _chunk(self, chunk: memoryview | bytes, write: Callable):
+        self.hash.update(chunk)
+        write(chunk)
+        self.size += len(chunk)
+        if self.size <= self._retain:
+            self._retained.append(bytes(chunk))
+
+    def copy(self, write: Callable):
+        """copy the whole body to write"""
+        readinto = self._readinto()
+        if readinto is None:
+            for chunk in self._response.iter_content(
+                chunk_size=self._options.chunk_size
+            ):
+                if chunk:
+                    self._chunk(chunk, write)
+
+            return
+
+        view = memoryview(bytearray(self._options.chunk_size))
+        while True:
+            size = readinto(view)
+            if not size:
+                return
+
+            self._chunk(view[:size], write)
+
+    @property
+    def retained(self) -> Optional[bytes]:
+        """the body if no larger than retain bytes"""
+        if self.size > self._retain:
+            return None
+
+        return b"".join(self._retained)
+
+    def verify(self, hash_value: Optional[str]):
+        """raise ArchivistHashMismatchError if the body does not match"""
+        if hash_value is None:
+            return
+
+        digest = self.hash.hexdigest()
+        if digest != hash_value.lower():
+            raise ArchivistHashMismatchError(
+                f"SHA-256 of {self._response.url} is {digest} not {hash_value}"
+            )
+
+
+def _content_length(response: Response) -> Optional[int]:
+    length = _headers_get(response.headers, HEADERS_CONTENT_LENGTH)
+    if length is None:
+        return None
+
+    if _headers_get(response.headers, "Content-Encoding") not in (None, "identity"):
+        return None
+
+    return int(length)
+
+
+def _preallocate(fd: int, length: int):
+    if hasattr(os, "posix_fallocate"):
+        try:
+            os.posix_fallocate(fd, 0, length)
+            return
+        except OSError as ex:  # e.g. not supported by the filesystem
+            LOGGER.debug("posix_fallocate failed: %s", ex)
+
+    os.ftruncate(fd, length)
+
+
+class _MappedWriter:
+    """Writes consecutive chunks to a memory map"""
+
+    def __init__(self, mapped: mmap):
+        self._mapped = mapped
+        self._position = 0
+
+    def __call__(self, chunk: memoryview | bytes):
+        end = self._position + len(chunk)
+        if end > len(self._mapped):
+            raise ArchivistError("Download is longer than its content length")
+
+        self._mapped[self._position : end] = chunk
+        self._position = end
+
+
+def _download_path(
+    copier: _Copier,
+    path: str,
+    length: Optional[int],
+    options: DownloadOptions,
+    hash_value: Optional[str],
+):
+    part = f"{path}{PART_SUFFIX}"
+    try:
+        with open(part, "w+b") as fd:
+            if length and (options.preallocate or options.mmap):
+                _preallocate(fd.fileno(), length)
+
+            if length and options.mmap:
+                with mmap(fd.fileno(), length) as mapped:
+                    copier.copy(_MappedWriter(mapped))
+                    mapped.flush()
+
+            else:
+                copier.copy(fd.write)
+
+            if length is not None and copier.size != length:
+                fd.truncate(copier.size)
+
+        copier.verify(hash_value)
+        os.replace(part, path)
+
+    except BaseException:
+        if os.path.exists(part):
+            os.remove(part)
+
+        raise
+
+
+def _download(
+    response: Response,
+    target: Target,
+    *,
+    options: Optional[DownloadOptions] = None,
+    hash_value: Optional[str] = None,
+    retain: int = 0,
+) -> Optional[bytes]:
+    """Write the body of response to target
+
+    Args:
+        response: streamed response
+        target: binary file opened for write or a path
+        options (DownloadOptions): chunk size and how a path is written
+        hash_value (str): expected SHA-256 of the body as hex
+        retain (int): maximum size of body returned
+
+    Returns:
+        the body if it is no larger than retain bytes
+    """
+    options = options or DownloadOptions()
+    copier = _Copier(response, options, retain)
+    if isinstance(target, (str, os.PathLike)):
+        _download_path(
+            copier, os.fspath(target), _content_length(response), options, hash_value
+        )
+    else:
+        copier.copy(target.write)
+        copier.verify(hash_value)
+
+    LOGGER.debug("Downloaded %d bytes from %s", copier.size, response.url)
+    return copier.retained
+
+
+def _range(start: int, end: Optional[int] = None) -> dict[str, str]:
+    """Range header of bytes start to end (exclusive) - open ended if no end"""
+    last = "" if end is None else str(end - 1)
+    return {HEADERS_RANGE: f"bytes={start}-{last}"}
+
+
+def _content_range(response: Response) -> tuple[Optional[int], Optional[int]]:
+    """first byte and complete length from e.g. Content-Range: bytes 0-99/1000"""
+    content_range = _headers_get(response.headers, HEADERS_CONTENT_RANGE)
+    if content_range is None:
+        return None, None
+
+    _, _, spec = content_range.partition(" ")
+    span, _, total = spec.partition("/")
+    first = span.partition("-")[0]
+    return (
+        int(first) if first.isdigit() else None,
+        int(total) if total.isdigit() else None,
+    )
+
+
+def _discard(part: str):
+    for path in (part, f"{part}{OFFSET_SUFFIX}"):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def _resume_offset(part: str) -> int:
+    """number of leading bytes of part that are complete"""
+    try:
+        with open(f"{part}{OFFSET_SUFFIX}", encoding="utf-8") as fd:
+            offset = int(fd.read())
+
+    except (OSError, ValueError):
+        # written sequentially - every byte is complete
+        return os.path.getsize(part) if os.path.exists(part) else 0
+
+    # the bytes after offset were written by ranges that may be incomplete
+    if os.path.exists(part):
+        os.truncate(part, offset)
+        return offset
+
+    return 0
+
+
+class _Progress:
+    """Records the number of leading bytes of a part file that are complete
+
+    Ranges complete out of order so the offset is only advanced over
+    consecutive complete ranges. The offset is saved alongside the part file
+    so that a download interrupted by the process exiting resumes correctly.
+    """
+
+    def __init__(self, part: str, offset: int):
+        self._path = f"{part}{OFFSET_SUFFIX}"
+        self._lock = Lock()
+        self._offset = offset
+        self._complete: dict[int, int] = {}
+        self._save()
+
+    def _save(self):
+        saving = f"{self._path}.tmp"
+        with open(saving, "w", encoding="utf-8") as fd:
+            fd.write(str(self._offset))
+
+        os.replace(saving, self._path)
+
+    def done(self, start: int, end: int):
+        """record that bytes start to end (exclusive) are complete"""
+        with self._lock:
+            self._complete[start] = end
+            while self._offset in self._complete:
+                self._offset = self._complete.pop(self._offset)
+
+            self._save()
+
+    def remove(self):
+        """the part file is complete"""
+        os.remove(self._path)
+
+
+def _split(start: int, total: int, options: DownloadOptions) -> list[tuple[int, int]]:
+    """bytes start to total as at most options.ranges ranges of chunk_size"""
+    count = max(min(options.ranges, ceil((total - start) / options.chunk_size)), 1)
+    size = ceil((total - start) / count)
+    return [(first, min(first + size, total)) for first in range(start, total, size)]
+
+
+def _fetch_range(
+    fetch: Fetch,
+    part: str,
+    start: int,
+    end: int,
+    options: DownloadOptions,
+    progress: _Progress,
+):
+    response = fetch(_range(start, end))
+    error = _parse_response(response)
+    if error is not None:
+        raise error
+
+    if response.status_code != 206 or _content_range(response)[0] != start:
+        raise ArchivistError(f"{response.url} did not return bytes {start}-{end - 1}")
+
+    copier = _Copier(response, options, 0)
+    with open(part, "r+b") as fd:
+        fd.seek(start)
+        copier.copy(fd.write)
+
+    if copier.size != end - start:
+        raise ArchivistError(
+            f"{response.url} returned {copier.size} bytes of range {start}-{end - 1}"
+        )
+
+    progress.done(start, end)
+
+
+def _fetch_ranges(
+    fetch: Fetch, part: str, ranges: list[tuple[int, int]], options: DownloadOptions
+):
+    """fetch the ranges concurrently into the preallocated part file"""
+    progress = _Progress(part, ranges[0][0])
+    with ThreadPoolExecutor(
+        max_workers=len(ranges), thread_name_prefix="archivist-download"
+    ) as executor:
+        futures = [
+            executor.submit(_fetch_range, fetch, part, start, end, options, progress)
+            for start, end in ranges
+        ]
+
+    # every range has finished - complete ranges are kept for a resume
+    for future in futures:
+        future.result()
+
+    progress.remove()
+
+
+def _fetch_part(
+    fetch: Fetch, part: str, response: Response, start: int, options: DownloadOptions
+):
+    """write the first response to part and fetch any remaining ranges"""
+    copier = _Copier(response, options, 0)
+    with open(part, "ab"):
+        pass
+
+    with open(part, "r+b") as fd:
+        if response.status_code != 206:
+            # the Range header was ignored - this is the whole body
+            LOGGER.debug("%s does not support ranges", response.url)
+            fd.truncate(0)
+            copier.copy(fd.write)
+            return
+
+        first, total = _content_range(response)
+        if first != start:
+            raise ArchivistError(f"{response.url} did not return bytes from {start}")
+
+        fd.seek(start)
+        fd.truncate(start)
+        copier.copy(fd.write)
+        offset = start + copier.size
+        if total is None or offset == total:
+            return
+
+        if options.ranges <= 1 or offset > total:
+            raise ArchivistError(f"{response.url} returned {offset} of {total} bytes")
+
+        _preallocate(fd.fileno(), total)
+
+    LOGGER.debug("Fetch bytes %d-%d of %s", offset, total - 1, response.url)
+    _fetch_ranges(fetch, part, _split(offset, total, options), options)
+
+
+def _sha256_file(path: str, chunk_size: int = CHUNK_SIZE) -> str:
+    """SHA-256 of the file at path as hex"""
+    digest = sha256()
+    view = memoryview(bytearray(chunk_size))
+    with open(path, "rb") as fd:
+        while True:
+            size = fd.readinto(view)
+            if not size:
+                return digest.hexdigest()
+
+            digest.update(view[:size])
+
+
+def _verify_file(path: str, options: DownloadOptions, hash_value: Optional[str]):
+    if hash_value is None:
+        return
+
+    digest = _sha256_file(path, options.chunk_size)
+    if digest != hash_value.lower():
+        raise ArchivistHashMismatchError(
+            f"SHA-256 of {path} is {digest} not {hash_value}"
+        )
+
+
+def _download_ranges(
+    fetch: Fetch,
+    target: Path,
+    *,
+    options: DownloadOptions,
+    hash_value: Optional[str] = None,
+) -> Response:
+    """Download to the path target with Range requests
+
+    Args:
+        fetch: makes a streamed GET request with the given extra headers
+        target: path of the file
+        options (DownloadOptions): resume, number of ranges and chunk size
+        hash_value (str): expected SHA-256 of the body as hex
+
+    Returns:
+        the response of the first request
+    """
+    path = os.fspath(target)
+    part = f"{path}{PART_SUFFIX}"
+    start = _resume_offset(part) if options.resume else 0
+
+    def first_range() -> Response:
+        # the first range also tells the complete length
+        end = start + options.chunk_size if options.ranges > 1 else None
+        return fetch(_range(start, end))
+
+    response = first_range()
+    try:
+        _, total = _content_range(response)
+        if response.status_code == 416 and start > 0 and total != start:
+            # the part file is longer than the body - start again
+            LOGGER.debug("%s is longer than %s bytes", part, total)
+            _discard(part)
+            start = 0
+            response = first_range()
+
+        if response.status_code == 416 and start > 0:
+            LOGGER.debug("%s is already complete", part)
+
+        else:
+            error = _parse_response(response)
+            if error is not None:
+                raise error
+
+            _fetch_part(fetch, part, response, start, options)
+
+        _verify_file(part, options, hash_value)
+        os.replace(part, path)
+        _discard(part)
+
+    except BaseException as ex:
+        if not options.resume or isinstance(ex, ArchivistHashMismatchError):
+            _discard(part)
+
+        raise
+
+    LOGGER.debug("Downloaded %s from byte %d", path, start)
+    return response
+
+
+def _write(
+    body: bytes,
+    target: Target,
+    *,
+    hash_value: Optional[str] = None,
+):
+    """Write a cached body to target"""
+    if hash_value is not None:
+        digest = sha256(body).hexdigest()
+        if digest != hash_value.lower():
+            raise ArchivistHashMismatchError(
+                f"SHA-256 of cached body is {digest} not {hash_value}"
+            )
+
+    if isinstance(target, (str, os.PathLike)):
+        with open(target, "wb") as fd:
+            fd.write(body)
+    else:
+        target.write(body)
@@ -0,0 +1,240 @@
+"""Entity cache
+
+   An opt-in read-through cache of entities read by identity e.g. assets.read(),
+   locations.read(), compliance_policies.read() and subjects.read():
+
+   .. code-block:: python
+
+      cache = EntityCache(maxsize=4096, ttls={"locations": 86400.0})
+      arch = Archivist("https://app.rkvst.io", authtoken, entity_cache=cache)
+      ...
+      print(cache.stats())
+
+   Each kind of entity (assets, events, locations, compliance_policies and
+   subjects) has its own time to live in seconds. Kinds without a time to
+   live are not cached. An entity that is not yet confirmed is not cached so
+   that waiting for confirmation always reads upstream. Confirmed events are
+   immutable and are cached until evicted. The least
+   recently used entity is evicted when the cache is full.
+
+   An entity is invalidated when the same Archivist instance (or a copy)
+   patches, deletes or posts to it, or posts to one of its children - e.g.
+   creating an event invalidates its asset.
+
+"""
+
+# pylint:disable=too-few-public-methods
+
+from __future__ import annotations
+from collections import Counter, OrderedDict
+from copy import deepcopy
+from logging import getLogger
+from math import inf
+from threading import Lock
+from time import monotonic
+from typing import Any, Optional
+from urllib.parse import urlsplit
+
+from .constants import (
+    ASSETS_LABEL,
+    ASSETS_SUBPATH,
+    COMPLIANCE_POLICIES_LABEL,
+    COMPLIANCE_POLICIES_SUBPATH,
+    CONFIRMATION_CONFIRMED,
+    CONFIRMATION_STATUS,
+    EVENTS_LABEL,
+    LOCATIONS_LABEL,
+    LOCATIONS_SUBPATH,
+    SEP,
+    SUBJECTS_LABEL,
+    SUBJECTS_SUBPATH,
+)
+from .metrics import ID_RE
+
+LOGGER = getLogger(__name__)
+
+MAXSIZE = 1024
+
+# time to live in seconds of each kind of entity
+TTLS = {
+    "assets": 30.0,
+    "locations": 3600.0,
+    "compliance_policies": 3600.0,
+    "subjects": 300.0,
+}
+
+
+# path segments of the collection of each kind of entity
+COLLECTIONS = tuple(
+    (tuple(f"{subpath}{SEP}{label}".split(SEP)), label)
+    for subpath, label in (
+        (ASSETS_SUBPATH, ASSETS_LABEL),
+        (LOCATIONS_SUBPATH, LOCATIONS_LABEL),
+        (COMPLIANCE_POLICIES_SUBPATH, COMPLIANCE_POLICIES_LABEL),
+        (SUBJECTS_SUBPATH, SUBJECTS_LABEL),
+    )
+)
+
+
+def _is_id(segment: str) -> bool:
+    return segment != "-" and ID_RE.match(segment) is not None
+
+
+def _kind(url: str) -> Optional[str]:
+    """kind of the entity at url - None if url is not a cacheable entity"""
+    segments = tuple(urlsplit(url).path.rstrip(SEP).split(SEP))
+    if not _is_id(segments[-1]):
+        return None
+
+    collection = segments[:-1]
+    event = (
+        len(collection) > 2
+        and collection[-1] == EVENTS_LABEL
+        and _is_id(collection[-2])
+    )
+    if event:
+        # assets/{id}/events/{id}
+        collection = collection[:-2]
+
+    for path, kind in COLLECTIONS:
+        if collection[-len(path) :] == path:
+            if not event:
+                return kind
+
+            return EVENTS_LABEL if kind == ASSETS_LABEL else None
+
+    return None
+
+
+class EntityCache:  # pylint: disable=too-many-instance-attributes
+    """
+    Thread-safe LRU cache of entities with a time to live per kind
+
+    Args:
+        maxsize (int): maximum number of entities cached
+        ttls (dict): time to live in seconds keyed by kind e.g. "assets".
+            Merged with the defaults - a value of None disables caching
+            that kind.
+    """
+
+    def __init__(
+        self,
+        *,
+        maxsize: int = MAXSIZE,
+        ttls: Optional[dict[str, Optional[float]]] = None,
+    ):
+        self._maxsize = maxsize
+        self._ttls = {**TTLS, **(ttls or {})}
+        self._lock = Lock()
+        self._entities: OrderedDict[str, tuple[str, float, dict[str, Any]]]
+        self._entities = OrderedDict()
+        self._hits: Counter = Counter()
+        self._misses: Counter = Counter()
+        self._evictions: Counter = Counter()
+
+        # incremented by every invalidation so that an entity read before an
+        # invalidation is not cached after it
+        self._generation = 0
+
+    def __str__(self) -> str:
+        return f"EntityCache({self._maxsize})"
+
+    def __len__(self) -> int:
+        return len(self._entities)
+
+    def _ttl(self, kind: str, entity: dict[str, Any]) -> Optional[float]:
+        confirmation = entity.get(CONFIRMATION_STATUS)
+        if kind == EVENTS_LABEL:
+            # confirmed events are immutable
+            return inf if confirmation == CONFIRMATION_CONFIRMED else None
+
+        # waits for confirmation must read upstream
+        if confirmation is not None and confirmation != CONFIRMATION_CONFIRMED:
+            return None
+
+        return self._ttls.get(kind)
+
+    @property
+    def generation(self) -> int:
+        """int: number of invalidations - see put()"""
+        return self._generation
+
+    def get(self, url: str) -> Optional[dict[str, Any]]:
+        """Entity at url if cached and not expired"""
+        kind = _kind(url)
+        if kind is None or (kind != EVENTS_LABEL and self._ttls.get(kind) is None):
+            return None
+
+        with self._lock:
+            cached = self._entities.get(url)
+            if cached is not None and cached[1] <= monotonic():
+                del self._entities[url]
+                cached = None
+
+            if cached is None:
+                self._misses[kind] += 1
+                return None
+
+            self._entities.move_to_end(url)
+            self._hits[kind] += 1
+
+        return deepcopy(cached[2])
+
+    def put(
+        self, url: str, entity: dict[str, Any], *, generation: Optional[int] = None
+    ):
+        """Cache the entity read from url if its kind is cacheable
+
+        Args:
+            url (str): url of entity
+            entity (dict): the entity
+            generation (int): value of generation before the entity was read.
+                The entity is not cached if invalidated since.
+        """
+        kind = _kind(url)
+        if kind is None:
+            return
+
+        ttl = self._ttl(kind, entity)
+        if ttl is None:
+            return
+
+        entity = deepcopy(entity)
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+
+            self._entities[url] = (kind, monotonic() + ttl, entity)
+            self._entities.move_to_end(url)
+            while len(self._entities) > self._maxsize:
+                _, (evicted, _, _) = self._entities.popitem(last=False)
+                self._evictions[evicted] += 1
+
+    def invalidate(self, url: str):
+        """Discard the entity at url and all its parents"""
+        segments = urlsplit(url)._replace(query="", fragment="").geturl().split(SEP)
+        with self._lock:
+            self._generation += 1
+            for i in range(len(segments), 0, -1):
+                self._entities.pop(SEP.join(segments[:i]), None)
+
+    def clear(self):
+        """Discard all entities and counters"""
+        with self._lock:
+            self._entities.clear()
+            self._hits.clear()
+            self._misses.clear()
+            self._evictions.clear()
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        """Hits, misses and evictions keyed by kind e.g. "assets" """
+        with self._lock:
+            kinds = set(self._hits) | set(self._misses) | set(self._evictions)
+            return {
+                kind: {
+                    "hits": self._hits[kind],
+                    "misses": self._misses[kind],
+                    "evictions": self._evictions[kind],
+                }
+                for kind in sorted(kinds)
+            }
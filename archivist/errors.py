@@ -36,6 +36,10 @@ class ArchivistUnwithdrawnError(ArchivistError):
     """Sbom failed to be withdrawn after fixed timeout"""
 
 
+class ArchivistHashMismatchError(ArchivistError):
+    """Downloaded content does not match its expected hash"""
+
+
 class ArchivistInvalidOperationError(ArchivistError):
     """Runner Operation is invalid"""
 
@@ -23,9 +23,11 @@
 """
 
 from __future__ import annotations
+from concurrent.futures import Future
 from copy import deepcopy
+from functools import partial
 from logging import getLogger
-from typing import Any, Optional
+from typing import Any, Callable, Iterable, Iterator, Optional, Tuple
 
 # pylint:disable=cyclic-import      # but pylint doesn't understand this feature
 from . import archivist
@@ -34,12 +36,19 @@ from .constants import (
     ASSETS_SUBPATH,
     ASSETS_WILDCARD,
     CONFIRMATION_STATUS,
+    CONFIRMATION_WORKERS,
     EVENTS_LABEL,
+    INGEST_MAXSIZE,
+    INGEST_WORKERS,
     SBOM_RELEASE,
 )
 from . import confirmer
+from .cursor import ListCursor
 from .dictmerge import _deepmerge
 from .errors import ArchivistBadFieldError, ArchivistNotFoundError
+from .ingest import EventPipeline
+from .parallel import _call_all
+from .partition import TimePartition, ValuePartition
 
 
 LOGGER = getLogger(__name__)
@@ -201,6 +210,9 @@ class _EventsPublic:
         *,
         asset_id: Optional[str] = None,
         page_size: Optional[int] = None,
+        prefetch: int = 0,
+        cursor: Optional[ListCursor] = None,
+        partition: Optional[TimePartition | ValuePartition] = None,
         props: Optional[dict[str, Any]] = None,
         attrs: Optional[dict[str, Any]] = None,
         asset_attrs: Optional[dict[str, Any]] = None,
@@ -215,6 +227,10 @@ class _EventsPublic:
             attrs (dict): e.g. {"arc_display_type": "open" }
             asset_attrs (dict): optional asset_attributes e.g. {"arc_display_type": "door" }
             page_size (int): optional page size. (Rarely used).
+            prefetch (int): optional number of pages fetched in the background.
+            cursor (ListCursor): optional cursor to record or resume the listing.
+            partition (TimePartition|ValuePartition): optional partition of the
+                listing into disjoint queries that are paginated concurrently.
 
         Returns:
             iterable that returns :class:`Event` instances
@@ -231,6 +247,9 @@ class _EventsPublic:
                 f"{self._identity(asset_id)}/{EVENTS_LABEL}",  # type:ignore
                 EVENTS_LABEL,
                 page_size=page_size,
+                prefetch=prefetch,
+                cursor=cursor,
+                partition=partition,
                 params=self._params(props, attrs, asset_attrs),
             )
         )
@@ -321,6 +340,20 @@ class _EventsRestricted(_EventsPublic):
             confirm=confirm,
         )
 
+    def __upload_attachment(
+        self, attachment: dict[str, Any]
+    ) -> Tuple[dict[str, Any], Optional[dict[str, Any]]]:
+        """upload attachment and parse it if it is an sbom release"""
+        result = self._archivist.attachments.create(attachment)
+        if attachment.get("type") != SBOM_RELEASE:
+            return result, None
+
+        return result, self._archivist.sboms.parse(attachment)
+
+    def __upload_sbom(self, sbom: dict[str, Any]) -> Tuple[dict[str, Any], None]:
+        """upload sbom - shaped like an attachment upload so both run together"""
+        return self._archivist.sboms.create(sbom), None
+
     def create_from_data(
         self, asset_id: str, data: dict[str, Any], *, confirm: bool = True
     ) -> Event:
@@ -352,28 +385,33 @@ class _EventsRestricted(_EventsPublic):
                 )
                 event_attributes["arc_location_identity"] = loc["identity"]
 
+        # the sbom and attachments are uploaded concurrently and then applied
+        # in order
         sbom = data.pop("sbom", None)
+        attachments = data.pop("attachments", None) or []
+        uploads: list[Callable[[], Tuple[dict[str, Any], Optional[dict[str, Any]]]]]
+        uploads = [partial(self.__upload_attachment, a) for a in attachments]
         if sbom is not None:
-            sbom_result = self._archivist.sboms.create(sbom)
+            uploads.insert(0, partial(self.__upload_sbom, sbom))
+
+        results = _call_all(uploads, self._archivist.upload_concurrency)
+        if sbom is not None:
+            sbom_result, _ = results.pop(0)
             for k, v in sbom_result.items():
                 event_attributes[f"sbom_{k}"] = v
 
-        attachments = data.pop("attachments", None)
-        if attachments is not None:
-            for a in attachments:
-                result = self._archivist.attachments.create(a)
-                if a.get("type") == SBOM_RELEASE:
-                    sbom_result = self._archivist.sboms.parse(a)
-                    for k, v in sbom_result.items():
-                        event_attributes[f"sbom_{k}"] = v
+        for a, (result, sbom_result) in zip(attachments, results):
+            if sbom_result is not None:
+                for k, v in sbom_result.items():
+                    event_attributes[f"sbom_{k}"] = v
 
-                    event_attributes["sbom_identity"] = result["arc_blob_identity"]
+                event_attributes["sbom_identity"] = result["arc_blob_identity"]
 
-                attachment_key = a.get("attachment", None)
-                if attachment_key is None:
-                    # failing that create a key from filename or url
-                    attachment_key = self._archivist.attachments.get_default_key(a)
-                event_attributes[attachment_key] = result
+            attachment_key = a.get("attachment", None)
+            if attachment_key is None:
+                # failing that create a key from filename or url
+                attachment_key = self._archivist.attachments.get_default_key(a)
+            event_attributes[attachment_key] = result
 
         data["event_attributes"] = event_attributes
 
@@ -386,6 +424,72 @@ class _EventsRestricted(_EventsPublic):
         event_id: str = event["identity"]
         return self.wait_for_confirmation(event_id)
 
+    def submit(
+        self,
+        asset_id: str,
+        props: dict[str, Any],
+        attrs: dict[str, Any],
+        *,
+        asset_attrs: Optional[dict[str, Any]] = None,
+    ) -> Future:
+        """Create event without waiting for confirmation
+
+        Creates event for given asset. See submit_from_data().
+
+        Args:
+            asset_id (str): asset identity e.g. assets/xxxxxxxxxxxxxxxxxxxxxxxxxx
+            props (dict): properties for this event.
+            attrs (dict): attributes of created event.
+            asset_attrs (dict): attributes of referenced asset.
+
+        Returns:
+            Future of the confirmed :class:`Event` instance
+
+        """
+        return self.submit_from_data(asset_id, self._params(props, attrs, asset_attrs))
+
+    def submit_from_data(self, asset_id: str, data: dict[str, Any]) -> Future:
+        """Create event without waiting for confirmation
+
+        Returns as soon as the event is created. A background confirmer shared
+        by the Archivist instance resolves the future with the confirmed event
+        or fails it with ArchivistUnconfirmedError. Many futures can be waited
+        for with concurrent.futures.wait() or as_completed().
+
+        Args:
+            asset_id (str): asset identity e.g. assets/xxxxxxxxxxxxxxxxxxxxxxxxxx
+            data (dict): request body of event.
+
+        Returns:
+            Future of the confirmed :class:`Event` instance
+
+        """
+        event = self.create_from_data(asset_id, data, confirm=False)
+        # pylint: disable=protected-access
+        return self._archivist._confirmer.submit(
+            self, event["identity"], self._archivist.max_time
+        )
+
+    def pipeline(
+        self, *, workers: int = INGEST_WORKERS, maxsize: int = INGEST_MAXSIZE
+    ) -> EventPipeline:
+        """Create an event ingestion pipeline
+
+        Events put on the pipeline are posted concurrently by worker threads.
+        Events of the same asset are created in the order they are put. See
+        :class:`EventPipeline`.
+
+        Args:
+            workers (int): number of worker threads posting events
+            maxsize (int): maximum number of events queued or in flight -
+                put() blocks when the pipeline is full.
+
+        Returns:
+            :class:`EventPipeline` instance - close() when finished
+
+        """
+        return EventPipeline(self, workers=workers, maxsize=maxsize)
+
     def wait_for_confirmation(self, identity: str) -> Event:
         """Wait for event to be confirmed.
 
@@ -398,10 +502,35 @@ class _EventsRestricted(_EventsPublic):
             True if event is confirmed.
 
         """
-        confirmer.MAX_TIME = self._archivist.max_time
         # pylint: disable=protected-access
         return confirmer._wait_for_confirmation(self, identity)
 
+    def wait_for_confirmation_many(
+        self,
+        identities: Iterable[str],
+        *,
+        workers: int = CONFIRMATION_WORKERS,
+    ) -> Iterator[confirmer.Confirmation]:
+        """Wait for many events to be confirmed.
+
+        Pending events are read concurrently and share one backoff between
+        polls. A Confirmation is yielded as soon as each event is confirmed,
+        FAILED or times out - so the order is not the order of identities.
+
+        Args:
+            identities (iterable): identities of events
+            workers (int): maximum number of concurrent reads
+
+        Returns:
+            iterable of :class:`Confirmation`. Failure is reported in the
+            error attribute - no exception is raised.
+
+        """
+        # pylint: disable=protected-access
+        return confirmer._wait_for_confirmation_many(
+            self, identities, max_time=self._archivist.max_time, workers=workers
+        )
+
     def wait_for_confirmed(
         self,
         *,
@@ -436,7 +565,6 @@ class _EventsRestricted(_EventsPublic):
         if count == 0:
             raise ArchivistNotFoundError("No events exist")
 
-        confirmer.MAX_TIME = self._archivist.max_time
         # pylint: disable=protected-access
         return confirmer._wait_for_confirmed(
             self,
@@ -0,0 +1,88 @@
+"""Instrumentation hooks
+
+   Hooks are called for every request made by an Archivist or ArchivistPublic
+   instance. Subclass Hooks and override the methods of interest:
+
+   .. code-block:: python
+
+      class SlowRequests(Hooks):
+          def on_response(self, method, url, response, elapsed):
+              if elapsed > 1.0:
+                  LOGGER.warning("%s %s took %.3fs", method, url, elapsed)
+
+      arch = Archivist("https://app.rkvst.io", authtoken, hooks=[SlowRequests()])
+
+   Hooks are called on the thread that makes the request and must be thread-safe.
+   An exception raised by a hook is logged and otherwise ignored.
+
+"""
+
+from __future__ import annotations
+from logging import getLogger
+from typing import Sequence
+
+from requests.models import Response
+
+LOGGER = getLogger(__name__)
+
+
+class Hooks:
+    """Base class for instrumentation hooks. Every method does nothing."""
+
+    def on_request(self, method: str, url: str):
+        """Called before a request is sent
+
+        Args:
+            method (str): e.g. "get"
+            url (str): url of request
+        """
+
+    def on_response(self, method: str, url: str, response: Response, elapsed: float):
+        """Called when a response is received - whatever the status code
+
+        Args:
+            method (str): e.g. "get"
+            url (str): url of request
+            response (Response): response from upstream
+            elapsed (float): seconds between sending the request and receiving the
+                response headers.
+        """
+
+    def on_retry(self, method: str, url: str, attempt: int, reason: str, wait: float):
+        """Called before a request is retried
+
+        Args:
+            method (str): e.g. "get"
+            url (str): url of the request being retried
+            attempt (int): number of the retry starting at 1
+            reason (str): reason for the retry e.g. "429"
+            wait (float): seconds until the retry
+        """
+
+    def on_wait(self, label: str, identity: str, elapsed: float, ok: bool):
+        """Called when a wait for an entity finishes e.g. wait_for_confirmation
+
+        Args:
+            label (str): what was waited for e.g. "confirmation"
+            identity (str): identity of the entity
+            elapsed (float): seconds waited
+            ok (bool): False if the wait timed out or failed
+        """
+
+    def on_error(self, method: str, url: str, ex: Exception, elapsed: float):
+        """Called when no response is received e.g. connection error
+
+        Args:
+            method (str): e.g. "get"
+            url (str): url of request
+            ex (Exception): the exception raised
+            elapsed (float): seconds between sending the request and the error
+        """
+
+
+def _call_hooks(hooks: Sequence[Hooks], name: str, *args):
+    for hook in hooks:
+        try:
+            getattr(hook, name)(*args)
+        except Exception:  # pylint: disable=broad-except
+            LOGGER.exception("Hook %s.%s failed", type(hook).__name__, name)
@@ -0,0 +1,247 @@
+"""Event ingestion pipeline
+
+   Posts events concurrently from a bounded queue:
+
+   .. code-block:: python
+
+      with arch.events.pipeline(workers=16, maxsize=4096) as pipeline:
+          for asset_id, data in readings():
+              pipeline.put(asset_id, data)
+
+          pipeline.flush()
+          print(pipeline.metrics())
+
+   Events are posted by a pool of worker threads. All events of one asset are
+   posted by the same worker so that they are created in the order they were
+   put whilst events of different assets are posted in parallel.
+
+   put() blocks when maxsize events are queued or in flight (backpressure).
+   Each put() returns a future of the created event - a failed event does not
+   stop the pipeline. Events are not waited for confirmation - use
+   wait_for_confirmation_many() with the identities of the created events.
+
+"""
+
+# pylint:disable=too-few-public-methods
+
+from __future__ import annotations
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from logging import getLogger
+from queue import Full, SimpleQueue
+from threading import BoundedSemaphore, Condition, Thread
+from time import monotonic
+from typing import Any, Optional
+from zlib import crc32
+
+from .constants import INGEST_MAXSIZE, INGEST_WORKERS
+from .errors import ArchivistInvalidOperationError
+from .poller import _nearest_rank
+
+LOGGER = getLogger(__name__)
+
+# number of post latencies remembered
+WINDOW = 1024
+
+# percentiles of post latency reported by metrics()
+PERCENTILES = (50, 90, 99)
+
+_STOP = object()
+
+
+@dataclass(frozen=True)
+class PipelineMetrics:
+    """
+    Snapshot of an event pipeline
+
+    Args:
+        queued (int): events waiting for a worker
+        inflight (int): events being posted
+        posted (int): events created
+        failed (int): events that could not be created
+        latency (dict): percentiles of seconds to post an event e.g.
+            {"p50": 0.08, "p90": 0.12, "p99": 0.31} over the latest events
+    """
+
+    queued: int
+    inflight: int
+    posted: int
+    failed: int
+    latency: dict[str, float] = field(default_factory=dict)
+
+
+class EventPipeline:  # pylint: disable=too-many-instance-attributes
+    """
+    Bounded queue of events posted concurrently with per-asset ordering
+
+    Usually created by the pipeline() method of the events client.
+
+    Args:
+        events: events client e.g. arch.events
+        workers (int): number of worker threads posting events
+        maxsize (int): maximum number of events queued or in flight
+    """
+
+    def __init__(
+        self,
+        events: Any,
+        *,
+        workers: int = INGEST_WORKERS,
+        maxsize: int = INGEST_MAXSIZE,
+    ):
+        self._events = events
+        self._slots = BoundedSemaphore(maxsize)
+        self._condition = Condition()
+        self._queues: list[SimpleQueue] = [SimpleQueue() for _ in range(workers)]
+        self._latencies: deque[float] = deque(maxlen=WINDOW)
+        self._queued = 0
+        self._inflight = 0
+        self._posted = 0
+        self._failed = 0
+        self._closed = False
+        self._threads = [
+            Thread(
+                target=self._work,
+                args=(queue,),
+                name=f"archivist-ingest-{i}",
+                daemon=True,
+            )
+            for i, queue in enumerate(self._queues)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def __str__(self) -> str:
+        return f"EventPipeline({len(self._threads)})"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def put(
+        self, asset_id: str, data: dict[str, Any], *, timeout: Optional[float] = None
+    ) -> Future:
+        """Queue an event for posting
+
+        Blocks whilst the pipeline is full.
+
+        Args:
+            asset_id (str): asset identity e.g. assets/xxxxxxxxxxxxxxxxxxxxxxxxxx
+            data (dict): request body of event as for create_from_data()
+            timeout (float): maximum seconds to wait for space - None is forever
+
+        Returns:
+            Future of the created :class:`Event` instance
+
+        Raises:
+            queue.Full: if timeout passes whilst the pipeline is full
+            ArchivistInvalidOperationError: if the pipeline is closed
+        """
+        if self._closed:
+            raise ArchivistInvalidOperationError("Event pipeline is closed")
+
+        # the slot is released by the worker after posting the event
+        if not self._slots.acquire(  # pylint: disable=consider-using-with
+            timeout=timeout
+        ):
+            raise Full(f"Event pipeline is full after {timeout} seconds")
+
+        future: Future = Future()
+        with self._condition:
+            if self._closed:
+                self._slots.release()
+                raise ArchivistInvalidOperationError("Event pipeline is closed")
+
+            self._queued += 1
+            # all events of an asset go to the same worker - queued whilst
+            # locked so that close() stops the worker after this event
+            shard = crc32(asset_id.encode("utf-8")) % len(self._queues)
+            self._queues[shard].put((asset_id, data, future))
+
+        return future
+
+    def _post(self, asset_id: str, data: dict[str, Any], future: Future):
+        with self._condition:
+            self._queued -= 1
+            self._inflight += 1
+
+        start = monotonic()
+        try:
+            event = self._events.create_from_data(asset_id, data, confirm=False)
+        except Exception as ex:  # pylint: disable=broad-except
+            LOGGER.debug("Post event for %s failed: %s", asset_id, ex)
+            event = None
+            future.set_exception(ex)
+        else:
+            future.set_result(event)
+        finally:
+            with self._condition:
+                self._latencies.append(monotonic() - start)
+                self._inflight -= 1
+                if event is None:
+                    self._failed += 1
+                else:
+                    self._posted += 1
+
+                self._condition.notify_all()
+
+            self._slots.release()
+
+    def _work(self, queue: SimpleQueue):
+        while True:
+            item = queue.get()
+            if item is _STOP:
+                return
+
+            self._post(*item)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued event has been posted or has failed
+
+        Args:
+            timeout (float): maximum seconds to wait - None is forever
+
+        Returns:
+            True if the pipeline is empty
+        """
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: self._queued == 0 and self._inflight == 0, timeout
+            )
+
+    def close(self):
+        """Post all queued events and stop the workers
+
+        put() raises ArchivistInvalidOperationError after close().
+        """
+        with self._condition:
+            if self._closed:
+                return
+
+            self._closed = True
+
+        for queue in self._queues:
+            queue.put(_STOP)
+
+        for thread in self._threads:
+            thread.join()
+
+    def metrics(self) -> PipelineMetrics:
+        """Snapshot of the pipeline counters and post latency"""
+        with self._condition:
+            latencies = list(self._latencies)
+            queued = self._queued
+            inflight = self._inflight
+            posted = self._posted
+            failed = self._failed
+
+        return PipelineMetrics(
+            queued=queued,
+            inflight=inflight,
+            posted=posted,
+            failed=failed,
+            latency=_nearest_rank(latencies, PERCENTILES),
+        )
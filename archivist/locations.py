@@ -31,6 +31,7 @@ from typing import Any, Optional, Tuple
 from . import archivist
 
 from .constants import LOCATIONS_SUBPATH, LOCATIONS_LABEL
+from .cursor import ListCursor
 from .dictmerge import _deepmerge
 from .errors import ArchivistNotFoundError
 from .utils import selector_signature
@@ -204,6 +205,8 @@ class _LocationsClient:
         self,
         *,
         page_size: Optional[int] = None,
+        prefetch: int = 0,
+        cursor: Optional[ListCursor] = None,
         props: Optional[dict[str, Any]] = None,
         attrs: Optional[dict[str, Any]] = None,
     ):
@@ -215,6 +218,8 @@ class _LocationsClient:
             props (dict): optional e.g. {"display_name": "Macclesfield" }
             attrs (dict): optional e.g. {"director": "john smith" }
             page_size (int): optional page size. (Rarely used)
+            prefetch (int): optional number of pages fetched in the background.
+            cursor (ListCursor): optional cursor to record or resume the listing.
 
         Returns:
             iterable that returns :class:`Location` instances
@@ -227,6 +232,8 @@ class _LocationsClient:
                 self._label,
                 LOCATIONS_LABEL,
                 page_size=page_size,
+                prefetch=prefetch,
+                cursor=cursor,
                 params=self.__params(props, attrs),
             )
         )
@@ -0,0 +1,264 @@
+"""In-process metrics collector
+
+   A Hooks implementation that records latency histograms, bytes in and out,
+   status codes, errors and retries for each endpoint template. Identities in
+   the url are replaced by {id} so that e.g. all asset event listings are
+   recorded as archivist/v2/assets/{id}/events:
+
+   .. code-block:: python
+
+      metrics = MetricsCollector()
+      arch = Archivist("https://app.rkvst.io", authtoken, hooks=[metrics])
+      ...
+      print(metrics.prometheus())
+
+"""
+
+# pylint:disable=too-few-public-methods
+
+from __future__ import annotations
+from bisect import bisect_left
+from collections import Counter
+from dataclasses import dataclass, field
+from logging import getLogger
+from re import compile as re_compile
+from threading import Lock
+from typing import Any, Optional
+from urllib.parse import urlsplit
+
+from requests.models import Response
+
+from .constants import HEADERS_CONTENT_LENGTH
+from .headers import _headers_get
+from .hooks import Hooks
+
+LOGGER = getLogger(__name__)
+
+# upper bounds in seconds of the latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# path segments that identify an entity - uuids, the '-' wildcard and
+# long hex or numeric strings
+ID_RE = re_compile(
+    r"^(-|[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}"
+    r"|[0-9a-fA-F]{16,}|[0-9]+)$"
+)
+
+
+def endpoint_template(url: str) -> str:
+    """Path of url with identities replaced by {id}
+
+    Args:
+        url (str): e.g. https://app.rkvst.io/archivist/v2/assets/xxxx/events
+
+    Returns:
+        template e.g. archivist/v2/assets/{id}/events
+    """
+    path = urlsplit(url).path.strip("/")
+    return "/".join("{id}" if ID_RE.match(s) else s for s in path.split("/"))
+
+
+def _response_size(response: Response) -> Optional[int]:
+    """size of the response body - None if it is streamed and not yet read"""
+    length = _headers_get(response.headers, HEADERS_CONTENT_LENGTH)
+    if length is not None:
+        return int(length)
+
+    # e.g. chunked - the body of a response that is not streamed has been read
+    content = getattr(response, "_content", None)
+    if isinstance(content, bytes):
+        return len(content)
+
+    return None
+
+
+def _body_size(response: Response) -> int:
+    request = getattr(response, "request", None)
+    body = getattr(request, "body", None)
+    if body is None:
+        return 0
+
+    # a MultipartEncoder has a len attribute
+    size = getattr(body, "len", None)
+    if size is not None:
+        return size
+
+    try:
+        return len(body)
+    except TypeError:
+        return 0
+
+
+@dataclass
+class _Endpoint:  # pylint: disable=too-many-instance-attributes
+    """Metrics for one method and endpoint template"""
+
+    # the last bucket counts latencies above the largest bound
+    buckets: list[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1))
+    latency_sum: float = 0.0
+    count: int = 0
+    bytes_in: int = 0
+    bytes_out: int = 0
+    status: Counter = field(default_factory=Counter)
+    errors: Counter = field(default_factory=Counter)
+    retries: Counter = field(default_factory=Counter)
+
+    def observe(self, elapsed: float):
+        """record the latency of a request"""
+        self.buckets[bisect_left(LATENCY_BUCKETS, elapsed)] += 1
+        self.latency_sum += elapsed
+        self.count += 1
+
+    def to_dict(self) -> dict[str, Any]:
+        """emit metrics as a dict"""
+        return {
+            "count": self.count,
+            "latency": {
+                "buckets": dict(zip((*LATENCY_BUCKETS, float("inf")), self.buckets)),
+                "sum": self.latency_sum,
+            },
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "status": dict(self.status),
+            "errors": dict(self.errors),
+            "retries": dict(self.retries),
+        }
+
+
+class MetricsCollector(Hooks):
+    """
+    Records metrics of every request. Thread-safe.
+
+    Args:
+        prefix (str): prefix of the prometheus metric names
+    """
+
+    def __init__(self, *, prefix: str = "archivist"):
+        self._prefix = prefix
+        self._lock = Lock()
+        self._endpoints: dict[tuple[str, str], _Endpoint] = {}
+
+    def __str__(self) -> str:
+        return f"MetricsCollector({self._prefix})"
+
+    def _endpoint(self, method: str, url: str) -> _Endpoint:
+        key = (method.upper(), endpoint_template(url))
+        endpoint = self._endpoints.get(key)
+        if endpoint is None:
+            endpoint = self._endpoints[key] = _Endpoint()
+
+        return endpoint
+
+    def _count_read(self, endpoint: _Endpoint, raw: Any):
+        """count the bytes of a streamed body of unknown length as it is read"""
+        read = raw.read
+
+        def counted(*args, **kwargs):
+            data = read(*args, **kwargs)
+            with self._lock:
+                endpoint.bytes_in += len(data)
+
+            return data
+
+        raw.read = counted
+
+    def on_response(self, method: str, url: str, response: Response, elapsed: float):
+        size = _response_size(response)
+        with self._lock:
+            endpoint = self._endpoint(method, url)
+            endpoint.observe(elapsed)
+            endpoint.status[str(response.status_code)] += 1
+            endpoint.bytes_in += size or 0
+            endpoint.bytes_out += _body_size(response)
+
+        raw = getattr(response, "raw", None)
+        if size is None and raw is not None:
+            self._count_read(endpoint, raw)
+
+    def on_retry(self, method: str, url: str, attempt: int, reason: str, wait: float):
+        with self._lock:
+            self._endpoint(method, url).retries[reason] += 1
+
+    def on_error(self, method: str, url: str, ex: Exception, elapsed: float):
+        with self._lock:
+            endpoint = self._endpoint(method, url)
+            endpoint.observe(elapsed)
+            endpoint.errors[type(ex).__name__] += 1
+
+    def reset(self):
+        """Discard all metrics"""
+        with self._lock:
+            self._endpoints.clear()
+
+    def snapshot(self) -> dict[str, Any]:
+        """Metrics as a dict
+
+        Returns:
+            dict with "endpoints" keyed by method and endpoint template e.g.
+            "GET archivist/v2/assets/{id}" and the total "retries" keyed by
+            reason.
+        """
+        retries: Counter = Counter()
+        with self._lock:
+            for endpoint in self._endpoints.values():
+                retries.update(endpoint.retries)
+
+            return {
+                "endpoints": {
+                    f"{method} {template}": endpoint.to_dict()
+                    for (method, template), endpoint in sorted(self._endpoints.items())
+                },
+                "retries": dict(retries),
+            }
+
+    def prometheus(self, *, prefix: Optional[str] = None) -> str:
+        """Metrics in the Prometheus text exposition format"""
+        prefix = prefix or self._prefix
+        duration = f"{prefix}_request_duration_seconds"
+        lines = [
+            f"# HELP {duration} Time until response headers are received.",
+            f"# TYPE {duration} histogram",
+        ]
+        responses, errors, retries, bytes_in, bytes_out = [], [], [], [], []
+        with self._lock:
+            for (method, template), endpoint in sorted(self._endpoints.items()):
+                labels = f'method="{method}",endpoint="{template}"'
+                cumulative = 0
+                for bound, count in zip((*LATENCY_BUCKETS, "+Inf"), endpoint.buckets):
+                    cumulative += count
+                    lines.append(
+                        f'{duration}_bucket{{{labels},le="{bound}"}} {cumulative}'
+                    )
+                lines.append(f"{duration}_sum{{{labels}}} {endpoint.latency_sum}")
+                lines.append(f"{duration}_count{{{labels}}} {endpoint.count}")
+                responses.extend(
+                    f'{prefix}_responses_total{{{labels},status="{status}"}} {n}'
+                    for status, n in sorted(endpoint.status.items())
+                )
+                errors.extend(
+                    f'{prefix}_errors_total{{{labels},error="{error}"}} {n}'
+                    for error, n in sorted(endpoint.errors.items())
+                )
+                retries.extend(
+                    f'{prefix}_retries_total{{{labels},reason="{reason}"}} {n}'
+                    for reason, n in sorted(endpoint.retries.items())
+                )
+                bytes_in.append(
+                    f"{prefix}_response_bytes_total{{{labels}}} {endpoint.bytes_in}"
+                )
+                bytes_out.append(
+                    f"{prefix}_request_bytes_total{{{labels}}} {endpoint.bytes_out}"
+                )
+
+        for name, kind, text, samples in (
+            ("responses_total", "counter", "Responses by status code.", responses),
+            ("errors_total", "counter", "Requests without a response.", errors),
+            ("response_bytes_total", "counter", "Bytes received.", bytes_in),
+            ("request_bytes_total", "counter", "Bytes sent.", bytes_out),
+            ("retries_total", "counter", "Retries by reason.", retries),
+        ):
+            lines.append(f"# HELP {prefix}_{name} {text}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            lines.extend(samples)
+
+        return "\n".join(lines) + "\n"
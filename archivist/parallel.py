@@ -0,0 +1,258 @@
+"""Background iteration helpers
+
+   Private helpers used by the Archivist clients to overlap network requests
+   with processing by the caller.
+
+"""
+
+from __future__ import annotations
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from logging import getLogger
+from queue import Empty, Full, Queue
+from threading import Event, Lock
+from typing import Callable, Generator, Hashable, Iterable, Optional, Sequence, TypeVar
+
+LOGGER = getLogger(__name__)
+
+# how often a blocked producer checks whether the consumer has gone away
+POLL_INTERVAL = 0.1
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+_DONE = object()
+
+
+class _Error:  # pylint: disable=too-few-public-methods
+    """wraps an exception raised by the producer"""
+
+    def __init__(self, ex: BaseException):
+        self.ex = ex
+
+
+def _put(queue: Queue, item, stop: Event) -> bool:
+    """put item on queue unless the consumer has stopped"""
+    while not stop.is_set():
+        try:
+            queue.put(item, timeout=POLL_INTERVAL)
+        except Full:
+            continue
+
+        return True
+
+    return False
+
+
+def _produce(iterable: Iterable, queue: Queue, stop: Event):
+    # a queued producer may only start after the consumer has gone away
+    if stop.is_set():
+        return
+
+    try:
+        for item in iterable:
+            if not _put(queue, item, stop):
+                LOGGER.debug("prefetch: consumer stopped")
+                return
+
+    except Exception as ex:  # pylint: disable=broad-except
+        _put(queue, _Error(ex), stop)
+        return
+
+    _put(queue, _DONE, stop)
+
+
+def _merge(
+    iterables: Iterable[Iterable[T]],
+    depth: int,
+    *,
+    workers: Optional[int] = None,
+) -> Generator[T, None, None]:
+    """Iterate over several iterables concurrently on a pool of threads.
+
+    Items are returned in the order they arrive. Up to depth items are fetched
+    ahead of the caller into a bounded queue shared by all iterables.
+    The first exception raised by any iterable is re-raised in the caller.
+    If the caller stops iterating early all threads stop after their current
+    item.
+
+    Args:
+        iterables: usually generators that make a request for each item.
+        depth (int): maximum number of items fetched ahead of the caller.
+        workers (int): maximum number of iterables consumed at the same time.
+            Defaults to one thread per iterable.
+
+    """
+    iterables = list(iterables)
+    if not iterables:
+        return
+
+    queue: Queue = Queue(maxsize=depth)
+    stop = Event()
+    executor = ThreadPoolExecutor(
+        max_workers=workers or len(iterables),
+        thread_name_prefix="archivist-prefetch",
+    )
+    for iterable in iterables:
+        executor.submit(_produce, iterable, queue, stop)
+
+    remaining = len(iterables)
+    try:
+        while remaining:
+            item = queue.get()
+            if item is _DONE:
+                remaining -= 1
+                continue
+
+            if isinstance(item, _Error):
+                raise item.ex
+
+            yield item
+
+    finally:
+        stop.set()
+        # unblock any producer waiting on a full queue
+        try:
+            while True:
+                queue.get_nowait()
+        except Empty:
+            pass
+
+        executor.shutdown(wait=False)
+
+
+def _prefetch(iterable: Iterable[T], depth: int) -> Generator[T, None, None]:
+    """Iterate over iterable on a background thread.
+
+    Up to depth items are fetched ahead of the caller into a bounded queue.
+    Exceptions raised by the iterable are re-raised in the caller. If the
+    caller stops iterating early the background thread stops after its current
+    item.
+
+    Args:
+        iterable: usually a generator that makes a request for each item.
+        depth (int): maximum number of items fetched ahead of the caller.
+
+    """
+    return _merge((iterable,), depth)
+
+
+def _bounded_map(
+    fn: Callable[[T], R],
+    iterable: Iterable[T],
+    concurrency: int,
+    *,
+    ordered: bool = True,
+) -> Generator[tuple[T, Future], None, None]:
+    """Call fn on each item on a pool of threads.
+
+    Items are read from iterable only as calls complete so that at most
+    concurrency calls are in flight and the iterable may be unbounded. A
+    slow call does not reduce the number in flight - when ordered the
+    calls that finish after it are held until it has been yielded.
+    Each item is yielded with the completed future of its call - an
+    exception raised by fn is held in the future and does not stop the
+    remaining calls. If the caller stops iterating early the calls not yet
+    started are cancelled.
+
+    Args:
+        fn: usually makes one or more requests for the item.
+        iterable: items e.g. request bodies.
+        concurrency (int): maximum number of calls in flight.
+        ordered (bool): if True yield in the order of iterable otherwise in
+            the order the calls complete.
+
+    """
+    items = iter(iterable)
+    # submitted calls in the order of iterable - finished calls are held
+    # here until it is their turn to be yielded
+    submitted: deque[tuple[T, Future]] = deque()
+    running: set[Future] = set()
+    executor = ThreadPoolExecutor(
+        max_workers=concurrency, thread_name_prefix="archivist-bulk"
+    )
+
+    def fill():
+        while len(running) < concurrency:
+            try:
+                item = next(items)
+            except StopIteration:
+                return
+
+            future = executor.submit(fn, item)
+            running.add(future)
+            submitted.append((item, future))
+
+    def ready() -> Optional[tuple[T, Future]]:
+        if ordered:
+            return submitted[0] if submitted[0][1].done() else None
+
+        return next((s for s in submitted if s[1].done()), None)
+
+    try:
+        fill()
+        while submitted:
+            first = ready()
+            if first is None:
+                # refill as soon as any call completes
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                running.difference_update(done)
+                fill()
+                continue
+
+            submitted.remove(first)
+            running.discard(first[1])
+            fill()
+            yield first
+
+    finally:
+        for _, future in submitted:
+            future.cancel()
+
+        executor.shutdown(wait=False)
+
+
+class _Once:  # pylint: disable=too-few-public-methods
+    """Calls a function once per key - concurrent calls of a key wait
+
+    Successful results are remembered. Calls of different keys do not wait
+    for each other.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._locks: dict[Hashable, Lock] = {}
+        self._results: dict[Hashable, object] = {}
+
+    def call(self, key: Hashable, fn: Callable[[], R]) -> tuple[R, bool]:
+        """result of fn - True if it is the result of an earlier call"""
+        with self._lock:
+            lock = self._locks.setdefault(key, Lock())
+
+        with lock:
+            if key in self._results:
+                return self._results[key], True  # type: ignore[return-value]
+
+            result = fn()
+            self._results[key] = result
+            return result, False
+
+
+def _call_all(fns: Sequence[Callable[[], R]], concurrency: int) -> list[R]:
+    """Call every function with at most concurrency calls in flight.
+
+    Returns the results in the order of fns. The first exception (in the
+    order of fns) is re-raised once the earlier calls have completed and
+    calls not yet started are cancelled.
+
+    Args:
+        fns: functions without arguments e.g. uploads of attachments.
+        concurrency (int): maximum number of calls in flight.
+
+    """
+    if len(fns) <= 1 or concurrency <= 1:
+        return [fn() for fn in fns]
+
+    return [
+        future.result() for _, future in _bounded_map(lambda fn: fn(), fns, concurrency)
+    ]
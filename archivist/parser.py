@@ -15,6 +15,7 @@ from .archivist import Archivist
 from .dictmerge import _deepmerge
 from .logger import set_logger
 from .proof_mechanism import ProofMechanism
+from .tokencache import FileTokenCache
 from .utils import get_auth
 
 
@@ -131,6 +132,13 @@ def common_parser(description: str):
         default=None,
         help="FILE containing client secret from appregistrations",
     )
+    parser.add_argument(
+        "--token-cache",
+        dest="token_cache",
+        action="store_true",
+        default=False,
+        help="reuse the appregistrations token of other processes on this host",
+    )
     parser.add_argument(
         "-n",
         "--namespace",
@@ -190,7 +198,13 @@ def endpoint(args):
         LOGGER.error("Critical error.  Aborting.")
         sys_exit(1)
 
-    arch = Archivist(args.url, auth, verify=False, fixtures=fixtures)
+    arch = Archivist(
+        args.url,
+        auth,
+        verify=False,
+        fixtures=fixtures,
+        token_cache=FileTokenCache() if args.token_cache else None,
+    )
     if arch is None:
         LOGGER.error("Critical error.  Aborting.")
         sys_exit(1)
@@ -0,0 +1,193 @@
+"""List partitions
+
+   A partition splits a list() query into disjoint sub-queries that are
+   paginated concurrently. Each sub-query is the original selector plus one
+   filter of the partition:
+
+   .. code-block:: python
+
+      # list all events accepted in 2022 using 8 concurrent page chains
+      for event in arch.events.list(
+          asset_id="assets/-",
+          page_size=500,
+          partition=TimePartition(
+              since="2022-01-01T00:00:00Z",
+              before="2023-01-01T00:00:00Z",
+              count=8,
+          ),
+      ):
+          ...
+
+   By default records are returned in the order they arrive. If ordered is True
+   the sub-queries are merged by the value of the order field (the partition key
+   for time partitions) on the assumption that each sub-query returns records
+   in that order.
+
+"""
+
+# pylint:disable=too-few-public-methods
+
+from __future__ import annotations
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from heapq import merge
+from logging import getLogger
+from operator import itemgetter
+from typing import TYPE_CHECKING, Any, Generator, Optional, Tuple
+
+from .cursor import ListCursor
+from .dictmerge import _deepmerge
+from .errors import ArchivistBadFieldError
+from .parallel import _merge, _prefetch
+
+if TYPE_CHECKING:
+    from .archivistpublic import ArchivistPublic
+
+LOGGER = getLogger(__name__)
+
+TIME_PARTITION_KEY = "timestamp_accepted"
+TIME_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+# number of pages fetched ahead for each sub-query
+PARTITION_DEPTH = 2
+
+
+def _to_datetime(value: datetime | str) -> datetime:
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+
+    return value.astimezone(timezone.utc)
+
+
+@dataclass(frozen=True)
+class TimePartition:
+    """
+    Split a listing into count disjoint time windows.
+
+    Each window selects records using the {key}_since and {key}_before
+    filters. The windows are a whole number of seconds long.
+
+    Args:
+        since (datetime|str): start of the first window e.g. "2022-01-01T00:00:00Z"
+        before (datetime|str): end of the last window
+        count (int): number of windows
+        key (str): name of the timestamp e.g. "timestamp_accepted"
+        ordered (bool): if True records are merged in order of key
+        reverse (bool): if True and ordered each window lists the latest records
+            first.
+        workers (int): maximum number of windows listed at the same time when
+            not ordered. Defaults to count.
+    """
+
+    since: datetime | str
+    before: datetime | str
+    count: int = 4
+    key: str = TIME_PARTITION_KEY
+    ordered: bool = False
+    reverse: bool = False
+    workers: Optional[int] = None
+
+    @property
+    def order_by(self) -> str:
+        """str: field used to merge ordered windows"""
+        return self.key
+
+    def filters(self) -> list[dict[str, Any]]:
+        """list of filters - one per window"""
+        since = _to_datetime(self.since)
+        before = _to_datetime(self.before)
+        seconds = int((before - since).total_seconds())
+        count = max(1, min(self.count, seconds))
+        step = seconds // count
+        bounds = [since + timedelta(seconds=i * step) for i in range(count)]
+        bounds.append(before)
+        return [
+            {
+                f"{self.key}_since": start.strftime(TIME_FORMAT),
+                f"{self.key}_before": end.strftime(TIME_FORMAT),
+            }
+            for start, end in zip(bounds, bounds[1:])
+        ]
+
+
+@dataclass(frozen=True)
+class ValuePartition:
+    """
+    Split a listing by the values of a selector.
+
+    Args:
+        key (str): selector e.g. "attributes.arc_display_type"
+        values (tuple): one sub-query is made for each value. The values should
+            cover all records of interest.
+        ordered (bool): if True records are merged in order of order_by
+        order_by (str): field used to merge ordered records
+        reverse (bool): if True and ordered each sub-query lists the largest
+            values of order_by first.
+        workers (int): maximum number of sub-queries listed at the same time
+            when not ordered. Defaults to one per value.
+    """
+
+    key: str
+    values: Tuple[Any, ...]
+    ordered: bool = False
+    order_by: Optional[str] = None
+    reverse: bool = False
+    workers: Optional[int] = None
+
+    def filters(self) -> list[dict[str, Any]]:
+        """list of filters - one per value"""
+        return [{self.key: value} for value in self.values]
+
+
+def _list_partitioned(
+    archivist: ArchivistPublic,
+    partition: TimePartition | ValuePartition,
+    url: str,
+    field: str,
+    *,
+    page_size: Optional[int] = None,
+    params: Optional[dict[str, Any]] = None,
+    headers: Optional[dict[str, str]] = None,
+    prefetch: int = 0,
+) -> Generator[dict[str, Any], None, None]:
+    """List all sub-queries of a partition concurrently"""
+    depth = max(prefetch, PARTITION_DEPTH)
+    chains = []
+    for flt in partition.filters():
+        cursor = ListCursor()
+        cursor.start(url, field, params=_deepmerge(params, flt), page_size=page_size)
+        # pylint: disable=protected-access
+        chains.append(archivist._pages(cursor, headers=headers))
+
+    LOGGER.debug("List %s in %d partitions", url, len(chains))
+    if not partition.ordered:
+        for records, _ in _merge(
+            chains, depth * len(chains), workers=partition.workers
+        ):
+            yield from records
+
+        return
+
+    if partition.order_by is None:
+        raise ArchivistBadFieldError("ordered partition requires order_by")
+
+    # every chain must make progress for the merge so each has its own thread
+    streams = [_records(_prefetch(chain, depth)) for chain in chains]
+    try:
+        yield from merge(
+            *streams, key=itemgetter(partition.order_by), reverse=partition.reverse
+        )
+    finally:
+        for stream in streams:
+            stream.close()
+
+
+def _records(pages):
+    try:
+        for records, _ in pages:
+            yield from records
+    finally:
+        pages.close()
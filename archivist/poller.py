@@ -0,0 +1,359 @@
+"""Poller
+
+   Waits for an entity to reach a state e.g. confirmed, uploaded or published
+   by polling with jittered exponential backoff until a deadline.
+
+   Every Archivist instance has a poller configured with its max_time. Each
+   wait has its own deadline so that instances with different max_time
+   values can wait concurrently. The duration of each wait is logged and
+   reported to the on_wait hook.
+
+   Confirmation waits are scheduled by an :class:`AdaptiveSchedule` that
+   learns the distribution of confirmation latency of each proof mechanism.
+   Once enough confirmations have been observed the entity is polled at the
+   learned percentiles of latency instead of the exponential backoff:
+
+   .. code-block:: python
+
+      arch.assets.create(props=props, attrs=attrs)
+      ...
+      print(arch.poller.schedule.percentiles(ProofMechanism.SIMPLE_HASH.name))
+
+   The user is not expected to use this class directly.
+
+"""
+
+# pylint:disable=too-few-public-methods
+
+from __future__ import annotations
+from asyncio import sleep as async_sleep
+from collections import deque
+from dataclasses import dataclass, field
+from logging import getLogger
+from math import ceil
+from random import uniform
+from threading import Lock
+from time import monotonic, sleep
+from typing import Any, Awaitable, Callable, Iterator, Optional, Sequence
+
+from .hooks import Hooks, _call_hooks
+
+LOGGER = getLogger(__name__)
+
+# first maximum wait in seconds - doubled after every poll
+POLL_BASE = 1.0
+
+# number of latencies remembered per key
+WINDOW = 256
+
+# number of latencies observed before polls are scheduled at percentiles
+MIN_SAMPLES = 8
+
+# percentiles of latency at which polls are scheduled
+PERCENTILES = (50, 75, 90, 99)
+
+
+def _nearest_rank(
+    latencies: Sequence[float], percentiles: Sequence[int]
+) -> dict[str, float]:
+    """percentiles of latencies by nearest rank e.g. {"p50": 3.2, "p90": 4.1}"""
+    if not latencies:
+        return {}
+
+    ranked = sorted(latencies)
+    return {
+        f"p{p}": ranked[max(ceil(p * len(ranked) / 100), 1) - 1] for p in percentiles
+    }
+
+
+@dataclass(frozen=True)
+class Deadline:
+    """
+    Time budget of one wait
+
+    Args:
+        max_time (float): seconds until the deadline
+    """
+
+    max_time: float
+    start: float = field(default_factory=monotonic)
+
+    @property
+    def elapsed(self) -> float:
+        """float: seconds since the start"""
+        return monotonic() - self.start
+
+    @property
+    def remaining(self) -> float:
+        """float: seconds until the deadline - never negative"""
+        return max(self.max_time - self.elapsed, 0.0)
+
+    @property
+    def expired(self) -> bool:
+        """bool: True if the deadline has passed"""
+        return self.elapsed >= self.max_time
+
+
+class AdaptiveSchedule:
+    """
+    Rolling distribution of wait latency keyed by e.g. proof mechanism
+
+    Args:
+        window (int): number of latencies remembered per key
+        min_samples (int): number of latencies observed before polls are
+            scheduled at percentiles
+        percentiles (tuple): percentiles of latency at which polls are
+            scheduled
+    """
+
+    def __init__(
+        self,
+        *,
+        window: int = WINDOW,
+        min_samples: int = MIN_SAMPLES,
+        percentiles: Sequence[int] = PERCENTILES,
+    ):
+        self._window = window
+        self._min_samples = min_samples
+        self._percentiles = tuple(sorted(percentiles))
+        self._lock = Lock()
+        self._latencies: dict[str, deque[float]] = {}
+
+    def __str__(self) -> str:
+        return f"AdaptiveSchedule({self._window})"
+
+    def observe(self, key: str, latency: float):
+        """Record the latency in seconds of a completed wait"""
+        with self._lock:
+            latencies = self._latencies.get(key)
+            if latencies is None:
+                latencies = self._latencies[key] = deque(maxlen=self._window)
+
+            latencies.append(latency)
+
+    def percentiles(self, key: str) -> dict[str, float]:
+        """Learned percentiles of latency e.g. {"p50": 3.2, "p90": 4.1}
+
+        Empty if fewer than min_samples latencies have been observed.
+        """
+        with self._lock:
+            latencies = list(self._latencies.get(key, ()))
+
+        if len(latencies) < self._min_samples:
+            return {}
+
+        return _nearest_rank(latencies, self._percentiles)
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        """Learned percentiles of latency keyed by key"""
+        with self._lock:
+            keys = sorted(self._latencies)
+
+        return {key: self.percentiles(key) for key in keys}
+
+    def targets(self, key: str) -> list[float]:
+        """Ascending elapsed seconds at which to poll - empty if not learned"""
+        return sorted(set(self.percentiles(key).values()))
+
+
+class _Wait:  # pylint: disable=protected-access
+    """State of one wait whose polls are made by the caller
+
+    Args:
+        poller (Poller): schedules the polls and reports the outcome
+        label (str): what is waited for e.g. "confirmation"
+        identity (str): identity of the entity
+        max_time (float): seconds until the deadline
+    """
+
+    def __init__(self, poller: Poller, label: str, identity: str, max_time: float):
+        self._poller = poller
+        self._label = label
+        self._identity = identity
+        self.deadline = Deadline(max_time, monotonic())
+        self._waits = poller._waits(self.deadline)
+        self._pending = 0.0
+
+    def next(self, key: Optional[str] = None) -> float:
+        """Record a pending poll - returns the seconds until the next poll"""
+        self._pending = self.deadline.elapsed
+        return self._poller._next_wait(self.deadline, self._waits, key)
+
+    def done(self, ok: bool, key: Optional[str] = None, identity: Optional[str] = None):
+        """Report the end of the wait e.g. of one of many identities polled together"""
+        self._poller._done(
+            self._label,
+            identity or self._identity,
+            self.deadline,
+            ok,
+            key if ok else None,
+            self._pending,
+        )
+
+
+class Poller:
+    """
+    Polls until a check returns a value or the deadline passes
+
+    Args:
+        max_time (float): maximum seconds of each wait
+        base (float): first maximum wait in seconds between polls
+        cap (float): optional largest wait in seconds between polls
+        hooks (list): :class:`Hooks` whose on_wait method is called after
+            each wait
+        schedule (AdaptiveSchedule): learned latencies of keyed waits
+    """
+
+    def __init__(
+        self,
+        max_time: float,
+        *,
+        base: float = POLL_BASE,
+        cap: Optional[float] = None,
+        hooks: Sequence[Hooks] = (),
+        schedule: Optional[AdaptiveSchedule] = None,
+    ):
+        self._max_time = max_time
+        self._base = base
+        self._cap = cap
+        self._hooks = hooks
+        self._schedule = schedule or AdaptiveSchedule()
+
+    def __str__(self) -> str:
+        return f"Poller({self._max_time})"
+
+    @property
+    def max_time(self) -> float:
+        """float: maximum seconds of each wait"""
+        return self._max_time
+
+    @property
+    def schedule(self) -> AdaptiveSchedule:
+        """AdaptiveSchedule: learned latencies of keyed waits"""
+        return self._schedule
+
+    def _waits(self, deadline: Deadline) -> Iterator[float]:
+        """full jitter exponential waits - truncated at the deadline"""
+        bound = self._base
+        while True:
+            if self._cap is not None:
+                bound = min(bound, self._cap)
+
+            yield min(uniform(0, bound), deadline.remaining)
+            bound *= 2
+
+    def _next_wait(
+        self, deadline: Deadline, waits: Iterator[float], key: Optional[str]
+    ) -> float:
+        """wait until the next learned percentile - else exponential backoff"""
+        if key is not None:
+            elapsed = deadline.elapsed
+            for target in self._schedule.targets(key):
+                if target > elapsed:
+                    return min(target - elapsed, deadline.remaining)
+
+        return next(waits)
+
+    def _done(  # pylint: disable=too-many-arguments
+        self,
+        label: str,
+        identity: str,
+        deadline: Deadline,
+        ok: bool,
+        key: Optional[str] = None,
+        pending: float = 0.0,
+    ):
+        elapsed = deadline.elapsed
+        LOGGER.debug("Wait for %s of %s took %.3f seconds", label, identity, elapsed)
+        if ok and key is not None:
+            # the entity completed between the last pending poll and now
+            self._schedule.observe(key, (pending + elapsed) / 2)
+
+        _call_hooks(self._hooks, "on_wait", label, identity, elapsed, ok)
+
+    def _start(
+        self, label: str, identity: str, max_time: Optional[float] = None
+    ) -> _Wait:
+        """start a wait whose polls are made by the caller"""
+        return _Wait(
+            self, label, identity, self._max_time if max_time is None else max_time
+        )
+
+    def poll(
+        self,
+        label: str,
+        identity: str,
+        check: Callable[[], Any],
+        giveup: Callable[[float], Exception],
+        *,
+        key: Optional[Callable[[], Optional[str]]] = None,
+    ) -> Any:
+        """Call check until it returns a value that is not None
+
+        Args:
+            label (str): what is waited for e.g. "confirmation"
+            identity (str): identity of the entity
+            check (Callable): returns None whilst waiting
+            giveup (Callable): returns the exception raised when the deadline
+                passes given the elapsed seconds
+            key (Callable): optionally returns the key of the latency
+                distribution e.g. the proof mechanism - called after check
+
+        Returns:
+            the value returned by check
+        """
+        state = self._start(label, identity)
+        while True:
+            try:
+                result = check()
+            except Exception:
+                state.done(False)
+                raise
+
+            learn = key() if key is not None else None
+            if result is not None:
+                state.done(True, learn)
+                return result
+
+            wait = state.next(learn)
+            if state.deadline.expired:
+                state.done(False)
+                raise giveup(state.deadline.elapsed)
+
+            LOGGER.debug("Wait %.1f seconds for %s of %s", wait, label, identity)
+            sleep(wait)
+
+    async def async_poll(
+        self,
+        label: str,
+        identity: str,
+        check: Callable[[], Awaitable[Any]],
+        giveup: Callable[[float], Exception],
+        *,
+        key: Optional[Callable[[], Optional[str]]] = None,
+    ) -> Any:
+        """Await check until it returns a value that is not None
+
+        As poll() but check is a coroutine function and the waits are on the
+        event loop.
+        """
+        state = self._start(label, identity)
+        while True:
+            try:
+                result = await check()
+            except Exception:
+                state.done(False)
+                raise
+
+            learn = key() if key is not None else None
+            if result is not None:
+                state.done(True, learn)
+                return result
+
+            wait = state.next(learn)
+            if state.deadline.expired:
+                state.done(False)
+                raise giveup(state.deadline.elapsed)
+
+            LOGGER.debug("Wait %.1f seconds for %s of %s", wait, label, identity)
+            await async_sleep(wait)
@@ -0,0 +1,69 @@
+"""Connection pool options
+
+   Defines how the HTTP session of an Archivist or ArchivistPublic instance
+   pools its connections.
+
+   The default options are the same as the requests package defaults. When
+   many threads share a single Archivist instance the pool size should be
+   at least the number of threads otherwise connections are discarded and
+   re-established (with a new TLS handshake) on the hot path:
+
+   .. code-block:: python
+
+      arch = Archivist(
+          "https://app.rkvst.io",
+          authtoken,
+          pool=PoolOptions(maxsize=32, block=True),
+      )
+
+"""
+
+# pylint:disable=too-few-public-methods
+
+from __future__ import annotations
+from dataclasses import dataclass
+from logging import getLogger
+
+import requests
+from requests.adapters import HTTPAdapter
+
+LOGGER = getLogger(__name__)
+
+POOL_CONNECTIONS = 10
+POOL_MAXSIZE = 10
+
+
+@dataclass(frozen=True)
+class PoolOptions:
+    """
+    Connection pool options
+
+    Args:
+        connections (int): number of per-host connection pools to cache
+        maxsize (int): maximum number of connections kept open per host
+        block (bool): if True a request waits for a free connection when
+            the pool is exhausted instead of opening (and then discarding)
+            an extra connection.
+        keep_alive (bool): if False every connection is closed after each request.
+    """
+
+    connections: int = POOL_CONNECTIONS
+    maxsize: int = POOL_MAXSIZE
+    block: bool = False
+    keep_alive: bool = True
+
+    def session(self) -> requests.Session:
+        """Create a session that uses these pool options"""
+        LOGGER.debug("Create session %s", self)
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.connections,
+            pool_maxsize=self.maxsize,
+            pool_block=self.block,
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        if not self.keep_alive:
+            session.headers["Connection"] = "close"
+
+        return session
@@ -6,40 +6,29 @@
 from __future__ import annotations
 from logging import getLogger
 
-import backoff
-
-from .utils import backoff_handler
 from .errors import ArchivistUnpublishedError
 from . import sboms
 
 
 # pylint:disable=cyclic-import      # but pylint doesn't understand this feature
-
-MAX_TIME = 1200
+# pylint:disable=protected-access
 
 LOGGER = getLogger(__name__)
 
 
-def __lookup_max_time():
-    return MAX_TIME
-
-
-def __on_giveup_publication(details):
-    identity = details["args"][1]
-    elapsed = details["elapsed"]
-    raise ArchivistUnpublishedError(
-        f"publication for {identity} timed out after {elapsed} seconds"
+def _wait_for_publication(self: sboms._SBOMSClient, identity: str) -> sboms.SBOM:
+    """Poll until published date is set"""
+    return self._archivist.poller.poll(
+        "publication",
+        identity,
+        lambda: __published(self, identity),
+        lambda elapsed: ArchivistUnpublishedError(
+            f"publication for {identity} timed out after {elapsed} seconds"
+        ),
     )
 
 
-@backoff.on_predicate(
-    backoff.expo,
-    logger=None,  # type: ignore
-    max_time=__lookup_max_time,
-    on_backoff=backoff_handler,
-    on_giveup=__on_giveup_publication,
-)
-def _wait_for_publication(self: sboms._SBOMSClient, identity: str) -> sboms.SBOM:
+def __published(self: sboms._SBOMSClient, identity: str) -> sboms.SBOM:
     """Return None until published date is set"""
     entity = self.read(identity)
 
@@ -0,0 +1,220 @@
+"""Client-side rate limiter
+
+   A token bucket that is consulted before every request made by an Archivist
+   or ArchivistPublic instance. The bucket is shared by all threads using the
+   instance and optionally by all processes that use the same state file:
+
+   .. code-block:: python
+
+      arch = Archivist(
+          "https://app.rkvst.io",
+          authtoken,
+          rate_limiter=RateLimiter(rate=20, path="/tmp/archivist.ratelimit"),
+      )
+
+   The rate adapts to the responses from upstream (additive increase,
+   multiplicative decrease). Every successful request slowly increases the rate
+   up to max_rate. A 429 multiplies the rate by decrease and no further
+   requests are sent until the time in the Archivist-Rate-Limit-Reset header
+   has elapsed. Sustained ingestion therefore runs just under the limit
+   instead of repeatedly triggering 429 responses.
+
+"""
+
+# pylint:disable=too-few-public-methods
+
+from __future__ import annotations
+from contextlib import contextmanager
+from dataclasses import astuple, dataclass
+from logging import getLogger
+from os import O_CREAT, O_RDWR, close, open as os_open, pread, pwrite
+from struct import Struct
+from threading import Lock
+from time import sleep, time
+from typing import Iterator, Optional
+
+from .constants import HEADERS_RETRY_AFTER
+from .errors import ArchivistNotImplementedError
+from .headers import _headers_get
+
+try:
+    import fcntl
+
+    HAS_FCNTL = True
+except ImportError:  # pragma: no cover
+    HAS_FCNTL = False
+
+LOGGER = getLogger(__name__)
+
+RATE = 10.0
+MIN_RATE = 0.5
+MAX_RATE = 1000.0
+INCREASE = 1.0
+DECREASE = 0.5
+
+
+@dataclass
+class _Bucket:
+    """State of the token bucket"""
+
+    rate: float
+    tokens: float
+    updated: float
+    blocked_until: float = 0.0
+
+
+class _MemoryState:
+    """bucket state shared by the threads of one process"""
+
+    def __init__(self, bucket: _Bucket):
+        self._bucket = bucket
+        self._lock = Lock()
+
+    @contextmanager
+    def transaction(self) -> Iterator[_Bucket]:
+        """exclusive access to the bucket"""
+        with self._lock:
+            yield self._bucket
+
+
+class _FileState:
+    """bucket state shared by all processes that use the same file"""
+
+    STRUCT = Struct("4d")
+
+    def __init__(self, bucket: _Bucket, path: str):
+        if not HAS_FCNTL:
+            raise ArchivistNotImplementedError("Rate limiter file requires fcntl")
+
+        self._initial = bucket
+        self._lock = Lock()
+        self._fd = os_open(path, O_RDWR | O_CREAT, 0o600)
+
+    def __del__(self):
+        fd = getattr(self, "_fd", None)
+        if fd is not None:
+            close(fd)
+
+    @contextmanager
+    def transaction(self) -> Iterator[_Bucket]:
+        """exclusive access to the bucket - written back on exit"""
+        # flock excludes other processes, the lock excludes other threads
+        with self._lock:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                data = pread(self._fd, self.STRUCT.size, 0)
+                if len(data) == self.STRUCT.size:
+                    bucket = _Bucket(*self.STRUCT.unpack(data))
+                else:
+                    bucket = _Bucket(*astuple(self._initial))
+
+                yield bucket
+                pwrite(self._fd, self.STRUCT.pack(*astuple(bucket)), 0)
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+
+class RateLimiter:
+    """
+    Adaptive token bucket rate limiter.
+
+    Args:
+        rate (float): initial number of requests per second
+        burst (float): maximum number of requests sent without waiting.
+            Defaults to rate but at least 1. Must be at least 1.
+        min_rate (float): the rate is never decreased below this
+        max_rate (float): the rate is never increased above this
+        increase (float): increase of rate per second of successful requests
+        decrease (float): the rate is multiplied by this after a 429
+        path (str): optional file that shares the limiter between processes.
+            POSIX only.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        *,
+        rate: float = RATE,
+        burst: Optional[float] = None,
+        min_rate: float = MIN_RATE,
+        max_rate: float = MAX_RATE,
+        increase: float = INCREASE,
+        decrease: float = DECREASE,
+        path: Optional[str] = None,
+    ):
+        # a request needs a whole token
+        if burst is not None and burst < 1:
+            raise ValueError(f"burst {burst} must be at least 1")
+
+        self._burst = burst if burst is not None else max(rate, 1.0)
+        self._min_rate = min_rate
+        self._max_rate = max_rate
+        self._increase = increase
+        self._decrease = decrease
+        bucket = _Bucket(rate=rate, tokens=self._burst, updated=time())
+        self._state = (
+            _FileState(bucket, path) if path is not None else _MemoryState(bucket)
+        )
+
+    def __str__(self) -> str:
+        return f"RateLimiter({self.rate:.3f}/s)"
+
+    @property
+    def rate(self) -> float:
+        """float: current number of requests per second"""
+        with self._state.transaction() as bucket:
+            return bucket.rate
+
+    def _refill(self, bucket: _Bucket, now: float):
+        elapsed = max(0.0, now - bucket.updated)
+        bucket.tokens = min(self._burst, bucket.tokens + elapsed * bucket.rate)
+        bucket.updated = now
+
+    def acquire(self):
+        """Wait until a request may be sent"""
+        while True:
+            with self._state.transaction() as bucket:
+                now = time()
+                self._refill(bucket, now)
+                if now < bucket.blocked_until:
+                    wait = bucket.blocked_until - now
+                elif bucket.tokens >= 1:
+                    bucket.tokens -= 1
+                    return
+                else:
+                    wait = (1 - bucket.tokens) / bucket.rate
+
+            LOGGER.debug("Rate limited for %.3fs", wait)
+            sleep(wait)
+
+    def update(self, status_code: int, reset: Optional[float] = None):
+        """Adapt the rate to the status of a response
+
+        Args:
+            status_code (int): status of response
+            reset (float): seconds until the rate limit is reset if known
+        """
+        with self._state.transaction() as bucket:
+            now = time()
+            if status_code != 429:
+                if status_code < 400:
+                    # additive increase of 'increase' per second at full rate
+                    bucket.rate = min(
+                        self._max_rate, bucket.rate + self._increase / bucket.rate
+                    )
+                return
+
+            # concurrent requests may all be rejected - only react once
+            if now >= bucket.blocked_until:
+                bucket.rate = max(self._min_rate, bucket.rate * self._decrease)
+                LOGGER.info("Rate limit decreased to %.3f/s", bucket.rate)
+
+            self._refill(bucket, now)
+            bucket.tokens = 0.0
+            bucket.blocked_until = max(
+                bucket.blocked_until, now + (reset or 1 / bucket.rate)
+            )
+
+    def update_from_response(self, response):
+        """Adapt the rate to a response"""
+        reset = _headers_get(response.headers, HEADERS_RETRY_AFTER)
+        self.update(response.status_code, float(reset) if reset is not None else None)
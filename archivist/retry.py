@@ -0,0 +1,216 @@
+"""Retry policy
+
+   Defines which failed requests are retried and how long to wait between
+   attempts.
+
+   The following failures are retried:
+
+     * 429 (ArchivistTooManyRequestsError) - the wait is never shorter than the
+       time in the retry-after header. A 429 without a retry-after header is
+       not retried.
+     * 503 and other 5xx (ArchivistUnavailableError, Archivist5xxError)
+     * connection errors and timeouts
+
+   Requests that create or modify an entity (POST, PATCH) are only retried after a
+   429 or a connect timeout (i.e. when the request was certainly not processed)
+   unless retry_writes is True.
+
+   The wait between attempts uses decorrelated jitter so that many clients that
+   fail at the same time do not retry at the same time.
+
+   Each Archivist instance has a retry budget. Every retry consumes a token and
+   every successful request returns a fraction of a token. When the budget is
+   exhausted failed requests are not retried so that retries cannot amplify an
+   outage. Every retry is logged and passed to the on_retry hook:
+
+   .. code-block:: python
+
+      arch = Archivist(
+          "https://app.rkvst.io",
+          authtoken,
+          retry=RetryPolicy(retries=5, cap=60),
+      )
+
+"""
+
+from __future__ import annotations
+from collections import Counter
+from dataclasses import dataclass
+from functools import wraps
+from logging import getLogger
+from random import uniform
+from threading import Lock, local
+from time import sleep
+from typing import Optional, Sequence
+
+from requests.exceptions import ConnectionError as RequestsConnectionError
+from requests.exceptions import ConnectTimeout, Timeout
+
+from .errors import (
+    Archivist5xxError,
+    ArchivistTooManyRequestsError,
+    ArchivistUnavailableError,
+)
+from .hooks import Hooks, _call_hooks
+
+LOGGER = getLogger(__name__)
+
+NO_OF_RETRIES = 3
+RETRY_BASE = 0.1
+RETRY_CAP = 30.0
+RETRY_BUDGET = 10.0
+RETRY_BUDGET_RATIO = 0.1
+
+# failures that are only retried if the request is idempotent - Timeout must
+# precede ConnectionError as ConnectTimeout is both.
+RETRY_REASONS = (
+    (ArchivistUnavailableError, "5xx"),
+    (Archivist5xxError, "5xx"),
+    (Timeout, "timeout"),
+    (RequestsConnectionError, "connection"),
+)
+RETRY_ERRORS = (ArchivistTooManyRequestsError,) + tuple(e for e, _ in RETRY_REASONS)
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    Retry policy
+
+    Args:
+        retries (int): maximum number of retries of a single request
+        base (float): minimum wait in seconds between attempts
+        cap (float): maximum wait in seconds between attempts (unless a longer
+            wait is requested by a retry-after header)
+        budget (float): maximum number of retry tokens
+        budget_ratio (float): tokens returned to the budget by each successful
+            request
+        retry_writes (bool): if True POST and PATCH requests are retried after
+            5xx errors and connection errors as well.
+    """
+
+    retries: int = NO_OF_RETRIES
+    base: float = RETRY_BASE
+    cap: float = RETRY_CAP
+    budget: float = RETRY_BUDGET
+    budget_ratio: float = RETRY_BUDGET_RATIO
+    retry_writes: bool = False
+
+    def backoff(self, previous: float, floor: float = 0.0) -> float:
+        """Decorrelated jitter wait after a previous wait"""
+        wait = min(self.cap, uniform(self.base, max(self.base, previous * 3)))
+        return max(floor, wait)
+
+
+class _Retrier:
+    """Per-instance retry state - the budget and the retry counts"""
+
+    def __init__(self, policy: RetryPolicy, hooks: Sequence[Hooks] = ()):
+        self.policy = policy
+        self._hooks = hooks
+        self._lock = Lock()
+        self._tokens = policy.budget
+        self._counts: Counter = Counter()
+        # the method and url of the latest request of each thread
+        self._local = local()
+
+    @property
+    def counts(self) -> dict[str, int]:
+        """dict: number of retries keyed by reason"""
+        with self._lock:
+            return dict(self._counts)
+
+    def _acquire(self, reason: str) -> bool:
+        with self._lock:
+            if self._tokens < 1:
+                self._counts["budget_exhausted"] += 1
+                return False
+
+            self._tokens -= 1
+            self._counts[reason] += 1
+            return True
+
+    def requested(self, method: str, url: str):
+        """record the request being made - the request a retry repeats"""
+        self._local.request = (method, url)
+
+    def _succeeded(self):
+        with self._lock:
+            self._tokens = min(
+                self.policy.budget, self._tokens + self.policy.budget_ratio
+            )
+
+    def _reason(self, ex: Exception, idempotent: bool) -> Optional[str]:
+        """reason for retrying or None if the request must not be retried"""
+        if isinstance(ex, ArchivistTooManyRequestsError):
+            # compatible with previous behaviour - no retry-after header no retry
+            return "429" if ex.retry > 0 else None
+
+        if isinstance(ex, ConnectTimeout):
+            return "connect_timeout"
+
+        if not (idempotent or self.policy.retry_writes):
+            return None
+
+        for error, reason in RETRY_REASONS:
+            if isinstance(ex, error):
+                return reason
+
+        return None
+
+    def call(self, label: str, idempotent: bool, f, *args, **kwargs):
+        """call f retrying according to the policy"""
+        wait = 0.0
+        attempt = 0
+        while True:
+            self._local.request = (label, "")
+            try:
+                ret = f(*args, **kwargs)
+            except RETRY_ERRORS as ex:
+                reason = self._reason(ex, idempotent)
+                if (
+                    reason is None
+                    or attempt >= self.policy.retries
+                    or not self._acquire(reason)
+                ):
+                    raise
+
+                attempt += 1
+                floor = (
+                    ex.retry if isinstance(ex, ArchivistTooManyRequestsError) else 0.0
+                )
+                wait = self.policy.backoff(wait, floor)
+                method, url = self._local.request
+                LOGGER.info(
+                    "Retry %s %s %d after %s in %.3fs",
+                    method,
+                    url,
+                    attempt,
+                    reason,
+                    wait,
+                )
+                _call_hooks(self._hooks, "on_retry", method, url, attempt, reason, wait)
+                sleep(wait)
+
+            else:
+                self._succeeded()
+                return ret
+
+
+def _retry(*, idempotent: bool = True):
+    """Retry a REST method of an ArchivistPublic instance using its policy
+
+    Args:
+        idempotent (bool): False if repeating the request may have a different
+            effect e.g. POST.
+    """
+
+    def decorator(f):
+        @wraps(f)
+        def wrapper(self, *args, **kwargs):
+            # pylint: disable=protected-access
+            return self._retrier.call(f.__name__, idempotent, f, self, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
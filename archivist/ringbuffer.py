@@ -0,0 +1,109 @@
+"""Response ring buffer
+
+   Each Archivist or ArchivistPublic instance retains its most recent responses
+   for debugging (see the last_response() method). What is retained is
+   configurable:
+
+     * FULL - the requests.Response objects including their bodies (default)
+     * METADATA - a ResponseRecord of the url, status, headers, timing and size
+     * OFF - nothing
+
+   Long running processes that list many pages or download large blobs should
+   use METADATA or OFF so that response bodies are not kept alive:
+
+   .. code-block:: python
+
+      arch = Archivist(
+          "https://app.rkvst.io",
+          authtoken,
+          ring_buffer=RingBufferMode.METADATA,
+      )
+
+"""
+
+# pylint:disable=too-few-public-methods
+
+from __future__ import annotations
+from collections import deque
+from dataclasses import dataclass
+from enum import Enum
+from logging import getLogger
+from typing import Optional
+
+from requests.models import Response
+
+from .constants import HEADERS_CONTENT_LENGTH
+from .headers import _headers_get
+
+LOGGER = getLogger(__name__)
+
+
+class RingBufferMode(Enum):
+    """What is retained in the response ring buffer"""
+
+    FULL = "full"
+    METADATA = "metadata"
+    OFF = "off"
+
+
+@dataclass(frozen=True)
+class ResponseRecord:
+    """
+    Metadata of a response
+
+    Args:
+        method (str): e.g. "get"
+        url (str): url of the response
+        status_code (int): status code
+        headers (dict): response headers
+        elapsed (float): seconds until the response headers were received
+        size (int): size of the body from the Content-Length header if present
+    """
+
+    method: str
+    url: str
+    status_code: int
+    headers: dict[str, str]
+    elapsed: float
+    size: Optional[int] = None
+
+    @property
+    def ok(self) -> bool:  # pylint: disable=invalid-name
+        """bool: True if status code is less than 400"""
+        return self.status_code < 400
+
+    @classmethod
+    def from_response(
+        cls, method: str, response: Response, elapsed: float
+    ) -> ResponseRecord:
+        """Create record from a response without reading the body"""
+        size = _headers_get(response.headers, HEADERS_CONTENT_LENGTH)
+        return cls(
+            method=method,
+            url=response.url,
+            status_code=response.status_code,
+            headers=dict(response.headers or {}),
+            elapsed=elapsed,
+            size=int(size) if size is not None else None,
+        )
+
+
+class _ResponseRingBuffer:
+    """Thread-safe ring buffer of the most recent responses"""
+
+    def __init__(self, mode: RingBufferMode, maxlen: int):
+        self.mode = mode
+        self._buffer: deque = deque(maxlen=0 if mode is RingBufferMode.OFF else maxlen)
+
+    def append(self, method: str, response: Response, elapsed: float):
+        """record response according to the mode"""
+        if self.mode is RingBufferMode.FULL:
+            self._buffer.appendleft(response)
+        elif self.mode is RingBufferMode.METADATA:
+            self._buffer.appendleft(
+                ResponseRecord.from_response(method, response, elapsed)
+            )
+
+    def last(self, responses: int) -> list[Response | ResponseRecord]:
+        """most recent responses - newest first"""
+        return list(self._buffer)[:responses]
@@ -27,7 +27,6 @@
 from __future__ import annotations
 from typing import BinaryIO, Optional, Any
 from copy import deepcopy
-from io import BytesIO
 from logging import getLogger
 
 from requests.models import Response
@@ -45,9 +44,11 @@ from .constants import (
     SBOMS_PUBLISH,
 )
 from . import publisher, uploader, withdrawer
+from .cursor import ListCursor
 from .dictmerge import _deepmerge
+from .download import DownloadOptions, Target
 from .sbommetadata import SBOM
-from .utils import get_url
+from .utils import open_url
 
 LOGGER = getLogger(__name__)
 
@@ -105,10 +106,9 @@ class _SBOMSClient:
                 sbom = xmltodict_parse(fd, xml_attribs=True, disable_entities=False)
 
         else:
-            url = data["url"]
-            fd = BytesIO()
-            get_url(url, fd)
-            sbom = xmltodict_parse(fd, xml_attribs=True, disable_entities=False)
+            # parsed whilst downloaded
+            with open_url(data["url"]) as fd:
+                sbom = xmltodict_parse(fd, xml_attribs=True, disable_entities=False)
 
         b = sbom["bom"]
         m = b["metadata"]
@@ -190,15 +190,14 @@ class _SBOMSClient:
                 )
 
         else:
-            url = data["url"]
-            fd = BytesIO()
-            get_url(url, fd)
-            sbom = self.upload(
-                fd,
-                confirm=data.get("confirm", True),
-                mtype=data.get("content_type"),
-                params=data.get("params"),
-            )
+            # uploaded whilst downloaded
+            with open_url(data["url"]) as fd:
+                sbom = self.upload(
+                    fd,
+                    confirm=data.get("confirm", True),
+                    mtype=data.get("content_type"),
+                    params=data.get("params"),
+                )
 
         # response to sbom upload contains all the info we need.
         s = sbom.dict()
@@ -268,11 +267,17 @@ class _SBOMSClient:
             True if sbom is uploaded.
 
         """
-        uploader.MAX_TIME = self._archivist.max_time
         # pylint: disable=protected-access
         return uploader._wait_for_uploading(self, identity)
 
-    def download(self, identity: str, fd: BinaryIO) -> Response:
+    def download(
+        self,
+        identity: str,
+        fd: Target,
+        *,
+        options: Optional[DownloadOptions] = None,
+        hash_value: Optional[str] = None,
+    ) -> Optional[Response]:
         """Read SBOM
 
         Reads SBOM into data sink (usually a file opened for write)..
@@ -281,13 +286,24 @@ class _SBOMSClient:
 
         Args:
             identity (str): SBOM identity e.g. sboms/xxxxxxxxxxxxxxxxxxxxxxx
-            fd (file): opened file descriptor or other file-type sink.
+            fd (file): opened file descriptor or other file-type sink or the
+                path of the file.
+            options (DownloadOptions): optional chunk size and how a path is
+                written.
+            hash_value (str): optional expected SHA-256 of the SBOM. Raises
+                ArchivistHashMismatchError if the SBOM differs.
 
         Returns:
-            REST response
+            REST response - None if the blob was delivered from the blob
+            cache.
 
         """
-        return self._archivist.get_file(f"{self._subpath}/{identity}", fd)
+        return self._archivist.get_file(
+            f"{self._subpath}/{identity}",
+            fd,
+            options=options,
+            hash_value=hash_value,
+        )
 
     def read(self, identity: str) -> SBOM:
         """Read SBOM metadata
@@ -313,6 +329,8 @@ class _SBOMSClient:
         self,
         *,
         page_size: Optional[int] = None,
+        prefetch: int = 0,
+        cursor: Optional[ListCursor] = None,
         metadata: Optional[dict[str, Any]] = None,
     ):
         """List SBOMS.
@@ -330,6 +348,8 @@ class _SBOMSClient:
         Args:
             metadata (dict): optional e.g. {"life_cycle_status": "ACTIVE" }
             page_size (int): optional page size. (Rarely used).
+            prefetch (int): optional number of pages fetched in the background.
+            cursor (ListCursor): optional cursor to record or resume the listing.
 
         Returns:
             iterable that returns :class:`SBOM` instances
@@ -342,6 +362,8 @@ class _SBOMSClient:
                 f"{self._label}/{SBOMS_WILDCARD}",
                 SBOMS_LABEL,
                 page_size=page_size,
+                prefetch=prefetch,
+                cursor=cursor,
                 params=params,
             )
         )
@@ -383,7 +405,6 @@ class _SBOMSClient:
             True if sbom is confirmed.
 
         """
-        publisher.MAX_TIME = self._archivist.max_time
         # pylint: disable=protected-access
         return publisher._wait_for_publication(self, identity)
 
@@ -424,6 +445,5 @@ class _SBOMSClient:
             True if sbom is confirmed.
 
         """
-        withdrawer.MAX_TIME = self._archivist.max_time
         # pylint: disable=protected-access
         return withdrawer._wait_for_withdrawn(self, identity)
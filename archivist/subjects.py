@@ -36,6 +36,7 @@ from .constants import (
     SUBJECTS_SUBPATH,
 )
 from . import subjects_confirmer
+from .cursor import ListCursor
 from .dictmerge import _deepmerge
 
 
@@ -195,7 +196,6 @@ class _SubjectsClient:
             True if subject is confirmed.
 
         """
-        subjects_confirmer.MAX_TIME = self._archivist.max_time
         # pylint: disable=protected-access
         return subjects_confirmer._wait_for_confirmation(self, identity)
 
@@ -302,6 +302,8 @@ class _SubjectsClient:
         self,
         *,
         page_size: Optional[int] = None,
+        prefetch: int = 0,
+        cursor: Optional[ListCursor] = None,
         display_name: Optional[str] = None,
     ):
         """List subjects.
@@ -311,6 +313,8 @@ class _SubjectsClient:
         Args:
             display_name (str): display name (optional)
             page_size (int): optional page size. (Rarely used).
+            prefetch (int): optional number of pages fetched in the background.
+            cursor (ListCursor): optional cursor to record or resume the listing.
 
         Returns:
             iterable that returns :class:`Subject` instances
@@ -324,6 +328,8 @@ class _SubjectsClient:
                 self._label,
                 SUBJECTS_LABEL,
                 page_size=page_size,
+                prefetch=prefetch,
+                cursor=cursor,
                 params=self.__params(display_name=display_name),
             )
         )
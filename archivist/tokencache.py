@@ -0,0 +1,121 @@
+"""Persistent token cache
+
+   An opt-in on-disk cache of app registration tokens shared by all processes
+   on a host. Short-lived jobs such as the archivist_runner command reuse a
+   valid token instead of requesting a new one on every invocation:
+
+   .. code-block:: python
+
+      arch = Archivist(
+          "https://app.rkvst.io",
+          (client_id, client_secret),
+          token_cache=FileTokenCache(),
+      )
+
+   Each token is stored in its own file named by the SHA-256 of the URL and
+   client id. Files are only readable by the owner and are locked whilst a
+   token is requested so that concurrent processes make one token request.
+
+"""
+
+# pylint:disable=too-few-public-methods
+
+from __future__ import annotations
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from hashlib import sha256
+from json import JSONDecodeError, dumps, loads
+from logging import getLogger
+import os
+from os.path import expanduser, join
+from typing import Iterator, Optional
+
+from .errors import ArchivistNotImplementedError
+
+try:
+    import fcntl
+
+    HAS_FCNTL = True
+except ImportError:  # pragma: no cover
+    HAS_FCNTL = False
+
+# do not follow a symlink planted in place of a token file
+O_NOFOLLOW = getattr(os, "O_NOFOLLOW", 0)
+
+LOGGER = getLogger(__name__)
+
+# maximum size of a token file
+MAX_SIZE = 64 * 1024
+
+
+def _default_directory() -> str:
+    cache = os.environ.get("XDG_CACHE_HOME") or expanduser(join("~", ".cache"))
+    return join(cache, "archivist", "tokens")
+
+
+def _token_key(url: str, client_id: str) -> str:
+    return sha256(f"{url}\n{client_id}".encode("utf-8")).hexdigest()
+
+
+@dataclass
+class _CachedToken:
+    """A cached token - times are seconds since the epoch"""
+
+    access_token: Optional[str] = None
+    expires_at: float = 0.0
+    refresh_at: float = 0.0
+
+
+class FileTokenCache:
+    """
+    On-disk cache of app registration tokens
+
+    Args:
+        directory (str): directory of the token files. Defaults to
+            $XDG_CACHE_HOME/archivist/tokens or ~/.cache/archivist/tokens.
+            Created with permissions 0700 if it does not exist.
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        if not HAS_FCNTL:
+            raise ArchivistNotImplementedError("Token cache requires fcntl")
+
+        self._directory = directory or _default_directory()
+
+    def __str__(self) -> str:
+        return f"FileTokenCache({self._directory})"
+
+    @property
+    def directory(self) -> str:
+        """str: directory of the token files"""
+        return self._directory
+
+    @contextmanager
+    def transaction(self, key: str) -> Iterator[_CachedToken]:
+        """exclusive access to a cached token - written back on exit if changed"""
+        os.makedirs(self._directory, mode=0o700, exist_ok=True)
+        fd = os.open(
+            join(self._directory, f"{key}.json"),
+            os.O_RDWR | os.O_CREAT | O_NOFOLLOW,
+            0o600,
+        )
+        try:
+            # the file may predate this process with wider permissions
+            os.fchmod(fd, 0o600)
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            data = os.read(fd, MAX_SIZE)
+            try:
+                cached = _CachedToken(**loads(data)) if data else _CachedToken()
+            except (JSONDecodeError, TypeError, UnicodeDecodeError):
+                LOGGER.warning("Ignoring corrupt token cache file %s", key)
+                cached = _CachedToken()
+
+            original = asdict(cached)
+            yield cached
+            if asdict(cached) != original:
+                data = dumps(asdict(cached)).encode("utf-8")
+                os.ftruncate(fd, 0)
+                os.lseek(fd, 0, os.SEEK_SET)
+                os.write(fd, data)
+        finally:
+            os.close(fd)
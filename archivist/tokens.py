@@ -0,0 +1,157 @@
+"""Token manager
+
+   Manages the access token of an app registration (client id and secret).
+
+   The token is refreshed in the background once most of its lifetime has
+   elapsed so that requests continue to use the current token while the
+   new one is fetched. Concurrent refreshes are single-flighted - only one
+   token request is in flight at any time. A request only waits for a token
+   if there is none or it has already expired.
+
+   Optionally tokens are shared with other processes through a
+   :class:`FileTokenCache`.
+
+   The user is not expected to use this class directly. An Archivist instance
+   creates one when instantiated with a (client id, client secret) tuple and
+   shares it with its copies.
+
+"""
+
+# pylint:disable=too-few-public-methods
+
+from __future__ import annotations
+from logging import getLogger
+from threading import Lock, Thread
+from time import time
+from typing import Any, Callable, Optional
+
+from .errors import ArchivistError
+from .tokencache import FileTokenCache, _CachedToken
+
+LOGGER = getLogger(__name__)
+
+# the token is considered expired this number of seconds before it actually
+# expires to allow for clock skew and request latency
+EXPIRY_MARGIN = 10
+
+# fraction of the token lifetime remaining when a background refresh starts
+REFRESH_RATIO = 0.2
+
+
+class _TokenManager:  # pylint: disable=too-many-instance-attributes
+    """Single-flight, proactive refresh of an access token
+
+    Args:
+        fetch (Callable): returns a dict with "access_token" and "expires_in"
+            keys e.g. the appidp token method.
+        expiry_margin (float): seconds before expiry that the token is
+            considered expired.
+        refresh_ratio (float): fraction of the token lifetime remaining when
+            the token is refreshed in the background.
+        cache (FileTokenCache): optional cache shared with other processes.
+        key (str): key of the token in the cache.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[], dict[str, Any]],
+        *,
+        expiry_margin: float = EXPIRY_MARGIN,
+        refresh_ratio: float = REFRESH_RATIO,
+        cache: Optional[FileTokenCache] = None,
+        key: str = "",
+    ):
+        self._fetch = fetch
+        self._cache = cache
+        self._key = key
+        self._expiry_margin = expiry_margin
+        self._refresh_ratio = refresh_ratio
+
+        # held for the duration of a token request - single flight
+        self._refresh_lock = Lock()
+
+        self._token: Optional[str] = None
+        self._expires_at = 0.0
+        self._refresh_at = 0.0
+
+    @property
+    def expires_at(self) -> float:
+        """float: time after which the token must not be used"""
+        return self._expires_at
+
+    def _request(self, cached: _CachedToken):
+        apptoken = self._fetch()
+        token = apptoken.get("access_token")
+        if token is None:
+            raise ArchivistError("Auth token from client id,secret is invalid")
+
+        now = time()
+        expires_in = apptoken["expires_in"]
+        cached.access_token = token
+        cached.expires_at = now + expires_in - self._expiry_margin
+        cached.refresh_at = min(
+            now + expires_in * (1 - self._refresh_ratio), cached.expires_at
+        )
+        LOGGER.info("Refresh token")
+
+    def _refresh(self):
+        if self._cache is None:
+            cached = _CachedToken()
+            self._request(cached)
+        else:
+            # another process may have refreshed the token
+            with self._cache.transaction(self._key) as cached:
+                if cached.access_token is None or time() >= cached.refresh_at:
+                    self._request(cached)
+                else:
+                    LOGGER.debug("Token from cache")
+
+        self._expires_at = cached.expires_at
+        self._refresh_at = cached.refresh_at
+        self._token = cached.access_token
+
+    def _background(self):
+        try:
+            self._refresh()
+        except Exception as ex:  # pylint: disable=broad-except
+            # try again halfway to expiry - the token is refreshed synchronously
+            # when it expires
+            LOGGER.warning("Background token refresh failed: %s", ex)
+            self._refresh_at = (time() + self._expires_at) / 2
+        finally:
+            self._refresh_lock.release()
+
+    def _start_refresh(self):
+        # the lock is released by the background thread
+        if not self._refresh_lock.acquire(  # pylint: disable=consider-using-with
+            blocking=False
+        ):
+            return
+
+        Thread(
+            target=self._background,
+            name="archivist-token-refresh",
+            daemon=True,
+        ).start()
+
+    def token(self) -> str:
+        """Current access token
+
+        Returns immediately if the token has not expired - a background
+        refresh is started if the token is near expiry. Otherwise waits for
+        the single token request in flight or makes it.
+        """
+        now = time()
+        token = self._token
+        if token is not None and now < self._expires_at:
+            if now >= self._refresh_at:
+                self._start_refresh()
+
+            return token
+
+        with self._refresh_lock:
+            # another thread may have refreshed the token whilst we waited
+            if self._token is None or time() >= self._expires_at:
+                self._refresh()
+
+            return self._token  # type: ignore[return-value]
@@ -2,39 +2,30 @@
 """
 
 from __future__ import annotations
-from io import BytesIO
+from contextlib import contextmanager
+from io import SEEK_SET, BytesIO
 from logging import getLogger
-from typing import Tuple
+from queue import Empty, Queue
+from tempfile import SpooledTemporaryFile
+from threading import Event, Thread
+from typing import BinaryIO, Callable, Iterator, Tuple
 
 from requests import get as requests_get
 
+from .errors import ArchivistError
+from .parallel import _DONE, _Error, _produce
+
 LOGGER = getLogger(__name__)
 
+# size of each chunk downloaded from a url
+STREAM_CHUNK_SIZE = 64 * 1024
 
-# pylint: disable=missing-function-docstring
-def __tuple_member(tup, idx, default):
-    try:
-        ret = tup[idx]
-    except IndexError:
-        ret = default
-
-    return ret
-
-
-# for confirmers
-def backoff_handler(details):
-    wait = details["wait"]
-    tries = details["tries"]
-    args = details["args"]
-    client = __tuple_member(args, 0, "")
-    identity = __tuple_member(args, 1, "")
-    LOGGER.debug(
-        "Backing off %0.1f seconds after %s tries with %s id %s",
-        wait,
-        tries,
-        client,
-        identity,
-    )
+# maximum number of downloaded chunks buffered ahead of the upload
+STREAM_DEPTH = 16
+
+# a download without a content length is spooled to a temporary file
+# once larger than this
+SPOOL_SIZE = 8 * 1024 * 1024
 
 
 # download arbitrary files from a url.
@@ -54,6 +45,130 @@ def get_url(url: str, fd: BytesIO):  # pragma no cover
             fd.write(chunk)
 
 
+class _Pipe:  # pylint: disable=too-few-public-methods
+    """Reads chunks produced by a background thread from a bounded queue"""
+
+    def __init__(self, queue: Queue):
+        self._queue = queue
+        self._buffer = bytearray()
+        self._eof = False
+
+    def read(self, size: int) -> bytes:
+        """read size bytes - fewer only at the end of the download"""
+        while len(self._buffer) < size and not self._eof:
+            item = self._queue.get()
+            if item is _DONE:
+                self._eof = True
+            elif isinstance(item, _Error):
+                raise item.ex
+            else:
+                self._buffer += item
+
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+
+class _Stream:
+    """Read-only file of known length
+
+    The len attribute is the number of bytes not yet read - as expected by
+    the multipart encoder of Archivist.post_file().
+    """
+
+    def __init__(self, url: str, read: Callable[[int], bytes], length: int):
+        self._url = url
+        self._read = read
+        self._length = length
+        self._position = 0
+
+    @property
+    def len(self) -> int:
+        """int: number of bytes not yet read"""
+        return self._length - self._position
+
+    def tell(self) -> int:
+        """number of bytes read"""
+        return self._position
+
+    def seek(self, offset: int, whence: int = SEEK_SET) -> int:
+        """the stream cannot be rewound - only the current position is valid"""
+        if whence != SEEK_SET or offset != self._position:
+            raise ArchivistError(
+                f"Upload of {self._url} cannot be repeated after "
+                f"{self._position} of {self._length} bytes were read"
+            )
+
+        return self._position
+
+    def read(self, size: int = -1) -> bytes:
+        """read up to size bytes - all remaining bytes if size is negative"""
+        if size < 0 or size > self.len:
+            size = self.len
+
+        data = self._read(size) if size else b""
+        if len(data) < size:
+            raise ArchivistError(
+                f"Download of {self._url} ended after "
+                f"{self._position + len(data)} of {self._length} bytes"
+            )
+
+        self._position += len(data)
+        return data
+
+
+@contextmanager
+def open_url(url: str) -> Iterator[BinaryIO]:
+    """Stream a binary object from upstream storage
+
+    Yields a read-only file that can be uploaded with Archivist.post_file()
+    whilst it is downloaded. Memory is bounded - at most STREAM_DEPTH chunks
+    are buffered ahead of the reader. If the length of the object is not known
+    in advance (no Content-Length or the content is encoded) it is first
+    spooled to a temporary file.
+
+    An upload of the file cannot be repeated - it is not seekable so a retry
+    of Archivist.post_file() raises ArchivistError.
+    """
+    with requests_get(url, stream=True, timeout=30) as response:
+        chunks = response.iter_content(chunk_size=STREAM_CHUNK_SIZE)
+        length = response.headers.get("Content-Length")
+        if length is None or response.headers.get("Content-Encoding") not in (
+            None,
+            "identity",
+        ):
+            with SpooledTemporaryFile(max_size=SPOOL_SIZE) as spool:
+                for chunk in chunks:
+                    spool.write(chunk)
+
+                size = spool.tell()
+                spool.seek(0)
+                LOGGER.debug("Spooled %d bytes from %s", size, url)
+                yield _Stream(url, spool.read, size)  # type: ignore
+
+            return
+
+        queue: Queue = Queue(maxsize=STREAM_DEPTH)
+        stop = Event()
+        Thread(
+            target=_produce,
+            args=(chunks, queue, stop),
+            name="archivist-download",
+            daemon=True,
+        ).start()
+        try:
+            yield _Stream(url, _Pipe(queue).read, int(length))  # type: ignore
+
+        finally:
+            stop.set()
+            # unblock the download if waiting on a full queue
+            try:
+                while True:
+                    queue.get_nowait()
+            except Empty:
+                pass
+
+
 def get_auth(
     *,
     auth_token_filename=None,
@@ -0,0 +1,2 @@
+"""Archivist SDK benchmarks
+"""
@@ -0,0 +1,82 @@
+"""Download benchmark
+
+   Measures the throughput of ArchivistPublic.get_file() downloading a blob
+   from a local server as a single stream and as 4 and 8 concurrent byte
+   ranges. The server paces each response to simulate a per-connection
+   bandwidth limit - ranges only help when a single connection is the
+   bottleneck.
+
+   Run with:
+
+       python3 -m benchmarks.download
+
+"""
+
+# pylint:  disable=missing-docstring
+
+from os import urandom
+from os.path import join
+from tempfile import TemporaryDirectory
+from time import perf_counter, sleep
+
+# archivist.archivist must be imported before archivist.archivistpublic
+from archivist.archivist import ArchivistPublic
+from archivist.download import DownloadOptions
+
+from .stubserver import StubServer, _Handler
+
+SIZE = 64 * 1024 * 1024
+BLOB = urandom(SIZE)
+
+# bytes per second of each connection
+BANDWIDTH = 64 * 1024 * 1024
+WRITE_SIZE = 256 * 1024
+
+RANGES = (1, 4, 8)
+
+
+class _BlobHandler(_Handler):
+    def _body(self, first: int, last: int):
+        for start in range(first, last + 1, WRITE_SIZE):
+            self.wfile.write(BLOB[start : min(start + WRITE_SIZE, last + 1)])
+            sleep(WRITE_SIZE / BANDWIDTH)
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        spec = self.headers.get("Range")
+        if spec is None:
+            first, last = 0, SIZE - 1
+            self.send_response(200)
+        else:
+            start, _, end = spec[len("bytes=") :].partition("-")
+            first, last = int(start), min(int(end), SIZE - 1) if end else SIZE - 1
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {first}-{last}/{SIZE}")
+
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(last + 1 - first))
+        self.end_headers()
+        self._body(first, last)
+        self.wfile.flush()
+
+
+def run(ranges: int) -> float:
+    with StubServer(_BlobHandler) as server, ArchivistPublic() as public:
+        with TemporaryDirectory() as directory:
+            start = perf_counter()
+            public.get_file(
+                f"{server.url}/archivist/v1/blobs/xxxxxxxx",
+                join(directory, "blob.bin"),
+                options=DownloadOptions(ranges=ranges),
+            )
+            return SIZE / (perf_counter() - start)
+
+
+def main():
+    print(f"{'ranges':>6} {'MiB/s':>9}")
+    for ranges in RANGES:
+        print(f"{ranges:>6} {run(ranges) / 1024 / 1024:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Connection pool benchmark
+
+   Measures requests/second of ArchivistPublic.get() against a local stub
+   server with 1, 8 and 32 threads sharing one instance, comparing the
+   default pool options with a pool sized for the number of threads.
+
+   Run with:
+
+       python3 -m benchmarks.pool
+
+"""
+
+# pylint:  disable=missing-docstring
+
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+
+# archivist.archivist must be imported before archivist.archivistpublic
+from archivist.archivist import ArchivistPublic
+from archivist.pool import PoolOptions
+
+from .stubserver import StubServer
+
+REQUESTS = 4000
+THREADS = (1, 8, 32)
+
+
+def run(pool: PoolOptions, threads: int):
+    with StubServer() as server, ArchivistPublic(pool=pool) as public:
+        url = f"{server.url}/archivist/v2/assets/xxxxxxxx"
+        public.get(url)  # warm up
+
+        start = perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            for _ in executor.map(lambda _: public.get(url), range(REQUESTS)):
+                pass
+
+        elapsed = perf_counter() - start
+        return REQUESTS / elapsed, server.connections
+
+
+def main():
+    print(f"{'pool':<28} {'threads':>7} {'req/s':>9} {'connections':>11}")
+    for threads in THREADS:
+        for name, pool in (
+            ("default", PoolOptions()),
+            (f"maxsize={threads},block", PoolOptions(maxsize=threads, block=True)),
+        ):
+            rate, connections = run(pool, threads)
+            print(f"{name:<28} {threads:>7} {rate:>9.0f} {connections:>11}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Local stub server for benchmarks
+
+   A minimal threaded HTTP/1.1 server that answers every GET with a small
+   JSON body. It counts the number of TCP connections accepted so that
+   benchmarks can show connection churn.
+"""
+
+# pylint:  disable=missing-docstring
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from json import dumps as json_dumps
+from threading import Lock, Thread
+
+BODY = json_dumps({"identity": "assets/xxxxxxxx", "attributes": {}}).encode()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # send headers and body in one write to avoid delayed-ACK stalls
+    wbufsize = -1
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:  # type: ignore
+            self.server.connections += 1  # type: ignore
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+        self.wfile.flush()
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        pass
+
+
+class StubServer(ThreadingHTTPServer):
+    """Threaded stub server listening on an ephemeral localhost port"""
+
+    daemon_threads = True
+
+    def __init__(self, handler=_Handler):
+        super().__init__(("127.0.0.1", 0), handler)
+        self.lock = Lock()
+        self.connections = 0
+        self._thread = Thread(target=self.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self.shutdown()
+        self.server_close()
@@ -3,6 +3,7 @@ Test archivist list
 """
 
 from os import environ
+from time import sleep
 from unittest import mock
 
 from archivist.constants import HEADERS_TOTAL_COUNT, HEADERS_RETRY_AFTER
@@ -12,6 +13,7 @@ from archivist.errors import (
     ArchivistTooManyRequestsError,
 )
 from archivist.logger import set_logger
+from archivist.parallel import POLL_INTERVAL
 
 from .mock_response import MockResponse
 from .testarchivist import TestArchivistMethods
@@ -307,7 +309,7 @@ class TestArchivistList(TestArchivistMethods):
         values = ("value10", "value11", "value12", "value13")
         paging = (
             {**params, "page_size": 2},
-            {"page_size": 2, "page_token": "token"},
+            {**params, "page_size": 2, "page_token": "token"},
         )
         with mock.patch.object(self.arch.session, "get") as mock_get:
             mock_get.side_effect = [
@@ -445,3 +447,81 @@ class TestArchivistList(TestArchivistMethods):
                     ),
                     msg="GET method called incorrectly",
                 )
+
+    def test_list_with_prefetch(self):
+        """
+        Test list method with prefetched pages
+        """
+        values = [f"value{i}" for i in range(6)]
+        with mock.patch.object(self.arch.session, "get") as mock_get:
+            mock_get.side_effect = [
+                MockResponse(
+                    200,
+                    things=[{"field1": v} for v in values[i : i + 2]],
+                    next_page_token="token" if i < 4 else None,
+                )
+                for i in range(0, 6, 2)
+            ]
+            responses = list(
+                self.arch.list("path/path", "things", page_size=2, prefetch=2)
+            )
+            self.assertEqual(
+                [r["field1"] for r in responses],
+                values,
+                msg="Incorrect response body values",
+            )
+            self.assertEqual(
+                mock_get.call_count,
+                3,
+                msg="Incorrect number of pages",
+            )
+
+    def test_list_with_prefetch_and_error(self):
+        """
+        Test list method with prefetched pages and error on second page
+        """
+        with mock.patch.object(self.arch.session, "get") as mock_get:
+            mock_get.side_effect = [
+                MockResponse(
+                    200,
+                    things=[{"field1": "value1"}],
+                    next_page_token="token",
+                ),
+                MockResponse(400),
+            ]
+            responses = self.arch.list("path/path", "things", prefetch=1)
+            self.assertEqual(
+                next(responses),
+                {"field1": "value1"},
+                msg="Incorrect first response",
+            )
+            with self.assertRaises(ArchivistBadRequestError):
+                next(responses)
+
+    def test_list_with_prefetch_and_close(self):
+        """
+        Test that prefetching stops when the caller stops iterating
+        """
+        with mock.patch.object(self.arch.session, "get") as mock_get:
+            mock_get.return_value = MockResponse(
+                200,
+                things=[{"field1": "value1"}],
+                next_page_token="token",
+            )
+            responses = self.arch.list("path/path", "things", prefetch=1)
+            next(responses)
+            responses.close()
+            # allow the background thread to notice
+            sleep(2 * POLL_INTERVAL)
+            count = mock_get.call_count
+            sleep(2 * POLL_INTERVAL)
+            self.assertEqual(
+                mock_get.call_count,
+                count,
+                msg="prefetch must stop",
+            )
+            self.assertLessEqual(
+                count,
+                3,
+                msg="prefetch must be bounded",
+            )
@@ -0,0 +1,154 @@
+"""
+Test assetattachments download_many
+"""
+
+from hashlib import sha256
+from io import BytesIO
+from os import environ
+from os.path import join
+from tempfile import TemporaryDirectory
+from unittest import TestCase, mock
+
+from archivist.archivist import Archivist
+from archivist.errors import ArchivistHashMismatchError, ArchivistNotFoundError
+from archivist.logger import set_logger
+
+from .mock_response import MockResponse
+from .testassetattachments import ASSET_ID
+
+# pylint: disable=missing-docstring
+# pylint: disable=protected-access
+
+if "RKVST_LOGLEVEL" in environ and environ["RKVST_LOGLEVEL"]:
+    set_logger(environ["RKVST_LOGLEVEL"])
+
+
+def content(i):
+    return f"attachment {i}".encode() * 1000
+
+
+def hash_value(i):
+    return sha256(content(i)).hexdigest()
+
+
+def get(url, **_kwargs):
+    uuid = url.rsplit("/", 2)[-2] if url.endswith("/info") else url.rsplit("/", 1)[-1]
+    i = int(uuid)
+    if i == 3:
+        return MockResponse(404, error="not found")
+
+    if url.endswith("/info"):
+        return MockResponse(200, hash={"alg": "SHA256", "value": hash_value(i)})
+
+    body = content(i)
+    return MockResponse(
+        200,
+        headers={},
+        iter_content=lambda chunk_size: (
+            body[j : j + chunk_size] for j in range(0, len(body), chunk_size)
+        ),
+    )
+
+
+class TestAssetAttachmentsDownloadMany(TestCase):
+    """
+    Test Archivist AssetAttachments download_many
+    """
+
+    def setUp(self):
+        self.arch = Archivist("url", "authauthauth")
+        self.addCleanup(self.arch.close)
+        self.directory = TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(self.directory.cleanup)
+
+    def path(self, i):
+        return join(self.directory.name, f"{i}.bin")
+
+    def read(self, i):
+        with open(self.path(i), "rb") as fd:
+            return fd.read()
+
+    def test_assetattachments_download_many(self):
+        """
+        Test download_many reports results in input order and aggregates
+        """
+        with mock.patch.object(self.arch.session, "get") as mock_get:
+            mock_get.side_effect = get
+            report = self.arch.assetattachments.download_many(
+                (
+                    (ASSET_ID, f"blobs/{i}", self.path(i), hash_value(i))
+                    for i in range(6)
+                ),
+                concurrency=3,
+            )
+
+        self.assertEqual(
+            [r.attachment_id for r in report.results],
+            [f"blobs/{i}" for i in range(6)],
+            msg="results must be in input order",
+        )
+        self.assertEqual(
+            [r.succeeded for r in report.results],
+            [True, True, True, False, True, True],
+            msg="a failed download must not abort the batch",
+        )
+        self.assertIsInstance(report.results[3].error, ArchivistNotFoundError)
+        self.assertEqual((report.downloaded, report.skipped, report.failed), (5, 0, 1))
+        self.assertEqual(
+            report.size,
+            sum(len(content(i)) for i in range(6) if i != 3),
+            msg="Incorrect size",
+        )
+        self.assertGreater(report.throughput, 0, msg="Incorrect throughput")
+        self.assertEqual(self.read(5), content(5), msg="Incorrect content")
+
+    def test_assetattachments_download_many_skip(self):
+        """
+        Test existing files with a matching hash are skipped
+        """
+        for i in range(3):
+            with open(self.path(i), "wb") as fd:
+                fd.write(content(i) if i != 1 else b"stale")
+
+        with mock.patch.object(self.arch.session, "get") as mock_get:
+            mock_get.side_effect = get
+            report = self.arch.assetattachments.download_many(
+                [
+                    (ASSET_ID, "blobs/0", self.path(0), hash_value(0)),
+                    (ASSET_ID, "blobs/1", self.path(1), hash_value(1)),
+                    (ASSET_ID, "blobs/2", self.path(2)),
+                ]
+            )
+
+        self.assertEqual(
+            [r.skipped for r in report.results],
+            [True, False, True],
+            msg="matching files must be skipped",
+        )
+        self.assertEqual(self.read(1), content(1), msg="stale file not replaced")
+        self.assertEqual(
+            sorted(
+                call.args[0].split(f"{ASSET_ID}/")[-1]
+                for call in mock_get.call_args_list
+            ),
+            ["1", "2/info"],
+            msg="only the stale file is downloaded and the unknown hash read",
+        )
+
+    def test_assetattachments_download_many_fd(self):
+        """
+        Test download to open files and hash verification
+        """
+        fd = BytesIO()
+        with mock.patch.object(self.arch.session, "get") as mock_get:
+            mock_get.side_effect = get
+            report = self.arch.assetattachments.download_many(
+                [
+                    (ASSET_ID, "blobs/0", fd),
+                    (ASSET_ID, "blobs/1", BytesIO(), hash_value(0)),
+                ]
+            )
+
+        self.assertEqual(fd.getvalue(), content(0), msg="Incorrect content")
+        self.assertEqual(report.results[0].size, len(content(0)))
+        self.assertIsInstance(report.results[1].error, ArchivistHashMismatchError)
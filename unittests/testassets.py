@@ -2,9 +2,10 @@
 Test assets
 """
 
-from copy import copy
+from copy import copy, deepcopy
 from logging import getLogger
 from os import environ
+from threading import Barrier
 
 from unittest import mock
 
@@ -426,3 +427,39 @@ class TestAssetsCreateIfNotExists(TestAssetsBase):
             RESPONSE_EXISTS_ATTACHMENTS,
             attachments_resp=RESPONSE_ATTACHMENTS,
         )
+
+    def test_assets_create_if_not_exists_concurrent_attachments(self):
+        """
+        Test attachments are uploaded concurrently with deterministic keys
+        """
+        req = deepcopy(REQUEST_EXISTS_ATTACHMENTS)
+        req["attachments"][1]["filename"] = "test_filename2.jpg"
+        barrier = Barrier(2, timeout=5)
+
+        def create(attachment):
+            # both uploads must be in flight at the same time
+            barrier.wait()
+            return {**RESPONSE_ATTACHMENTS, "arc_file_name": attachment["filename"]}
+
+        with mock.patch.object(
+            self.arch.session, "post", autospec=True
+        ) as mock_post, mock.patch.object(
+            self.arch.session, "get"
+        ) as mock_get, mock.patch.object(
+            self.arch.attachments, "create"
+        ) as mock_attachments:
+            mock_get.side_effect = ArchivistNotFoundError
+            mock_post.return_value = MockResponse(200, **RESPONSE_EXISTS_ATTACHMENTS)
+            mock_attachments.side_effect = create
+
+            self.arch.assets.create_if_not_exists(data=req, confirm=False)
+            _, kwargs = mock_post.call_args
+            attrs = kwargs["json"]["attributes"]
+            self.assertEqual(
+                (
+                    attrs["test_filename1"]["arc_file_name"],
+                    attrs["test_filename2"]["arc_file_name"],
+                ),
+                ("test_filename1", "test_filename2.jpg"),
+                msg="attachment keys must match their uploads",
+            )
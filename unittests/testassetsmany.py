@@ -0,0 +1,264 @@
+"""
+Test assets create_many
+"""
+
+from os import environ
+from threading import Event, Lock
+from unittest import mock
+
+from archivist.constants import ASSET_BEHAVIOURS
+from archivist.errors import ArchivistBadRequestError, ArchivistNotFoundError
+from archivist.logger import set_logger
+
+from .mock_response import MockResponse
+from .testassetsconstants import (
+    TestAssetsBase,
+    RESPONSE,
+)
+
+# pylint: disable=missing-docstring
+# pylint: disable=protected-access
+
+if "RKVST_LOGLEVEL" in environ and environ["RKVST_LOGLEVEL"]:
+    set_logger(environ["RKVST_LOGLEVEL"])
+
+
+def body(i):
+    return {"attributes": {"arc_display_name": f"device {i}"}}
+
+
+def post(_url, json=None, **_kwargs):  # pylint: disable=redefined-outer-name
+    name = json["attributes"]["arc_display_name"]
+    if name == "device 3":
+        return MockResponse(400, error="bad request")
+
+    return MockResponse(
+        200,
+        **{**RESPONSE, "identity": f"assets/{name}", "attributes": json["attributes"]},
+    )
+
+
+class TestAssetsCreateMany(TestAssetsBase):
+    """
+    Test Archivist Assets create_many
+    """
+
+    def test_assets_create_many(self):
+        """
+        Test create_many yields in input order and aggregates errors
+        """
+        self.arch._fixtures = {"assets": {"attributes": {"arc_namespace": "ns"}}}
+        with mock.patch.object(self.arch.session, "post") as mock_post:
+            mock_post.side_effect = post
+            creations = list(
+                self.arch.assets.create_many(
+                    (body(i) for i in range(6)), concurrency=3, confirm=False
+                )
+            )
+
+        self.assertEqual(
+            [c.data for c in creations],
+            [body(i) for i in range(6)],
+            msg="creations must be in input order",
+        )
+        self.assertEqual(
+            [c.succeeded for c in creations],
+            [True, True, True, False, True, True],
+            msg="a failed asset must not abort the batch",
+        )
+        self.assertIsInstance(
+            creations[3].error,
+            ArchivistBadRequestError,
+            msg="error must be reported",
+        )
+        self.assertEqual(
+            creations[0].asset["identity"],
+            "assets/device 0",
+            msg="Incorrect asset",
+        )
+        _, kwargs = mock_post.call_args_list[0]
+        self.assertEqual(
+            kwargs["json"]["behaviours"],
+            ASSET_BEHAVIOURS,
+            msg="default behaviours must be merged",
+        )
+        self.assertEqual(
+            kwargs["json"]["attributes"]["arc_namespace"],
+            "ns",
+            msg="fixtures must be merged",
+        )
+
+    def test_assets_create_many_unordered(self):
+        """
+        Test create_many in completion order
+        """
+        with mock.patch.object(self.arch.session, "post") as mock_post:
+            mock_post.side_effect = post
+            creations = list(
+                self.arch.assets.create_many(
+                    (body(i) for i in range(6)),
+                    concurrency=2,
+                    confirm=False,
+                    ordered=False,
+                )
+            )
+
+        self.assertEqual(
+            sorted(c.data["attributes"]["arc_display_name"] for c in creations),
+            [f"device {i}" for i in range(6)],
+            msg="every asset must be yielded",
+        )
+
+    def test_assets_create_many_bounded(self):
+        """
+        Test create_many reads inputs only as assets complete
+        """
+        read = []
+
+        def bodies():
+            for i in range(100):
+                read.append(i)
+                yield body(i)
+
+        with mock.patch.object(self.arch.session, "post") as mock_post:
+            mock_post.side_effect = post
+            creations = self.arch.assets.create_many(
+                bodies(), concurrency=4, confirm=False
+            )
+            next(creations)
+            self.assertLessEqual(
+                len(read),
+                5,
+                msg="at most concurrency assets must be in flight",
+            )
+            creations.close()
+
+    def test_assets_create_many_location(self):
+        """
+        Test assets sharing a new location
+        """
+        location = {
+            "selector": ["display_name"],
+            "display_name": "Macclesfield",
+        }
+        created = []
+        lock = Lock()
+
+        def create_if_not_exists(data):
+            with lock:
+                existed = bool(created)
+                created.append(data)
+
+            return {"identity": "locations/xxxxxxxx"}, existed
+
+        with mock.patch.object(
+            self.arch.session, "post"
+        ) as mock_post, mock.patch.object(
+            self.arch.locations, "create_if_not_exists"
+        ) as mock_location, mock.patch.object(
+            self.arch.assets, "read_by_signature"
+        ) as mock_read:
+            mock_post.side_effect = post
+            mock_location.side_effect = create_if_not_exists
+            mock_read.side_effect = ArchivistNotFoundError("not found")
+            creations = list(
+                self.arch.assets.create_many(
+                    (
+                        {
+                            **body(i),
+                            "selector": [{"attributes": ["arc_display_name"]}],
+                            "location": location,
+                        }
+                        for i in (0, 1, 2, 4)
+                    ),
+                    concurrency=4,
+                    confirm=False,
+                )
+            )
+
+        self.assertTrue(
+            all(c.succeeded and not c.existed for c in creations),
+            msg="all assets must be created",
+        )
+        self.assertEqual(len(created), 1, msg="location must be created once")
+        _, kwargs = mock_post.call_args
+        self.assertEqual(
+            kwargs["json"]["attributes"]["arc_home_location_identity"],
+            "locations/xxxxxxxx",
+            msg="location must be set",
+        )
+
+    def test_assets_create_many_slow(self):
+        """
+        Test a slow asset does not reduce the number in flight
+        """
+        others = Event()
+        posted = []
+        lock = Lock()
+
+        def slow_post(url, json=None, **kwargs):  # pylint: disable=redefined-outer-name
+            name = json["attributes"]["arc_display_name"]
+            if name == "device 0":
+                # only completes if the other assets are posted meanwhile
+                others.wait(5)
+            else:
+                with lock:
+                    posted.append(name)
+                    if len(posted) == 7:
+                        others.set()
+
+            return post(url, json=json, **kwargs)
+
+        with mock.patch.object(self.arch.session, "post") as mock_post:
+            mock_post.side_effect = slow_post
+            creations = list(
+                self.arch.assets.create_many(
+                    (body(i) for i in (0, 1, 2, 4, 5, 6, 7, 8)),
+                    concurrency=2,
+                    confirm=False,
+                )
+            )
+
+        self.assertTrue(others.is_set(), msg="slow asset must not block others")
+        self.assertEqual(
+            [c.data for c in creations],
+            [body(i) for i in (0, 1, 2, 4, 5, 6, 7, 8)],
+            msg="creations must be in input order",
+        )
+
+    def test_assets_create_many_duplicates(self):
+        """
+        Test bodies with the same selector signature are created once
+        """
+        with mock.patch.object(
+            self.arch.session, "post"
+        ) as mock_post, mock.patch.object(
+            self.arch.assets, "read_by_signature"
+        ) as mock_read:
+            mock_post.side_effect = post
+            mock_read.side_effect = ArchivistNotFoundError("not found")
+            creations = list(
+                self.arch.assets.create_many(
+                    (
+                        {
+                            **body(i % 2),
+                            "selector": [{"attributes": ["arc_display_name"]}],
+                        }
+                        for i in range(6)
+                    ),
+                    concurrency=6,
+                    confirm=False,
+                )
+            )
+
+        self.assertEqual(mock_post.call_count, 2, msg="duplicates must not be created")
+        self.assertEqual(
+            sum(c.existed for c in creations),
+            4,
+            msg="duplicates must be reported as existing",
+        )
+        self.assertEqual(
+            creations[4].asset["identity"],
+            "assets/device 0",
+            msg="duplicate must report the created asset",
+        )
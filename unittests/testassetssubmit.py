@@ -0,0 +1,115 @@
+"""
+Test assets submit
+"""
+
+from concurrent.futures import wait
+from os import environ
+from unittest import mock
+
+from archivist.errors import ArchivistUnconfirmedError
+from archivist.hooks import Hooks
+from archivist.logger import set_logger
+from archivist.poller import Poller
+
+from .mock_response import MockResponse
+from .testassetsconstants import (
+    TestAssetsBase,
+    ATTRS,
+    PROPS,
+    RESPONSE,
+    RESPONSE_FAILED,
+    RESPONSE_PENDING,
+)
+
+# pylint: disable=missing-docstring
+# pylint: disable=protected-access
+
+if "RKVST_LOGLEVEL" in environ and environ["RKVST_LOGLEVEL"]:
+    set_logger(environ["RKVST_LOGLEVEL"])
+
+
+class TestAssetsSubmit(TestAssetsBase):
+    """
+    Test Archivist Assets submit
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.hooks = mock.Mock(spec=Hooks)
+        self.arch._poller = Poller(
+            self.arch.max_time, base=0.01, cap=0.02, hooks=[self.hooks]
+        )
+
+    def test_assets_submit(self):
+        """
+        Test submit returns before confirmation
+        """
+        with mock.patch.object(
+            self.arch.session, "post"
+        ) as mock_post, mock.patch.object(self.arch.session, "get") as mock_get:
+            mock_post.return_value = MockResponse(200, **RESPONSE_PENDING)
+            mock_get.side_effect = (
+                MockResponse(200, **RESPONSE_PENDING),
+                MockResponse(200, **RESPONSE),
+            )
+            future = self.arch.assets.submit(props=PROPS, attrs=ATTRS)
+            self.assertEqual(
+                future.result(timeout=5),
+                RESPONSE,
+                msg="future must be resolved with the confirmed asset",
+            )
+            self.assertEqual(
+                mock_get.call_count,
+                2,
+                msg="asset must be polled until confirmed",
+            )
+            args = self.hooks.on_wait.call_args[0]
+            self.assertEqual(
+                (args[0], args[1], args[3]),
+                ("confirmation", RESPONSE["identity"], True),
+                msg="confirmation must be reported to on_wait",
+            )
+
+    def test_assets_submit_failed(self):
+        """
+        Test futures fail per asset
+        """
+        with mock.patch.object(
+            self.arch.session, "post"
+        ) as mock_post, mock.patch.object(self.arch.session, "get") as mock_get:
+            mock_post.side_effect = (
+                MockResponse(200, **RESPONSE_PENDING),
+                MockResponse(200, **{**RESPONSE_PENDING, "identity": "assets/other"}),
+            )
+            mock_get.side_effect = lambda url, **kwargs: MockResponse(
+                200, **(RESPONSE_FAILED if url.endswith("other") else RESPONSE_PENDING)
+            )
+            self.arch._max_time = 0.1
+            futures = [
+                self.arch.assets.submit_from_data({"attributes": ATTRS})
+                for _ in range(2)
+            ]
+            done, not_done = wait(futures, timeout=5)
+            self.assertEqual(
+                (len(done), len(not_done)),
+                (2, 0),
+                msg="futures must be resolved",
+            )
+            for future in futures:
+                with self.assertRaises(ArchivistUnconfirmedError):
+                    future.result()
+
+    def test_assets_submit_close(self):
+        """
+        Test pending futures fail on close
+        """
+        with mock.patch.object(
+            self.arch.session, "post"
+        ) as mock_post, mock.patch.object(self.arch.session, "get") as mock_get:
+            mock_post.return_value = MockResponse(200, **RESPONSE_PENDING)
+            mock_get.return_value = MockResponse(200, **RESPONSE_PENDING)
+            self.arch._max_time = 100
+            future = self.arch.assets.submit(props=PROPS, attrs=ATTRS)
+            self.arch.close()
+            with self.assertRaises(ArchivistUnconfirmedError):
+                future.result(timeout=5)
@@ -7,13 +7,17 @@ from os import environ
 
 from unittest import mock
 
+from requests.exceptions import ConnectionError as RequestsConnectionError
+
 from archivist.constants import (
     HEADERS_REQUEST_TOTAL_COUNT,
     HEADERS_TOTAL_COUNT,
     ROOT,
 )
 from archivist.errors import ArchivistNotFoundError, ArchivistUnconfirmedError
+from archivist.hooks import Hooks
 from archivist.logger import set_logger
+from archivist.poller import Poller
 
 from .mock_response import MockResponse
 from .testassetsconstants import (
@@ -190,3 +194,139 @@ class TestAssetsWait(TestAssetsBase):
 
             with self.assertRaises(ArchivistUnconfirmedError):
                 self.arch.assets.wait_for_confirmed()
+
+    def test_assets_wait_for_confirmation_many(self):
+        """
+        Test waiting for many assets
+        """
+        statuses = {
+            "assets/confirmed": ["CONFIRMED"],
+            "assets/later": ["PENDING", "PENDING", "CONFIRMED"],
+            "assets/failed": ["PENDING", "FAILED"],
+            "assets/pending": ["PENDING"] * 10,
+        }
+
+        def read(url, **kwargs):  # pylint: disable=unused-argument
+            identity = url.split("/v2/")[1]
+            status = statuses[identity]
+            return MockResponse(
+                200,
+                identity=identity,
+                confirmation_status=status.pop(0) if len(status) > 1 else status[0],
+            )
+
+        clock = [0.0]
+
+        def sleep(secs):
+            clock[0] += secs
+
+        hooks = mock.Mock(spec=Hooks)
+        self.arch._poller = Poller(10, hooks=[hooks])
+
+        with mock.patch.object(
+            self.arch.session, "get", side_effect=read
+        ) as mock_get, mock.patch(
+            "archivist.confirmer.sleep", side_effect=sleep
+        ) as mock_sleep, mock.patch(
+            "archivist.poller.monotonic", lambda: clock[0]
+        ), mock.patch(
+            "archivist.poller.uniform", lambda _, bound: bound
+        ):
+            self.arch._max_time = 10
+            confirmations = list(
+                self.arch.assets.wait_for_confirmation_many(
+                    [*statuses, "assets/confirmed"], workers=2
+                )
+            )
+
+        results = {c.identity: c for c in confirmations}
+        self.assertEqual(
+            len(confirmations),
+            4,
+            msg="one confirmation per identity",
+        )
+        self.assertEqual(
+            [c.identity for c in confirmations][0],
+            "assets/confirmed",
+            msg="confirmed asset must be yielded first",
+        )
+        self.assertTrue(
+            results["assets/later"].confirmed,
+            msg="asset must be confirmed",
+        )
+        self.assertEqual(
+            results["assets/later"].entity["confirmation_status"],
+            "CONFIRMED",
+            msg="Incorrect entity",
+        )
+        for identity in ("assets/failed", "assets/pending"):
+            self.assertIsInstance(
+                results[identity].error,
+                ArchivistUnconfirmedError,
+                msg=f"{identity} must not be confirmed",
+            )
+
+        self.assertEqual(
+            [c.args[0] for c in mock_sleep.call_args_list],
+            [1.0, 2.0, 4.0, 3.0],
+            msg="backoff must be shared until max_time",
+        )
+        self.assertEqual(
+            mock_get.call_count,
+            1 + 3 + 2 + 5,
+            msg="Incorrect number of reads",
+        )
+        self.assertEqual(
+            sorted((c.args[1], c.args[3]) for c in hooks.on_wait.call_args_list),
+            [
+                ("assets/confirmed", True),
+                ("assets/failed", False),
+                ("assets/later", True),
+                ("assets/pending", False),
+            ],
+            msg="each identity must be reported to on_wait",
+        )
+
+    def test_assets_wait_for_confirmation_many_read_error(self):
+        """
+        Test an error reading one asset is reported on its confirmation
+        """
+
+        def read(url, **kwargs):  # pylint: disable=unused-argument
+            identity = url.split("/v2/")[1]
+            if identity == "assets/broken":
+                raise RequestsConnectionError("reset")
+
+            return MockResponse(200, identity=identity, confirmation_status="CONFIRMED")
+
+        hooks = mock.Mock(spec=Hooks)
+        self.arch._poller = Poller(10, hooks=[hooks])
+        with mock.patch.object(self.arch.session, "get", side_effect=read), mock.patch(
+            "archivist.retry.sleep"
+        ):
+            confirmations = list(
+                self.arch.assets.wait_for_confirmation_many(
+                    ["assets/broken", "assets/confirmed"], workers=2
+                )
+            )
+
+        results = {c.identity: c for c in confirmations}
+        self.assertEqual(
+            len(confirmations),
+            2,
+            msg="one confirmation per identity",
+        )
+        self.assertTrue(
+            results["assets/confirmed"].confirmed,
+            msg="asset must be confirmed",
+        )
+        self.assertIsInstance(
+            results["assets/broken"].error,
+            RequestsConnectionError,
+            msg="read error must be reported",
+        )
+        self.assertEqual(
+            hooks.on_wait.call_count,
+            2,
+            msg="each identity must be reported to on_wait",
+        )
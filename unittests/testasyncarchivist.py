@@ -0,0 +1,451 @@
+"""
+Test async archivist
+"""
+
+from asyncio import gather, run
+from itertools import count
+from os import environ
+from threading import current_thread, main_thread
+from unittest import TestCase, mock
+
+from archivist.asyncarchivist import (
+    LIST_BATCH_SIZE,
+    AsyncArchivist,
+    AsyncArchivistPublic,
+)
+from archivist.constants import HEADERS_TOTAL_COUNT, ROOT
+from archivist.errors import ArchivistUnconfirmedError
+from archivist.logger import set_logger
+from archivist.poller import Poller
+
+from .mock_response import MockResponse
+from .testassetsconstants import (
+    ATTRS,
+    IDENTITY,
+    PROPS,
+    REQUEST_EXISTS,
+    RESPONSE,
+    RESPONSE_EXISTS,
+    RESPONSE_FAILED,
+    RESPONSE_PENDING,
+    SUBPATH,
+)
+
+# pylint: disable=missing-docstring
+# pylint: disable=protected-access
+# pylint: disable=unused-variable
+
+if "RKVST_LOGLEVEL" in environ and environ["RKVST_LOGLEVEL"]:
+    set_logger(environ["RKVST_LOGLEVEL"])
+
+
+class TestAsyncArchivist(TestCase):
+    """
+    Test AsyncArchivist class
+    """
+
+    maxDiff = None
+
+    def test_async_archivist(self):
+        """
+        Test default async archivist creation
+        """
+
+        async def test():
+            async with AsyncArchivist("https://app.rkvst.io", "authauthauth") as arch:
+                self.assertEqual(
+                    str(arch),
+                    "AsyncArchivist(https://app.rkvst.io)",
+                    msg="Incorrect str",
+                )
+                self.assertEqual(
+                    str(arch.assets),
+                    "AsyncAssetsRestricted(https://app.rkvst.io)",
+                    msg="Incorrect assets",
+                )
+                self.assertEqual(
+                    str(arch.locations),
+                    "AsyncLocationsClient(https://app.rkvst.io)",
+                    msg="Incorrect locations",
+                )
+                self.assertEqual(
+                    arch.url,
+                    "https://app.rkvst.io",
+                    msg="Incorrect url",
+                )
+                self.assertEqual(
+                    arch.archivist.pool.maxsize,
+                    32,
+                    msg="Incorrect pool size",
+                )
+                with self.assertRaises(AttributeError):
+                    e = arch._illegal
+
+        run(test())
+
+    def test_async_archivist_public(self):
+        """
+        Test default async public creation
+        """
+
+        async def test():
+            async with AsyncArchivistPublic(max_workers=4) as public:
+                self.assertEqual(
+                    str(public),
+                    "AsyncArchivistPublic()",
+                    msg="Incorrect str",
+                )
+                self.assertEqual(
+                    str(public.events),
+                    "AsyncEventsPublic()",
+                    msg="Incorrect events",
+                )
+                self.assertEqual(
+                    public.archivist.pool.maxsize,
+                    4,
+                    msg="Incorrect pool size",
+                )
+                with mock.patch.object(public.archivist.session, "get") as mock_get:
+                    mock_get.return_value = MockResponse(200, **RESPONSE)
+                    asset = await public.assets.read("https://app.rkvst.io/xxxx")
+                    self.assertEqual(
+                        asset,
+                        RESPONSE,
+                        msg="Incorrect asset",
+                    )
+
+        run(test())
+
+
+class TestAsyncArchivistMethods(TestCase):
+    """
+    Test AsyncArchivist methods
+    """
+
+    maxDiff = None
+
+    def setUp(self):
+        self.arch = AsyncArchivist("url", "authauthauth", max_time=100)
+
+    def tearDown(self):
+        run(self.arch.close())
+
+    def test_async_get(self):
+        """
+        Test async REST verb
+        """
+
+        async def test():
+            with mock.patch.object(self.arch.archivist.session, "get") as mock_get:
+                mock_get.return_value = MockResponse(200, **RESPONSE)
+                return await self.arch.get("url/path")
+
+        self.assertEqual(
+            run(test()),
+            RESPONSE,
+            msg="Incorrect response",
+        )
+
+    def test_async_read_gather(self):
+        """
+        Test many concurrent reads
+        """
+
+        async def test():
+            with mock.patch.object(self.arch.archivist.session, "get") as mock_get:
+                mock_get.return_value = MockResponse(200, **RESPONSE)
+                return await gather(
+                    *(self.arch.assets.read(IDENTITY) for _ in range(50))
+                )
+
+        assets = run(test())
+        self.assertEqual(
+            len(assets),
+            50,
+            msg="Incorrect number of assets",
+        )
+
+    def test_async_list(self):
+        """
+        Test async list generator
+        """
+
+        async def test():
+            with mock.patch.object(self.arch.archivist.session, "get") as mock_get:
+                mock_get.side_effect = [
+                    MockResponse(
+                        200,
+                        assets=[RESPONSE] * 150,
+                        next_page_token="token",
+                    ),
+                    MockResponse(
+                        200,
+                        assets=[RESPONSE] * 20,
+                    ),
+                ]
+                return [a async for a in self.arch.assets.list(page_size=150)]
+
+        assets = run(test())
+        self.assertEqual(
+            len(assets),
+            170,
+            msg="Incorrect number of assets",
+        )
+
+    def test_async_list_break(self):
+        """
+        Test the synchronous generator is closed when the caller stops early
+        """
+        requested = []
+        closed = []
+
+        def records(*_args, **_kwargs):
+            try:
+                for i in count():
+                    requested.append(i)
+                    yield RESPONSE
+
+            finally:
+                closed.append(current_thread() is not main_thread())
+
+        async def test():
+            with mock.patch.object(self.arch.archivist.assets, "list", records):
+                assets = self.arch.assets.list()
+                async for _ in assets:
+                    break
+
+                await assets.aclose()
+
+        run(test())
+        self.assertEqual(
+            closed, [True], msg="generator must be closed on the thread pool"
+        )
+        self.assertEqual(
+            len(requested),
+            LIST_BATCH_SIZE,
+            msg="no more records must be requested",
+        )
+
+    def test_async_list_matching(self):
+        """
+        Test generator methods are async generators run on the thread pool
+        """
+
+        async def test():
+            with mock.patch.object(self.arch.archivist.session, "get") as mock_get:
+                mock_get.return_value = MockResponse(200, assets=[RESPONSE] * 3)
+                matching = self.arch.access_policies.list_matching_assets(
+                    "access_policies/xxxxxxxx"
+                )
+                mock_get.assert_not_called()
+                return [a async for a in matching]
+
+        assets = run(test())
+        self.assertEqual(len(assets), 3, msg="Incorrect number of assets")
+
+    def test_async_pending_count(self):
+        """
+        Test pending count of wait_for_confirmed is visible
+        """
+
+        async def test():
+            with mock.patch.object(
+                self.arch.archivist.session, "get"
+            ) as mock_get, mock.patch("archivist.poller.sleep"):
+                # all assets, pending twice, pending and failed
+                mock_get.side_effect = [
+                    MockResponse(200, headers={HEADERS_TOTAL_COUNT: count}, assets=[])
+                    for count in (2, 2, 0, 0)
+                ]
+                await self.arch.assets.wait_for_confirmed()
+
+        run(test())
+        self.assertEqual(self.arch.assets.pending_count, 2, msg="Incorrect count")
+
+    def test_async_create_with_confirmation(self):
+        """
+        Test async create waits for confirmation
+        """
+
+        async def test():
+            with mock.patch.object(
+                self.arch.archivist.session, "post"
+            ) as mock_post, mock.patch.object(
+                self.arch.archivist.session, "get"
+            ) as mock_get:
+                mock_post.return_value = MockResponse(200, **RESPONSE_PENDING)
+                mock_get.side_effect = [
+                    MockResponse(200, **RESPONSE_PENDING),
+                    MockResponse(200, **RESPONSE),
+                ]
+                asset = await self.arch.assets.create(props=PROPS, attrs=ATTRS)
+                self.assertEqual(
+                    mock_get.call_args[0],
+                    (f"url/{ROOT}/{SUBPATH}/xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx",),
+                    msg="Incorrect read",
+                )
+                return asset
+
+        self.assertEqual(
+            run(test()),
+            RESPONSE,
+            msg="Incorrect asset",
+        )
+
+    def test_async_create_no_confirmation(self):
+        """
+        Test async create without confirmation
+        """
+
+        async def test():
+            with mock.patch.object(
+                self.arch.archivist.session, "post"
+            ) as mock_post, mock.patch.object(
+                self.arch.archivist.session, "get"
+            ) as mock_get:
+                mock_post.return_value = MockResponse(200, **RESPONSE_PENDING)
+                asset = await self.arch.assets.create_from_data(
+                    REQUEST_EXISTS, confirm=False
+                )
+                self.assertEqual(
+                    mock_get.call_count,
+                    0,
+                    msg="Must not read",
+                )
+                return asset
+
+        self.assertEqual(
+            run(test()),
+            RESPONSE_PENDING,
+            msg="Incorrect asset",
+        )
+
+    def test_async_create_failed(self):
+        """
+        Test async create fails confirmation
+        """
+
+        async def test():
+            with mock.patch.object(
+                self.arch.archivist.session, "post"
+            ) as mock_post, mock.patch.object(
+                self.arch.archivist.session, "get"
+            ) as mock_get:
+                mock_post.return_value = MockResponse(200, **RESPONSE_PENDING)
+                mock_get.return_value = MockResponse(200, **RESPONSE_FAILED)
+                await self.arch.assets.create(props=PROPS, attrs=ATTRS)
+
+        with self.assertRaises(ArchivistUnconfirmedError):
+            run(test())
+
+    def test_async_wait_for_confirmation_many(self):
+        """
+        Test async wait for many confirmations
+        """
+
+        async def test():
+            with mock.patch.object(self.arch.archivist.session, "get") as mock_get:
+                mock_get.return_value = MockResponse(200, **RESPONSE_FAILED)
+                return [
+                    confirmation
+                    async for confirmation in self.arch.assets.wait_for_confirmation_many(
+                        [IDENTITY]
+                    )
+                ]
+
+        (confirmation,) = run(test())
+        self.assertIsInstance(
+            confirmation.error,
+            ArchivistUnconfirmedError,
+            msg="failure must be reported",
+        )
+
+    def test_async_create_many(self):
+        """
+        Test async create many
+        """
+
+        async def test():
+            with mock.patch.object(self.arch.archivist.session, "post") as mock_post:
+                mock_post.return_value = MockResponse(200, **RESPONSE_PENDING)
+                return [
+                    creation
+                    async for creation in self.arch.assets.create_many(
+                        [{"attributes": ATTRS}] * 3, confirm=False
+                    )
+                ]
+
+        self.assertEqual(
+            [creation.asset for creation in run(test())],
+            [RESPONSE_PENDING] * 3,
+            msg="Incorrect assets",
+        )
+
+    def test_async_submit_gather(self):
+        """
+        Test async submit returns futures that can be gathered
+        """
+
+        async def test():
+            with mock.patch.object(
+                self.arch.archivist.session, "post"
+            ) as mock_post, mock.patch.object(
+                self.arch.archivist.session, "get"
+            ) as mock_get, mock.patch.object(
+                self.arch.archivist, "_poller", Poller(10, base=0.01)
+            ):
+                mock_post.return_value = MockResponse(200, **RESPONSE_PENDING)
+                mock_get.return_value = MockResponse(200, **RESPONSE)
+                future = await self.arch.assets.submit(props=PROPS, attrs=ATTRS)
+                return await gather(future)
+
+        self.assertEqual(
+            run(test()),
+            [RESPONSE],
+            msg="Incorrect confirmed asset",
+        )
+
+    def test_async_create_if_not_exists(self):
+        """
+        Test async create if not exists
+        """
+
+        async def test():
+            with mock.patch.object(
+                self.arch.archivist.session, "post"
+            ) as mock_post, mock.patch.object(
+                self.arch.archivist.session, "get"
+            ) as mock_get:
+                mock_get.side_effect = [
+                    MockResponse(200, assets=[]),
+                    MockResponse(200, **RESPONSE_EXISTS),
+                ]
+                mock_post.return_value = MockResponse(200, **RESPONSE_EXISTS)
+                return await self.arch.assets.create_if_not_exists(REQUEST_EXISTS)
+
+        asset, existed = run(test())
+        self.assertEqual(
+            asset,
+            RESPONSE_EXISTS,
+            msg="Incorrect asset",
+        )
+        self.assertFalse(
+            existed,
+            msg="asset must not exist",
+        )
+
+    def test_async_create_if_exists(self):
+        """
+        Test async create if not exists when asset exists
+        """
+
+        async def test():
+            with mock.patch.object(self.arch.archivist.session, "get") as mock_get:
+                mock_get.return_value = MockResponse(200, assets=[RESPONSE_EXISTS])
+                return await self.arch.assets.create_if_not_exists(REQUEST_EXISTS)
+
+        asset, existed = run(test())
+        self.assertTrue(
+            existed,
+            msg="asset must exist",
+        )
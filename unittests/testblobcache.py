@@ -0,0 +1,211 @@
+"""
+Test blob cache
+"""
+
+from fcntl import LOCK_EX, flock
+from hashlib import sha256
+from io import BytesIO
+from os import O_CREAT, O_RDWR, chmod, close, environ, stat
+from os import open as os_open
+from os.path import join
+from stat import S_IWUSR
+from tempfile import TemporaryDirectory
+from unittest import TestCase, mock
+
+from archivist.archivist import Archivist
+from archivist.blobcache import BlobCache
+from archivist.conditional import ConditionalCache
+from archivist.errors import ArchivistHashMismatchError
+from archivist.logger import set_logger
+
+from .mock_response import MockResponse
+
+# pylint: disable=missing-docstring
+# pylint: disable=protected-access
+
+if "RKVST_LOGLEVEL" in environ and environ["RKVST_LOGLEVEL"]:
+    set_logger(environ["RKVST_LOGLEVEL"])
+
+
+def blob(i):
+    return f"blob {i}".encode() * 1000
+
+
+def hash_value(i):
+    return sha256(blob(i)).hexdigest()
+
+
+def get(url, **_kwargs):
+    body = blob(int(url.rsplit("/", 1)[-1]))
+    return MockResponse(
+        200,
+        headers={},
+        iter_content=lambda chunk_size: (
+            body[j : j + chunk_size] for j in range(0, len(body), chunk_size)
+        ),
+    )
+
+
+class TestBlobCache(TestCase):
+    """
+    Test downloads through the blob cache
+    """
+
+    def setUp(self):
+        self.directory = TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(self.directory.cleanup)
+        self.cache = BlobCache(join(self.directory.name, "cache"))
+        self.arch = Archivist("url", "authauthauth", blob_cache=self.cache)
+        self.addCleanup(self.arch.close)
+
+    def path(self, name):
+        return join(self.directory.name, name)
+
+    def read(self, name):
+        with open(self.path(name), "rb") as fd:
+            return fd.read()
+
+    def download(self, i, target, mock_get):
+        mock_get.side_effect = get
+        return self.arch.attachments.download(
+            f"blobs/{i}", target, hash_value=hash_value(i)
+        )
+
+    def test_blob_cache_hit(self):
+        """
+        Test a cached blob is delivered without a request
+        """
+        with mock.patch.object(self.arch.session, "get") as mock_get:
+            response = self.download(0, self.path("a.bin"), mock_get)
+            self.assertIsNotNone(response, msg="miss must download")
+            response = self.download(0, self.path("b.bin"), mock_get)
+            self.assertIsNone(response, msg="hit must not download")
+            fd = BytesIO()
+            self.download(0, fd, mock_get)
+            self.assertEqual(mock_get.call_count, 1, msg="one request")
+
+        self.assertEqual(self.read("b.bin"), blob(0), msg="Incorrect content")
+        self.assertEqual(fd.getvalue(), blob(0), msg="Incorrect content")
+        self.assertEqual(
+            stat(self.path("b.bin")).st_ino,
+            stat(self.path("a.bin")).st_ino,
+            msg="hit must be hard linked",
+        )
+        self.assertFalse(
+            stat(self.path("b.bin")).st_mode & S_IWUSR, msg="must be read-only"
+        )
+        self.assertEqual(
+            self.cache.stats(),
+            {
+                "hits": 2,
+                "misses": 1,
+                "evictions": 0,
+                "entries": 1,
+                "size": len(blob(0)),
+            },
+        )
+
+    def test_blob_cache_copy(self):
+        """
+        Test a cache without links delivers writable copies
+        """
+        self.arch._blob_cache = BlobCache(self.path("copies"), link=False)
+        with mock.patch.object(self.arch.session, "get") as mock_get:
+            self.download(0, self.path("a.bin"), mock_get)
+            self.download(0, self.path("b.bin"), mock_get)
+
+        self.assertEqual(self.read("b.bin"), blob(0), msg="Incorrect content")
+        self.assertNotEqual(
+            stat(self.path("b.bin")).st_ino,
+            stat(self.path("a.bin")).st_ino,
+            msg="hit must be copied",
+        )
+        self.assertTrue(
+            stat(self.path("b.bin")).st_mode & S_IWUSR, msg="must be writable"
+        )
+
+    def test_blob_cache_corrupt(self):
+        """
+        Test a corrupt entry is discarded and downloaded again
+        """
+        with mock.patch.object(self.arch.session, "get") as mock_get:
+            self.download(0, BytesIO(), mock_get)
+            entry = self.cache._entry(hash_value(0))
+            chmod(entry, 0o644)
+            with open(entry, "r+b") as fd:
+                fd.write(b"corrupt")
+
+            fd = BytesIO()
+            with self.assertLogs("archivist.blobcache", level="WARNING"):
+                self.download(0, fd, mock_get)
+
+            self.assertEqual(mock_get.call_count, 2, msg="must download again")
+
+        self.assertEqual(fd.getvalue(), blob(0), msg="corrupt entry served")
+
+    def test_blob_cache_mismatch(self):
+        """
+        Test a download that does not match is not cached
+        """
+        with mock.patch.object(self.arch.session, "get") as mock_get:
+            mock_get.side_effect = get
+            with self.assertRaises(ArchivistHashMismatchError):
+                self.arch.attachments.download(
+                    "blobs/1", BytesIO(), hash_value=hash_value(0)
+                )
+
+        self.assertEqual(len(self.cache), 0, msg="must not be cached")
+
+    def test_blob_cache_evict(self):
+        """
+        Test least recently used blobs are evicted
+        """
+        size = len(blob(0))
+        self.arch._blob_cache = BlobCache(self.path("small"), max_size=size * 2)
+        with mock.patch.object(self.arch.session, "get") as mock_get:
+            self.download(0, BytesIO(), mock_get)
+            self.download(1, BytesIO(), mock_get)
+            self.download(0, BytesIO(), mock_get)
+            self.download(2, BytesIO(), mock_get)
+            self.download(0, BytesIO(), mock_get)
+            self.assertEqual(mock_get.call_count, 3, msg="blob 0 must stay cached")
+
+        cache = self.arch.blob_cache
+        self.assertEqual(cache.stats()["evictions"], 1, msg="blob 1 evicted")
+        self.assertEqual(cache.size, size * 2, msg="Incorrect size")
+
+        reopened = BlobCache(self.path("small"), max_size=size * 2)
+        self.assertEqual(len(reopened), 2, msg="entries must be reused")
+
+    def test_blob_cache_evict_locked(self):
+        """
+        Test a blob locked by another process is not evicted
+        """
+        size = len(blob(0))
+        cache = BlobCache(self.path("shared"), max_size=size)
+        self.arch._blob_cache = cache
+        # a lock held on another open file is the same as another process
+        fd = os_open(join(cache.directory, "locks", hash_value(0)), O_RDWR | O_CREAT)
+        self.addCleanup(close, fd)
+        with mock.patch.object(self.arch.session, "get") as mock_get:
+            self.download(0, BytesIO(), mock_get)
+            flock(fd, LOCK_EX)
+            self.download(1, BytesIO(), mock_get)
+
+        self.assertEqual(
+            cache.stats()["evictions"], 1, msg="only the unlocked blob evicted"
+        )
+        self.assertIsNotNone(cache._get(hash_value(0)), msg="locked blob kept")
+
+    def test_blob_cache_public(self):
+        """
+        Test the Public instance shares the caches
+        """
+        conditional = ConditionalCache()
+        with Archivist(
+            "url", "authauthauth", blob_cache=self.cache, conditional_cache=conditional
+        ) as arch, arch.Public as public:
+            self.assertIs(public.blob_cache, self.cache, msg="blob cache not shared")
+            self.assertIs(
+                public.conditional_cache, conditional, msg="conditional not shared"
+            )
@@ -0,0 +1,153 @@
+"""
+Test conditional GET
+"""
+
+from io import BytesIO
+from os import environ
+from unittest import TestCase, mock
+
+from archivist.archivist import Archivist
+from archivist.conditional import ConditionalCache
+from archivist.constants import HEADERS_ETAG, HEADERS_LAST_MODIFIED
+from archivist.logger import set_logger
+
+from .mock_response import MockResponse
+
+# pylint: disable=missing-docstring
+# pylint: disable=protected-access
+
+if "RKVST_LOGLEVEL" in environ and environ["RKVST_LOGLEVEL"]:
+    set_logger(environ["RKVST_LOGLEVEL"])
+
+URL = "https://app.rkvst.io/archivist/v2/assets/xxxxxxxx"
+ETAG = '"abcdef"'
+LAST_MODIFIED = "Wed, 21 Oct 2015 07:28:00 GMT"
+
+
+class TestConditionalGet(TestCase):
+    """
+    Test conditional GET
+    """
+
+    def setUp(self):
+        self.cache = ConditionalCache(max_file_size=8)
+        self.arch = Archivist(
+            "https://app.rkvst.io", "authauthauth", conditional_cache=self.cache
+        )
+
+    def tearDown(self):
+        self.arch.close()
+
+    def test_conditional_get(self):
+        """
+        Test a 304 returns the cached body
+        """
+        with mock.patch.object(self.arch.session, "get") as mock_get:
+            mock_get.side_effect = (
+                MockResponse(200, headers={HEADERS_ETAG: ETAG}, identity="x"),
+                MockResponse(304),
+            )
+            first = self.arch.assets.read("assets/xxxxxxxx")
+            second = self.arch.assets.read("assets/xxxxxxxx")
+            self.assertEqual(
+                second,
+                first,
+                msg="cached body must be returned",
+            )
+            self.assertEqual(
+                mock_get.call_args.kwargs["headers"]["If-None-Match"],
+                ETAG,
+                msg="Incorrect conditional header",
+            )
+
+        self.assertEqual(
+            self.cache.stats(),
+            {"hits": 1, "misses": 1},
+            msg="Incorrect stats",
+        )
+
+    def test_conditional_get_modified(self):
+        """
+        Test a modified entity replaces the cached body
+        """
+        with mock.patch.object(self.arch.session, "get") as mock_get:
+            mock_get.side_effect = (
+                MockResponse(200, headers={HEADERS_LAST_MODIFIED: LAST_MODIFIED}, n=1),
+                MockResponse(200, headers={HEADERS_ETAG: ETAG}, n=2),
+                MockResponse(304),
+            )
+            self.arch.get(URL)
+            self.arch.get(URL)
+            self.assertEqual(
+                mock_get.call_args.kwargs["headers"]["If-Modified-Since"],
+                LAST_MODIFIED,
+                msg="Incorrect conditional header",
+            )
+            self.assertEqual(
+                self.arch.get(URL),
+                {"n": 2},
+                msg="modified body must be cached",
+            )
+
+    def test_conditional_get_params(self):
+        """
+        Test responses without validators or with different params are not used
+        """
+        with mock.patch.object(self.arch.session, "get") as mock_get:
+            mock_get.side_effect = (
+                MockResponse(200, headers={HEADERS_ETAG: ETAG}),
+                MockResponse(200),
+                MockResponse(200),
+            )
+            self.arch.get(URL)
+            self.arch.get(URL, params={"a": "b"})
+            self.assertNotIn(
+                "If-None-Match",
+                mock_get.call_args.kwargs["headers"],
+                msg="params must be part of the key",
+            )
+            self.arch.get(URL, params={"a": "b"})
+            self.assertNotIn(
+                "If-None-Match",
+                mock_get.call_args.kwargs["headers"],
+                msg="response without validators must not be cached",
+            )
+
+    def test_conditional_get_file(self):
+        """
+        Test a 304 writes the cached file
+        """
+        with mock.patch.object(self.arch.session, "get") as mock_get:
+            mock_get.side_effect = (
+                MockResponse(
+                    200,
+                    headers={HEADERS_ETAG: ETAG},
+                    iter_content=lambda chunk_size: iter((b"abc", b"def")),
+                ),
+                MockResponse(304),
+            )
+            for _ in range(2):
+                fd = BytesIO()
+                self.arch.get_file(URL, fd)
+                self.assertEqual(
+                    fd.getvalue(),
+                    b"abcdef",
+                    msg="Incorrect file",
+                )
+
+    def test_conditional_get_large_file(self):
+        """
+        Test files larger than max_file_size are not cached
+        """
+        with mock.patch.object(self.arch.session, "get") as mock_get:
+            mock_get.return_value = MockResponse(
+                200,
+                headers={HEADERS_ETAG: ETAG},
+                iter_content=lambda chunk_size: iter((b"abcdef", b"ghijkl")),
+            )
+            self.arch.get_file(URL, BytesIO())
+            self.assertEqual(
+                len(self.cache),
+                0,
+                msg="large file must not be cached",
+            )
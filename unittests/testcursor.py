@@ -0,0 +1,202 @@
+"""
+Test list cursor
+"""
+
+from os import environ
+from os.path import join
+from tempfile import TemporaryDirectory
+from unittest import TestCase, mock
+
+from archivist.cursor import ListCursor
+from archivist.errors import ArchivistBadFieldError
+from archivist.logger import set_logger
+
+from .mock_response import MockResponse
+from .testarchivist import TestArchivistMethods
+
+# pylint: disable=missing-docstring
+# pylint: disable=protected-access
+
+if "RKVST_LOGLEVEL" in environ and environ["RKVST_LOGLEVEL"]:
+    set_logger(environ["RKVST_LOGLEVEL"])
+
+PARAMS = {"attributes": {"arc_display_type": "door"}}
+
+
+def pages():
+    return [
+        MockResponse(
+            200,
+            things=[{"field1": "value1"}, {"field1": "value2"}],
+            next_page_token="token1",
+        ),
+        MockResponse(
+            200,
+            things=[{"field1": "value3"}, {"field1": "value4"}],
+            next_page_token="token2",
+        ),
+        MockResponse(
+            200,
+            things=[{"field1": "value5"}],
+        ),
+    ]
+
+
+class TestListCursor(TestCase):
+    """
+    Test ListCursor
+    """
+
+    maxDiff = None
+
+    def test_cursor_default(self):
+        """
+        Test new cursor
+        """
+        cursor = ListCursor()
+        self.assertFalse(
+            cursor.started,
+            msg="cursor must not be started",
+        )
+        cursor.start("path/path", "things", params=PARAMS, page_size=2)
+        self.assertTrue(
+            cursor.started,
+            msg="cursor must be started",
+        )
+        self.assertIsNot(
+            cursor.params,
+            PARAMS,
+            msg="cursor params must be a copy",
+        )
+
+    def test_cursor_save_and_load(self):
+        """
+        Test cursor serialization
+        """
+        cursor = ListCursor(
+            url="path/path",
+            field="things",
+            params=PARAMS,
+            page_size=2,
+            page_token="token1",
+        )
+        self.assertEqual(
+            ListCursor.from_dict(cursor.to_dict()),
+            cursor,
+            msg="Incorrect dict round trip",
+        )
+        with TemporaryDirectory() as tmpdir:
+            path = join(tmpdir, "cursor")
+            cursor.save(path)
+            self.assertEqual(
+                ListCursor.load(path),
+                cursor,
+                msg="Incorrect file round trip",
+            )
+
+
+class TestArchivistListCursor(TestArchivistMethods):
+    """
+    Test Archivist list method with cursor
+    """
+
+    maxDiff = None
+
+    def test_list_with_cursor(self):
+        """
+        Test that the cursor advances after each page is consumed
+        """
+        cursor = ListCursor()
+        with mock.patch.object(self.arch.session, "get") as mock_get:
+            mock_get.side_effect = pages()
+            things = self.arch.list(
+                "path/path",
+                "things",
+                page_size=2,
+                params=PARAMS,
+                cursor=cursor,
+            )
+            tokens = []
+            for _ in things:
+                tokens.append(cursor.page_token)
+
+            self.assertEqual(
+                tokens,
+                [None, None, "token1", "token1", "token2"],
+                msg="Incorrect cursor positions",
+            )
+            self.assertTrue(
+                cursor.done,
+                msg="cursor must be done",
+            )
+            self.assertEqual(
+                PARAMS,
+                {"attributes": {"arc_display_type": "door"}},
+                msg="params must not be changed",
+            )
+
+            # listing with a completed cursor returns nothing
+            self.assertEqual(
+                list(self.arch.list("path/path", "things", cursor=cursor)),
+                [],
+                msg="Completed cursor must not list",
+            )
+            self.assertEqual(
+                mock_get.call_count,
+                3,
+                msg="Completed cursor must not request",
+            )
+
+    def test_list_resume_cursor(self):
+        """
+        Test that an interrupted list resumes from the saved cursor
+        """
+        with TemporaryDirectory() as tmpdir:
+            path = join(tmpdir, "cursor")
+            cursor = ListCursor()
+            with mock.patch.object(self.arch.session, "get") as mock_get:
+                mock_get.side_effect = pages()
+                things = self.arch.list(
+                    "path/path",
+                    "things",
+                    page_size=2,
+                    params=PARAMS,
+                    cursor=cursor,
+                )
+                for count, _ in enumerate(things):
+                    cursor.save(path)
+                    if count == 3:
+                        break
+
+            cursor = ListCursor.load(path)
+            with mock.patch.object(self.arch.session, "get") as mock_get:
+                mock_get.side_effect = pages()[1:]
+                things = list(
+                    self.arch.list(
+                        "path/path",
+                        "things",
+                        cursor=cursor,
+                    )
+                )
+                self.assertEqual(
+                    [t["field1"] for t in things],
+                    ["value3", "value4", "value5"],
+                    msg="Incorrect resumed records",
+                )
+                self.assertEqual(
+                    mock_get.call_args_list[0][1]["params"],
+                    {
+                        "attributes.arc_display_type": "door",
+                        "page_size": 2,
+                        "page_token": "token1",
+                    },
+                    msg="Resumed page must keep params and page_size",
+                )
+
+    def test_list_with_wrong_cursor(self):
+        """
+        Test cursor from a different listing
+        """
+        cursor = ListCursor(url="path/other", field="things")
+        with self.assertRaises(ArchivistBadFieldError):
+            list(self.arch.list("path/path", "things", cursor=cursor))
@@ -0,0 +1,376 @@
+"""
+Test downloads
+"""
+
+from hashlib import sha256
+from io import BytesIO
+from os import environ, listdir
+from os.path import getsize, join
+from threading import Lock
+from tempfile import TemporaryDirectory
+from unittest import TestCase, mock
+
+from archivist.archivist import Archivist
+from archivist.download import DownloadOptions, _download
+from archivist.errors import ArchivistError, ArchivistHashMismatchError
+from archivist.logger import set_logger
+
+from .mock_response import MockResponse
+
+# pylint: disable=missing-docstring
+# pylint: disable=protected-access
+
+if "RKVST_LOGLEVEL" in environ and environ["RKVST_LOGLEVEL"]:
+    set_logger(environ["RKVST_LOGLEVEL"])
+
+CONTENT = bytes(range(256)) * 4000
+HASH = sha256(CONTENT).hexdigest()
+BAD_HASH = sha256(b"").hexdigest()
+
+
+def iter_content(chunk_size):
+    return (CONTENT[i : i + chunk_size] for i in range(0, len(CONTENT), chunk_size))
+
+
+class RawResponse(MockResponse):
+    """response whose raw body supports readinto"""
+
+    def __init__(self, headers=None):
+        super().__init__(200, headers=headers)
+        self.raw = mock.Mock(wraps=BytesIO(CONTENT))
+
+
+class RangeServer:
+    """mock session.get that honours Range headers"""
+
+    def __init__(self, *, ranges=True, fail_after=None):
+        self.ranges = ranges
+        self.fail_after = fail_after
+        self.requested = []
+        self.lock = Lock()
+
+    def body(self, first, last, chunk_size):
+        for i in range(first, last + 1, chunk_size):
+            if self.fail_after is not None and i >= self.fail_after:
+                raise ArchivistError("connection reset")
+
+            yield CONTENT[i : min(i + chunk_size, last + 1)]
+
+    def __call__(self, _url, headers=None, **_kwargs):
+        spec = (headers or {}).get("Range")
+        with self.lock:
+            self.requested.append(spec)
+
+        if spec is None or not self.ranges:
+            return MockResponse(
+                200,
+                headers={},
+                iter_content=lambda chunk_size: self.body(
+                    0, len(CONTENT) - 1, chunk_size
+                ),
+            )
+
+        first, _, last = spec[len("bytes=") :].partition("-")
+        first = int(first)
+        last = min(int(last), len(CONTENT) - 1) if last else len(CONTENT) - 1
+        if first >= len(CONTENT):
+            return MockResponse(
+                416, headers={"Content-Range": f"bytes */{len(CONTENT)}"}
+            )
+
+        return MockResponse(
+            206,
+            headers={"Content-Range": f"bytes {first}-{last}/{len(CONTENT)}"},
+            iter_content=lambda chunk_size: self.body(first, last, chunk_size),
+        )
+
+
+class TestDownload(TestCase):
+    """
+    Test download engine
+    """
+
+    def setUp(self):
+        self.directory = TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(self.directory.cleanup)
+        self.path = join(self.directory.name, "firmware.bin")
+
+    def read(self):
+        with open(self.path, "rb") as fd:
+            return fd.read()
+
+    def test_download_fd(self):
+        """
+        Test download to file with large chunks
+        """
+        fd = BytesIO()
+        chunk_sizes = []
+
+        def chunks(chunk_size):
+            chunk_sizes.append(chunk_size)
+            return iter_content(chunk_size)
+
+        _download(
+            MockResponse(200, iter_content=chunks),
+            fd,
+            options=DownloadOptions(chunk_size=65536),
+            hash_value=HASH.upper(),
+        )
+        self.assertEqual(fd.getvalue(), CONTENT, msg="Incorrect content")
+        self.assertEqual(chunk_sizes, [65536], msg="Incorrect chunk size")
+
+    def test_download_fd_mismatch(self):
+        """
+        Test hash mismatch is raised
+        """
+        with self.assertRaises(ArchivistHashMismatchError):
+            _download(
+                MockResponse(200, iter_content=iter_content),
+                BytesIO(),
+                hash_value=BAD_HASH,
+            )
+
+    def test_download_readinto(self):
+        """
+        Test raw body is read into a reusable buffer
+        """
+        response = RawResponse()
+        fd = BytesIO()
+        _download(
+            response, fd, options=DownloadOptions(chunk_size=4096), hash_value=HASH
+        )
+        self.assertEqual(fd.getvalue(), CONTENT, msg="Incorrect content")
+        buffers = {id(args[0].obj) for args, _ in response.raw.readinto.call_args_list}
+        self.assertEqual(len(buffers), 1, msg="buffer must be reused")
+
+    def test_download_encoded(self):
+        """
+        Test encoded body is decoded
+        """
+        response = RawResponse(headers={"Content-Encoding": "gzip"})
+        response._iter_content = iter_content
+        fd = BytesIO()
+        _download(response, fd)
+        self.assertEqual(fd.getvalue(), CONTENT, msg="Incorrect content")
+        response.raw.readinto.assert_not_called()
+
+    def test_download_path(self):
+        """
+        Test download to path
+        """
+        for options in (
+            DownloadOptions(),
+            DownloadOptions(preallocate=True),
+            DownloadOptions(mmap=True, chunk_size=10000),
+        ):
+            for length in (len(CONTENT), None):
+                with self.subTest(options=options, length=length):
+                    headers = {}
+                    if length is not None:
+                        headers["Content-Length"] = str(length)
+
+                    _download(
+                        RawResponse(headers=headers),
+                        self.path,
+                        options=options,
+                        hash_value=HASH,
+                    )
+                    self.assertEqual(self.read(), CONTENT, msg="Incorrect content")
+                    self.assertEqual(
+                        listdir(self.directory.name),
+                        ["firmware.bin"],
+                        msg="temporary file must be renamed",
+                    )
+
+    def test_download_path_mismatch(self):
+        """
+        Test nothing is left behind if the hash does not match
+        """
+        with self.assertRaises(ArchivistHashMismatchError):
+            _download(
+                RawResponse(headers={"Content-Length": str(len(CONTENT))}),
+                self.path,
+                options=DownloadOptions(mmap=True),
+                hash_value=BAD_HASH,
+            )
+
+        self.assertEqual(
+            listdir(self.directory.name), [], msg="no file must be left behind"
+        )
+
+
+class TestRangedDownload(TestCase):
+    """
+    Test downloads with Range requests
+    """
+
+    def setUp(self):
+        self.directory = TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(self.directory.cleanup)
+        self.path = join(self.directory.name, "firmware.bin")
+        self.arch = Archivist("url", "authauthauth")
+        self.addCleanup(self.arch.close)
+
+    def download(self, server, options, hash_value=HASH):
+        with mock.patch.object(self.arch.session, "get", side_effect=server):
+            self.arch.get_file("url", self.path, options=options, hash_value=hash_value)
+
+    def read(self):
+        with open(self.path, "rb") as fd:
+            return fd.read()
+
+    def test_ranges(self):
+        """
+        Test body is fetched as concurrent ranges
+        """
+        server = RangeServer()
+        self.download(server, DownloadOptions(chunk_size=65536, ranges=4))
+        self.assertEqual(self.read(), CONTENT, msg="Incorrect content")
+        self.assertEqual(len(server.requested), 5, msg="first range and 4 ranges")
+        self.assertEqual(
+            server.requested[0], "bytes=0-65535", msg="first range is one chunk"
+        )
+        self.assertEqual(
+            listdir(self.directory.name),
+            ["firmware.bin"],
+            msg="temporary files must be removed",
+        )
+
+    def test_ranges_unsupported(self):
+        """
+        Test server that ignores Range is downloaded as one stream
+        """
+        server = RangeServer(ranges=False)
+        self.download(server, DownloadOptions(chunk_size=65536, ranges=4))
+        self.assertEqual(self.read(), CONTENT, msg="Incorrect content")
+        self.assertEqual(len(server.requested), 1, msg="one request")
+
+    def test_resume(self):
+        """
+        Test an interrupted download resumes from the bytes on disk
+        """
+        options = DownloadOptions(chunk_size=65536, resume=True)
+        with self.assertRaises(ArchivistError):
+            self.download(RangeServer(fail_after=65536 * 9), options)
+
+        part = f"{self.path}.part"
+        self.assertEqual(getsize(part), 65536 * 9, msg="part file must be kept")
+
+        server = RangeServer()
+        self.download(server, options)
+        self.assertEqual(self.read(), CONTENT, msg="Incorrect content")
+        self.assertEqual(server.requested, [f"bytes={65536 * 9}-"])
+
+    def test_resume_ranges(self):
+        """
+        Test interrupted concurrent ranges resume after the complete ranges
+        """
+        options = DownloadOptions(chunk_size=65536, ranges=4, resume=True)
+        with self.assertRaises(ArchivistError):
+            self.download(RangeServer(fail_after=600000), options)
+
+        with open(f"{self.path}.part.offset", encoding="utf-8") as fd:
+            offset = int(fd.read())
+
+        self.assertGreaterEqual(offset, 65536, msg="first range is complete")
+        self.assertLess(offset, 600000, msg="failed range is not complete")
+
+        server = RangeServer()
+        self.download(server, options)
+        self.assertEqual(self.read(), CONTENT, msg="Incorrect content")
+        self.assertEqual(
+            server.requested[0], f"bytes={offset}-{offset + 65535}", msg="resumed"
+        )
+        self.assertEqual(listdir(self.directory.name), ["firmware.bin"])
+
+    def test_resume_complete(self):
+        """
+        Test a complete part file is verified and renamed
+        """
+        with open(f"{self.path}.part", "wb") as fd:
+            fd.write(CONTENT)
+
+        server = RangeServer()
+        self.download(server, DownloadOptions(resume=True))
+        self.assertEqual(self.read(), CONTENT, msg="Incorrect content")
+        self.assertEqual(server.requested, [f"bytes={len(CONTENT)}-"])
+
+    def test_resume_mismatch(self):
+        """
+        Test the part file is discarded if the hash does not match
+        """
+        with open(f"{self.path}.part", "wb") as fd:
+            fd.write(b"x" * 1000)
+
+        with self.assertRaises(ArchivistHashMismatchError):
+            self.download(RangeServer(), DownloadOptions(resume=True))
+
+        self.assertEqual(listdir(self.directory.name), [], msg="part discarded")
+
+    def test_resume_longer(self):
+        """
+        Test a part file longer than the body is downloaded again from the start
+        """
+        with open(f"{self.path}.part", "wb") as fd:
+            fd.write(CONTENT + b"x" * 1000)
+
+        server = RangeServer()
+        self.download(server, DownloadOptions(resume=True))
+        self.assertEqual(self.read(), CONTENT, msg="Incorrect content")
+        self.assertEqual(
+            server.requested, [f"bytes={len(CONTENT) + 1000}-", "bytes=0-"]
+        )
+
+    def test_retry_before_body(self):
+        """
+        Test a 5xx before any byte is written is retried
+        """
+        server = RangeServer()
+        responses = [MockResponse(503, error="unavailable")]
+
+        def get(url, **kwargs):
+            return responses.pop() if responses else server(url, **kwargs)
+
+        with mock.patch("archivist.retry.sleep"):
+            self.download(get, DownloadOptions(ranges=4, chunk_size=65536))
+
+        self.assertEqual(self.read(), CONTENT, msg="Incorrect content")
+        self.assertEqual(len(server.requested), 5, msg="first range and 4 ranges")
+
+
+class TestAttachmentsDownload(TestCase):
+    """
+    Test attachments download
+    """
+
+    def test_attachments_download_path(self):
+        """
+        Test attachment downloaded to path and verified
+        """
+        with TemporaryDirectory() as directory, Archivist(
+            "url", "authauthauth"
+        ) as arch, mock.patch.object(arch.session, "get") as mock_get:
+            path = join(directory, "attachment.bin")
+            mock_get.return_value = MockResponse(200, iter_content=iter_content)
+            arch.attachments.download("blobs/xxxxxxxx", path, hash_value=HASH)
+            with open(path, "rb") as fd:
+                self.assertEqual(fd.read(), CONTENT, msg="Incorrect content")
+
+            with self.assertRaises(ArchivistHashMismatchError):
+                arch.sboms.download("sboms/xxxxxxxx", BytesIO(), hash_value=BAD_HASH)
+
+    def test_attachments_download_retry(self):
+        """
+        Test a 5xx is retried when downloading to a file
+        """
+        with Archivist("url", "authauthauth") as arch, mock.patch.object(
+            arch.session, "get"
+        ) as mock_get, mock.patch("archivist.retry.sleep"):
+            mock_get.side_effect = [
+                MockResponse(500, error="internal"),
+                MockResponse(200, iter_content=iter_content),
+            ]
+            fd = BytesIO()
+            arch.attachments.download("blobs/xxxxxxxx", fd, hash_value=HASH)
+            self.assertEqual(fd.getvalue(), CONTENT, msg="Incorrect content")
+            self.assertEqual(mock_get.call_count, 2, msg="one retry")
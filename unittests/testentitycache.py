@@ -0,0 +1,280 @@
+"""
+Test entity cache
+"""
+
+from copy import copy
+from os import environ
+from unittest import TestCase, mock
+
+from archivist.archivist import Archivist
+from archivist.asyncarchivist import AsyncArchivist
+from archivist.constants import CONFIRMATION_STATUS
+from archivist.entitycache import EntityCache, _kind
+from archivist.logger import set_logger
+
+from .mock_response import MockResponse
+
+# pylint: disable=missing-docstring
+# pylint: disable=protected-access
+
+if "RKVST_LOGLEVEL" in environ and environ["RKVST_LOGLEVEL"]:
+    set_logger(environ["RKVST_LOGLEVEL"])
+
+UUID = "add30235-1424-4fda-840a-d5ef82c4c96f"
+EVENT_UUID = "0d5a0f68-3b5e-4a2a-8e44-4a2d4a1b3c2e"
+ROOT = "https://app.rkvst.io/archivist"
+ASSET_URL = f"{ROOT}/v2/assets/{UUID}"
+EVENT_URL = f"{ASSET_URL}/events/{EVENT_UUID}"
+LOCATION_URL = f"{ROOT}/v2/locations/{UUID}"
+
+
+class TestEntityCache(TestCase):
+    """
+    Test EntityCache
+    """
+
+    def setUp(self):
+        self.now = 1000.0
+        patch = mock.patch("archivist.entitycache.monotonic", lambda: self.now)
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def test_entitycache_kind(self):
+        """
+        Test kind of entity from url
+        """
+        for url, kind in (
+            (ASSET_URL, "assets"),
+            (EVENT_URL, "events"),
+            (f"{ROOT}/iam/v1/subjects/{UUID}", "subjects"),
+            (LOCATION_URL, "locations"),
+            (f"{ROOT}/v1/compliance_policies/{UUID}", "compliance_policies"),
+            (f"{ROOT}/v1/compliance/assets/{UUID}", None),
+            (f"{ROOT}/v2/locations/{UUID}/events/{EVENT_UUID}", None),
+            (f"{ROOT}/v1/sboms/{UUID}", None),
+            (f"{ASSET_URL}:publicurl", None),
+            (f"{ROOT}/v2/assets", None),
+            (f"{ROOT}/v2/assets/-/events", None),
+        ):
+            self.assertEqual(
+                _kind(url),
+                kind,
+                msg=f"Incorrect kind of {url}",
+            )
+
+    def test_entitycache_ttl(self):
+        """
+        Test entities expire after the time to live of their kind
+        """
+        cache = EntityCache(ttls={"assets": 10.0})
+        cache.put(ASSET_URL, {"identity": "asset"})
+        cache.put(LOCATION_URL, {"identity": "location"})
+        self.now += 11
+        self.assertIsNone(
+            cache.get(ASSET_URL),
+            msg="asset must have expired",
+        )
+        self.assertEqual(
+            cache.get(LOCATION_URL),
+            {"identity": "location"},
+            msg="location must not have expired",
+        )
+        self.assertEqual(
+            cache.stats(),
+            {
+                "assets": {"hits": 0, "misses": 1, "evictions": 0},
+                "locations": {"hits": 1, "misses": 0, "evictions": 0},
+            },
+            msg="Incorrect stats",
+        )
+
+    def test_entitycache_lru(self):
+        """
+        Test least recently used entity is evicted
+        """
+        cache = EntityCache(maxsize=2)
+        urls = [f"{ROOT}/v2/locations/{n:032x}" for n in range(3)]
+        cache.put(urls[0], {"n": 0})
+        cache.put(urls[1], {"n": 1})
+        cache.get(urls[0])
+        cache.put(urls[2], {"n": 2})
+        self.assertEqual(
+            [cache.get(url) for url in urls],
+            [{"n": 0}, None, {"n": 2}],
+            msg="least recently used must be evicted",
+        )
+        self.assertEqual(
+            cache.stats()["locations"]["evictions"],
+            1,
+            msg="Incorrect evictions",
+        )
+
+    def test_entitycache_events(self):
+        """
+        Test only confirmed events are cached - forever
+        """
+        cache = EntityCache()
+        cache.put(EVENT_URL, {CONFIRMATION_STATUS: "PENDING"})
+        self.assertIsNone(
+            cache.get(EVENT_URL),
+            msg="pending event must not be cached",
+        )
+        cache.put(EVENT_URL, {CONFIRMATION_STATUS: "CONFIRMED"})
+        self.now += 1e9
+        self.assertEqual(
+            cache.get(EVENT_URL),
+            {CONFIRMATION_STATUS: "CONFIRMED"},
+            msg="confirmed event must be cached",
+        )
+
+    def test_entitycache_unconfirmed(self):
+        """
+        Test entities that are not confirmed are not cached
+        """
+        cache = EntityCache()
+        cache.put(ASSET_URL, {CONFIRMATION_STATUS: "PENDING"})
+        self.assertIsNone(
+            cache.get(ASSET_URL),
+            msg="pending asset must not be cached",
+        )
+        cache.put(ASSET_URL, {CONFIRMATION_STATUS: "CONFIRMED"})
+        self.assertEqual(
+            cache.get(ASSET_URL),
+            {CONFIRMATION_STATUS: "CONFIRMED"},
+            msg="confirmed asset must be cached",
+        )
+
+    def test_entitycache_invalidate(self):
+        """
+        Test invalidating a child invalidates its parents
+        """
+        cache = EntityCache()
+        cache.put(ASSET_URL, {"identity": "asset"})
+        generation = cache.generation
+        cache.invalidate(f"{ASSET_URL}/events?x=y")
+        self.assertIsNone(
+            cache.get(ASSET_URL),
+            msg="asset must be invalidated",
+        )
+        cache.put(ASSET_URL, {"identity": "stale"}, generation=generation)
+        self.assertIsNone(
+            cache.get(ASSET_URL),
+            msg="entity read before invalidation must not be cached",
+        )
+
+    def test_entitycache_copies(self):
+        """
+        Test cached entities are not shared with callers
+        """
+        cache = EntityCache()
+        entity = {"attributes": {"a": 1}}
+        cache.put(ASSET_URL, entity)
+        entity["attributes"]["a"] = 2
+        cache.get(ASSET_URL)["attributes"]["a"] = 3
+        self.assertEqual(
+            cache.get(ASSET_URL),
+            {"attributes": {"a": 1}},
+            msg="cached entity must not be modified",
+        )
+
+
+class TestArchivistEntityCache(TestCase):
+    """
+    Test entity cache in Archivist
+    """
+
+    def setUp(self):
+        self.cache = EntityCache()
+        self.arch = Archivist(
+            "https://app.rkvst.io", "authauthauth", entity_cache=self.cache
+        )
+
+    def tearDown(self):
+        self.arch.close()
+
+    def test_archivist_entitycache_read(self):
+        """
+        Test reads are cached and shared with copies
+        """
+        with mock.patch.object(self.arch.session, "get") as mock_get:
+            mock_get.return_value = MockResponse(200, identity=f"assets/{UUID}")
+            self.arch.assets.read(f"assets/{UUID}")
+            copy(self.arch).assets.read(f"assets/{UUID}")
+            self.assertEqual(
+                mock_get.call_count,
+                1,
+                msg="read must be cached",
+            )
+
+        self.assertEqual(
+            self.cache.stats(),
+            {"assets": {"hits": 1, "misses": 1, "evictions": 0}},
+            msg="Incorrect stats",
+        )
+
+    def test_async_archivist_entitycache(self):
+        """
+        Test the async client reads through the entity cache
+        """
+        arch = AsyncArchivist(
+            "https://app.rkvst.io", "authauthauth", entity_cache=self.cache
+        )
+        self.addCleanup(arch.archivist.close)
+        self.assertIs(
+            arch.archivist.entity_cache,
+            self.cache,
+            msg="entity cache must be passed to the wrapped Archivist",
+        )
+
+    def test_archivist_entitycache_confirmation(self):
+        """
+        Test waiting for confirmation is not answered from the cache
+        """
+        with mock.patch.object(self.arch.session, "get") as mock_get, mock.patch(
+            "archivist.poller.sleep"
+        ):
+            mock_get.side_effect = [
+                MockResponse(
+                    200, identity=f"assets/{UUID}", **{CONFIRMATION_STATUS: status}
+                )
+                for status in ("PENDING", "PENDING", "CONFIRMED")
+            ]
+            asset = self.arch.assets.wait_for_confirmation(f"assets/{UUID}")
+            self.assertEqual(
+                asset[CONFIRMATION_STATUS],
+                "CONFIRMED",
+                msg="pending asset must not be cached",
+            )
+            self.arch.assets.read(f"assets/{UUID}")
+            self.assertEqual(
+                mock_get.call_count,
+                3,
+                msg="confirmed asset must be cached",
+            )
+
+    def test_archivist_entitycache_invalidate(self):
+        """
+        Test writes invalidate the entity
+        """
+        with mock.patch.object(self.arch.session, "get") as mock_get, mock.patch.object(
+            self.arch.session, "post"
+        ) as mock_post, mock.patch.object(self.arch.session, "delete") as mock_delete:
+            mock_get.return_value = MockResponse(200, identity=f"assets/{UUID}")
+            mock_post.return_value = MockResponse(200, identity=f"assets/{UUID}/events")
+            mock_delete.return_value = MockResponse(200)
+
+            self.arch.assets.read(f"assets/{UUID}")
+            self.arch.events.create(
+                f"assets/{UUID}",
+                {"operation": "Record", "behaviour": "RecordEvidence"},
+                {"arc_description": "description"},
+                confirm=False,
+            )
+            self.arch.assets.read(f"assets/{UUID}")
+            self.arch.delete(ASSET_URL)
+            self.arch.assets.read(f"assets/{UUID}")
+            self.assertEqual(
+                mock_get.call_count,
+                3,
+                msg="writes must invalidate",
+            )
@@ -2,6 +2,7 @@
 Test events create
 """
 
+from threading import Barrier
 from unittest import mock
 
 from archivist.constants import (
@@ -104,6 +105,39 @@ class TestEventsCreate(TestEventsBase):
                 msg="CREATE method called incorrectly",
             )
 
+    def test_events_create_with_concurrent_attachments(self):
+        """
+        Test attachments are uploaded concurrently with deterministic keys
+        """
+        barrier = Barrier(2, timeout=5)
+
+        def create(attachment):
+            # both uploads must be in flight at the same time
+            barrier.wait()
+            return {**ATTACHMENTS, "arc_file_name": attachment["filename"]}
+
+        with mock.patch.object(
+            self.arch.session, "post"
+        ) as mock_post, mock.patch.object(
+            self.arch.attachments, "create"
+        ) as mock_attachments_create:
+            mock_post.return_value = MockResponse(200, **RESPONSE_WITH_ATTACHMENTS)
+            mock_attachments_create.side_effect = create
+
+            self.arch.events.create_from_data(
+                ASSET_ID, EVENT_ATTRS_ATTACHMENTS, confirm=False
+            )
+            _, kwargs = mock_post.call_args
+            attrs = kwargs["json"]["event_attributes"]
+            self.assertEqual(
+                (
+                    attrs["door open"]["arc_file_name"],
+                    attrs["door_closed_png"]["arc_file_name"],
+                ),
+                ("door_open.png", "door_closed.png"),
+                msg="attachment keys must match their uploads",
+            )
+
     def test_events_create_with_upload_attachments(self):
         """
         Test event creation
@@ -0,0 +1,169 @@
+"""
+Test event ingestion pipeline
+"""
+
+from os import environ
+from queue import Full
+from random import random
+from threading import Event, Lock
+from time import sleep
+from unittest import TestCase, mock
+
+from archivist.errors import ArchivistBadRequestError, ArchivistInvalidOperationError
+from archivist.ingest import EventPipeline
+from archivist.logger import set_logger
+
+from .mock_response import MockResponse
+from .testeventsconstants import (
+    TestEventsBase,
+    ASSET_ID,
+    REQUEST,
+    RESPONSE,
+)
+
+# pylint: disable=missing-docstring
+# pylint: disable=too-few-public-methods
+
+if "RKVST_LOGLEVEL" in environ and environ["RKVST_LOGLEVEL"]:
+    set_logger(environ["RKVST_LOGLEVEL"])
+
+
+class Events:
+    """records the order events are created"""
+
+    def __init__(self, gate=None):
+        self.created = []
+        self.lock = Lock()
+        self.gate = gate
+
+    def create_from_data(self, asset_id, data, *, confirm=True):
+        if self.gate is not None:
+            self.gate.wait()
+
+        if data.get("fail"):
+            raise ArchivistBadRequestError("bad request")
+
+        sleep(random() / 1000)
+        with self.lock:
+            self.created.append((asset_id, data["n"], confirm))
+
+        return {"identity": f"{asset_id}/events/{data['n']}"}
+
+
+class TestEventPipeline(TestCase):
+    """
+    Test EventPipeline
+    """
+
+    def test_pipeline_order(self):
+        """
+        Test events of each asset are posted in order
+        """
+        events = Events()
+        with EventPipeline(events, workers=4, maxsize=8) as pipeline:
+            futures = [pipeline.put(f"assets/{n % 5}", {"n": n}) for n in range(100)]
+            self.assertTrue(pipeline.flush(timeout=10), msg="flush must complete")
+
+        self.assertEqual(
+            futures[7].result(),
+            {"identity": "assets/2/events/7"},
+            msg="future must resolve to the event",
+        )
+        for asset in range(5):
+            self.assertEqual(
+                [n for a, n, _ in events.created if a == f"assets/{asset}"],
+                list(range(asset, 100, 5)),
+                msg="events of an asset must be posted in order",
+            )
+
+        self.assertFalse(
+            any(confirm for _, _, confirm in events.created),
+            msg="events must not be waited for confirmation",
+        )
+        metrics = pipeline.metrics()
+        self.assertEqual(
+            (metrics.queued, metrics.inflight, metrics.posted, metrics.failed),
+            (0, 0, 100, 0),
+            msg="Incorrect metrics",
+        )
+        self.assertEqual(
+            list(metrics.latency),
+            ["p50", "p90", "p99"],
+            msg="latency must be reported",
+        )
+
+    def test_pipeline_failed(self):
+        """
+        Test a failed event does not stop the pipeline
+        """
+        with EventPipeline(Events(), workers=2) as pipeline:
+            failed = pipeline.put(ASSET_ID, {"n": 0, "fail": True})
+            posted = pipeline.put(ASSET_ID, {"n": 1})
+            pipeline.flush()
+
+        self.assertIsInstance(
+            failed.exception(),
+            ArchivistBadRequestError,
+            msg="failure must be reported",
+        )
+        self.assertEqual(
+            posted.result(),
+            {"identity": f"{ASSET_ID}/events/1"},
+            msg="later events must be posted",
+        )
+        self.assertEqual(
+            (pipeline.metrics().posted, pipeline.metrics().failed),
+            (1, 1),
+            msg="Incorrect metrics",
+        )
+
+    def test_pipeline_backpressure(self):
+        """
+        Test put blocks when the pipeline is full
+        """
+        gate = Event()
+        with EventPipeline(Events(gate), workers=2, maxsize=3) as pipeline:
+            for i in range(3):
+                pipeline.put(f"assets/{i}", {"n": i})
+
+            with self.assertRaises(Full):
+                pipeline.put("assets/3", {"n": 3}, timeout=0.01)
+
+            metrics = pipeline.metrics()
+            self.assertEqual(
+                metrics.queued + metrics.inflight,
+                3,
+                msg="Incorrect metrics",
+            )
+            gate.set()
+
+        self.assertEqual(pipeline.metrics().posted, 3, msg="close must post all")
+        with self.assertRaises(ArchivistInvalidOperationError):
+            pipeline.put(ASSET_ID, {"n": 4})
+
+
+class TestEventsPipeline(TestEventsBase):
+    """
+    Test Archivist Events pipeline
+    """
+
+    def test_events_pipeline(self):
+        """
+        Test events pipeline
+        """
+        with mock.patch.object(self.arch.session, "post") as mock_post:
+            mock_post.return_value = MockResponse(200, **RESPONSE)
+            with self.arch.events.pipeline(workers=2) as pipeline:
+                future = pipeline.put(ASSET_ID, REQUEST)
+
+            self.assertEqual(
+                future.result(),
+                RESPONSE,
+                msg="Incorrect event",
+            )
+            args, kwargs = mock_post.call_args
+            self.assertEqual(
+                (args[0], kwargs["json"]),
+                (f"url/archivist/v2/{ASSET_ID}/events", REQUEST),
+                msg="Incorrect request",
+            )
@@ -0,0 +1,248 @@
+"""
+Test instrumentation hooks and metrics collector
+"""
+
+from copy import copy
+from io import BytesIO
+from os import environ
+from unittest import TestCase, mock
+
+from requests.exceptions import ConnectionError as RequestsConnectionError
+from requests.models import Response
+
+from archivist.archivist import Archivist
+from archivist.constants import HEADERS_CONTENT_LENGTH
+from archivist.hooks import Hooks
+from archivist.logger import set_logger
+from archivist.metrics import MetricsCollector, endpoint_template
+from archivist.retry import RetryPolicy
+
+from .mock_response import MockResponse
+
+# pylint: disable=missing-docstring
+# pylint: disable=protected-access
+
+if "RKVST_LOGLEVEL" in environ and environ["RKVST_LOGLEVEL"]:
+    set_logger(environ["RKVST_LOGLEVEL"])
+
+UUID = "add30235-1424-4fda-840a-d5ef82c4c96f"
+URL = f"https://app.rkvst.io/archivist/v2/assets/{UUID}/events"
+TEMPLATE = "archivist/v2/assets/{id}/events"
+
+
+class BrokenHooks(Hooks):
+    def on_request(self, method, url):
+        raise ValueError("broken")
+
+
+class TestEndpointTemplate(TestCase):
+    """
+    Test endpoint templates
+    """
+
+    def test_endpoint_template(self):
+        """
+        Test identities are replaced
+        """
+        for url, template in (
+            (URL, TEMPLATE),
+            (f"{URL}/{UUID}?page_size=2", f"{TEMPLATE}/{{id}}"),
+            ("https://app.rkvst.io/archivist/v2/assets/-/events", TEMPLATE),
+            (
+                "https://app.rkvst.io/archivist/v1/blobs/0123456789abcdef0",
+                "archivist/v1/blobs/{id}",
+            ),
+            ("https://app.rkvst.io/archivist/v2/assets", "archivist/v2/assets"),
+        ):
+            self.assertEqual(
+                endpoint_template(url),
+                template,
+                msg=f"Incorrect template for {url}",
+            )
+
+
+class TestMetricsCollector(TestCase):
+    """
+    Test MetricsCollector as Archivist hooks
+    """
+
+    maxDiff = None
+
+    def setUp(self):
+        self.metrics = MetricsCollector()
+        self.arch = Archivist(
+            "https://app.rkvst.io",
+            "authauthauth",
+            retry=RetryPolicy(base=0.001, cap=0.01),
+            hooks=[self.metrics],
+        )
+
+    def tearDown(self):
+        self.arch.close()
+
+    def test_metrics_snapshot(self):
+        """
+        Test metrics of responses, retries and errors
+        """
+        with mock.patch.object(self.arch.session, "get") as mock_get:
+            mock_get.side_effect = (
+                MockResponse(503),
+                MockResponse(200, headers={HEADERS_CONTENT_LENGTH: "100"}),
+                RequestsConnectionError("reset"),
+                RequestsConnectionError("reset"),
+                RequestsConnectionError("reset"),
+                RequestsConnectionError("reset"),
+            )
+            self.arch.get(URL)
+            with self.assertRaises(RequestsConnectionError):
+                self.arch.get(URL)
+
+        snapshot = self.metrics.snapshot()
+        endpoint = snapshot["endpoints"][f"GET {TEMPLATE}"]
+        self.assertEqual(
+            endpoint["count"],
+            6,
+            msg="Incorrect count",
+        )
+        self.assertEqual(
+            sum(endpoint["latency"]["buckets"].values()),
+            6,
+            msg="Incorrect histogram",
+        )
+        self.assertEqual(
+            endpoint["status"],
+            {"503": 1, "200": 1},
+            msg="Incorrect status",
+        )
+        self.assertEqual(
+            endpoint["errors"],
+            {"ConnectionError": 4},
+            msg="Incorrect errors",
+        )
+        self.assertEqual(
+            endpoint["bytes_in"],
+            100,
+            msg="Incorrect bytes in",
+        )
+        self.assertEqual(
+            endpoint["retries"],
+            {"5xx": 1, "connection": 3},
+            msg="retries must be counted per endpoint",
+        )
+        self.assertEqual(
+            snapshot["retries"],
+            {"5xx": 1, "connection": 3},
+            msg="Incorrect retries",
+        )
+
+        self.metrics.reset()
+        self.assertEqual(
+            self.metrics.snapshot(),
+            {"endpoints": {}, "retries": {}},
+            msg="metrics must be reset",
+        )
+
+    def test_metrics_prometheus(self):
+        """
+        Test prometheus text format
+        """
+        with mock.patch.object(self.arch.session, "get") as mock_get:
+            mock_get.return_value = MockResponse(200)
+            for _ in range(3):
+                self.arch.get(URL)
+
+        text = self.metrics.prometheus()
+        labels = f'method="GET",endpoint="{TEMPLATE}"'
+        for line in (
+            "# TYPE archivist_request_duration_seconds histogram",
+            f'archivist_request_duration_seconds_bucket{{{labels},le="+Inf"}} 3',
+            f"archivist_request_duration_seconds_count{{{labels}}} 3",
+            f'archivist_responses_total{{{labels},status="200"}} 3',
+            "# TYPE archivist_retries_total counter",
+        ):
+            self.assertIn(
+                line,
+                text.splitlines(),
+                msg=f"Missing {line}",
+            )
+
+    def test_metrics_shared(self):
+        """
+        Test hooks are shared with copies
+        """
+        self.assertEqual(
+            copy(self.arch).hooks,
+            self.arch.hooks,
+            msg="Incorrect copied hooks",
+        )
+        self.assertEqual(
+            self.arch.Public.hooks,
+            self.arch.hooks,
+            msg="Incorrect public hooks",
+        )
+
+    def test_broken_hook(self):
+        """
+        Test a failing hook does not fail the request
+        """
+        with Archivist(
+            "https://app.rkvst.io",
+            "authauthauth",
+            hooks=[BrokenHooks(), self.metrics],
+        ) as arch:
+            with mock.patch.object(arch.session, "get") as mock_get, self.assertLogs(
+                "archivist.hooks", level="ERROR"
+            ):
+                mock_get.return_value = MockResponse(200)
+                arch.get(URL)
+
+        self.assertEqual(
+            self.metrics.snapshot()["endpoints"][f"GET {TEMPLATE}"]["count"],
+            1,
+            msg="later hooks must be called",
+        )
+
+    def test_metrics_retry_hook(self):
+        """
+        Test the retry hook is given the method and url of the request
+        """
+        hooks = mock.Mock(spec=Hooks)
+        with Archivist(
+            "https://app.rkvst.io",
+            "authauthauth",
+            retry=RetryPolicy(base=0.001, cap=0.01),
+            hooks=[hooks],
+        ) as arch:
+            with mock.patch.object(arch.session, "get") as mock_get:
+                mock_get.side_effect = (MockResponse(503), MockResponse(200))
+                arch.get(URL)
+
+        method, url, attempt, reason, _ = hooks.on_retry.call_args[0]
+        self.assertEqual(
+            (method, url, attempt, reason),
+            ("get", URL, 1, "5xx"),
+            msg="Incorrect retry hook arguments",
+        )
+
+    def test_metrics_bytes_in_chunked(self):
+        """
+        Test bytes in of responses without a content length
+        """
+        streamed = Response()
+        streamed.status_code = 200
+        streamed.raw = BytesIO(b"x" * 1000)
+        read = Response()
+        read.status_code = 200
+        read._content = b"y" * 10
+        self.metrics.on_response("get", URL, read, 0.1)
+        self.metrics.on_response("get", URL, streamed, 0.1)
+        self.assertEqual(
+            b"".join(streamed.iter_content(chunk_size=300)),
+            b"x" * 1000,
+            msg="Incorrect content",
+        )
+        self.assertEqual(
+            self.metrics.snapshot()["endpoints"][f"GET {TEMPLATE}"]["bytes_in"],
+            1010,
+            msg="bytes of a streamed body must be counted as it is read",
+        )
@@ -0,0 +1,169 @@
+"""
+Test streaming downloads
+"""
+
+from os import environ
+from tempfile import TemporaryFile
+from unittest import TestCase, mock
+
+from archivist.archivist import Archivist
+from archivist.constants import HEADERS_RETRY_AFTER
+from archivist.errors import ArchivistError
+from archivist.logger import set_logger
+from archivist.utils import open_url
+
+from .mock_response import MockResponse
+
+# pylint: disable=missing-docstring
+# pylint: disable=protected-access
+
+if "RKVST_LOGLEVEL" in environ and environ["RKVST_LOGLEVEL"]:
+    set_logger(environ["RKVST_LOGLEVEL"])
+
+CONTENT = bytes(range(256)) * 1000
+
+
+class Download(MockResponse):
+    def __init__(self, content, headers):
+        super().__init__(
+            200,
+            headers=headers,
+            iter_content=lambda chunk_size: (
+                content[i : i + chunk_size] for i in range(0, len(content), chunk_size)
+            ),
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+
+def download(content=CONTENT, length=len(CONTENT), encoding=None):
+    headers = {}
+    if length is not None:
+        headers["Content-Length"] = str(length)
+
+    if encoding is not None:
+        headers["Content-Encoding"] = encoding
+
+    return mock.patch(
+        "archivist.utils.requests_get", return_value=Download(content, headers)
+    )
+
+
+class TestOpenURL(TestCase):
+    """
+    Test open_url
+    """
+
+    def read(self, fd):
+        data = b""
+        while fd.len:
+            data += fd.read(333)
+
+        return data
+
+    def test_open_url_stream(self):
+        """
+        Test object of known length is piped
+        """
+        with download(), mock.patch("archivist.utils.SpooledTemporaryFile") as spool:
+            with open_url("https://example.com/firmware") as fd:
+                self.assertEqual(fd.len, len(CONTENT), msg="Incorrect length")
+                self.assertEqual(self.read(fd), CONTENT, msg="Incorrect content")
+
+            spool.assert_not_called()
+
+    def test_open_url_spool(self):
+        """
+        Test object of unknown length is spooled
+        """
+        for length, encoding in ((None, None), (len(CONTENT) // 2, "gzip")):
+            with self.subTest(length=length, encoding=encoding):
+                with download(length=length, encoding=encoding):
+                    with open_url("https://example.com/firmware") as fd:
+                        self.assertEqual(fd.len, len(CONTENT), msg="Incorrect length")
+                        self.assertEqual(fd.read(), CONTENT, msg="Incorrect content")
+
+    def test_open_url_truncated(self):
+        """
+        Test download shorter than its content length
+        """
+        with download(length=len(CONTENT) + 1):
+            with open_url("https://example.com/firmware") as fd:
+                with self.assertRaises(ArchivistError):
+                    self.read(fd)
+
+    def test_open_url_abandoned(self):
+        """
+        Test reader stops before the end of the download
+        """
+        with download():
+            with open_url("https://example.com/firmware") as fd:
+                self.assertEqual(fd.read(10), CONTENT[:10], msg="Incorrect content")
+
+
+class TestAttachmentsURL(TestCase):
+    """
+    Test attachment uploaded whilst downloaded
+    """
+
+    def test_attachments_create_url(self):
+        """
+        Test attachment from url
+        """
+        uploaded = []
+
+        def post(_url, data=None, **_kwargs):
+            self.assertEqual(data.len, data._calculate_length(), msg="Bad length")
+            uploaded.append(data.read())
+            return MockResponse(
+                200, identity="blobs/xxxxxxxx", hash={"alg": "SHA256", "value": "v"}
+            )
+
+        with Archivist("url", "authauthauth") as arch, download(), mock.patch.object(
+            arch.session, "post"
+        ) as mock_post:
+            mock_post.side_effect = post
+            result = arch.attachments.create(
+                {"url": "https://example.com/firmware", "content_type": "image/jpg"}
+            )
+
+        self.assertEqual(
+            result["arc_blob_identity"], "blobs/xxxxxxxx", msg="Incorrect result"
+        )
+        self.assertIn(CONTENT, uploaded[0], msg="content must be uploaded")
+
+    def test_post_file_retry(self):
+        """
+        Test a retried upload of a stream raises and of a file is repeated
+        """
+        uploaded = []
+
+        def post(_url, data=None, **_kwargs):
+            uploaded.append(data.read())
+            if len(uploaded) == 1:
+                return MockResponse(429, headers={HEADERS_RETRY_AFTER: "0.01"})
+
+            return MockResponse(200, identity="blobs/xxxxxxxx")
+
+        with Archivist("url", "authauthauth") as arch, mock.patch.object(
+            arch.session, "post", side_effect=post
+        ), mock.patch("archivist.retry.sleep"):
+            with download(), open_url("https://example.com/firmware") as fd:
+                with self.assertRaises(ArchivistError):
+                    arch.post_file("v1/blobs", fd, "image/jpg")
+
+            self.assertIn(CONTENT, uploaded[0], msg="content must be uploaded")
+
+            uploaded.clear()
+            with TemporaryFile() as fd:
+                fd.write(b"prefix" + CONTENT)
+                fd.seek(len(b"prefix"))
+                arch.post_file("v1/blobs", fd, "image/jpg")
+
+        self.assertEqual(len(uploaded), 2, msg="upload must be retried")
+        self.assertIn(CONTENT, uploaded[1], msg="content must be uploaded again")
+        self.assertNotIn(b"prefix", uploaded[1], msg="from the original position")
@@ -0,0 +1,221 @@
+"""
+Test list partitions
+"""
+
+from datetime import datetime, timezone
+from os import environ
+from unittest import TestCase, mock
+
+from archivist.cursor import ListCursor
+from archivist.errors import ArchivistBadFieldError, ArchivistBadRequestError
+from archivist.logger import set_logger
+from archivist.partition import TimePartition, ValuePartition
+
+from .mock_response import MockResponse
+from .testarchivist import TestArchivistMethods
+
+# pylint: disable=missing-docstring
+# pylint: disable=protected-access
+# pylint: disable=unused-argument
+
+if "RKVST_LOGLEVEL" in environ and environ["RKVST_LOGLEVEL"]:
+    set_logger(environ["RKVST_LOGLEVEL"])
+
+SINCE = "timestamp_accepted_since"
+BEFORE = "timestamp_accepted_before"
+
+PARTITION = TimePartition(
+    since="2023-01-01T00:00:00Z",
+    before=datetime(2023, 1, 2, tzinfo=timezone.utc),
+    count=4,
+)
+
+
+def windowed(url, *, params, **kwargs):
+    """two pages of two events in each window"""
+    since = params[SINCE]
+    if "page_token" not in params:
+        return MockResponse(
+            200,
+            events=[
+                {"identity": f"{since}/0", "timestamp_accepted": f"{since}/0"},
+                {"identity": f"{since}/1", "timestamp_accepted": f"{since}/1"},
+            ],
+            next_page_token="token",
+        )
+
+    return MockResponse(
+        200,
+        events=[
+            {"identity": f"{since}/2", "timestamp_accepted": f"{since}/2"},
+            {"identity": f"{since}/3", "timestamp_accepted": f"{since}/3"},
+        ],
+    )
+
+
+class TestPartitionFilters(TestCase):
+    """
+    Test partition filters
+    """
+
+    maxDiff = None
+
+    def test_time_partition(self):
+        """
+        Test time windows
+        """
+        self.assertEqual(
+            PARTITION.filters(),
+            [
+                {SINCE: "2023-01-01T00:00:00Z", BEFORE: "2023-01-01T06:00:00Z"},
+                {SINCE: "2023-01-01T06:00:00Z", BEFORE: "2023-01-01T12:00:00Z"},
+                {SINCE: "2023-01-01T12:00:00Z", BEFORE: "2023-01-01T18:00:00Z"},
+                {SINCE: "2023-01-01T18:00:00Z", BEFORE: "2023-01-02T00:00:00Z"},
+            ],
+            msg="Incorrect windows",
+        )
+
+    def test_time_partition_uneven(self):
+        """
+        Test time windows that do not divide evenly
+        """
+        filters = TimePartition(
+            since="2023-01-01T00:00:00Z",
+            before="2023-01-01T00:00:02Z",
+            count=4,
+            key="timestamp_declared",
+        ).filters()
+        self.assertEqual(
+            filters,
+            [
+                {
+                    "timestamp_declared_since": "2023-01-01T00:00:00Z",
+                    "timestamp_declared_before": "2023-01-01T00:00:01Z",
+                },
+                {
+                    "timestamp_declared_since": "2023-01-01T00:00:01Z",
+                    "timestamp_declared_before": "2023-01-01T00:00:02Z",
+                },
+            ],
+            msg="Incorrect windows",
+        )
+
+    def test_value_partition(self):
+        """
+        Test value filters
+        """
+        self.assertEqual(
+            ValuePartition("attributes.arc_display_type", ("door", "window")).filters(),
+            [
+                {"attributes.arc_display_type": "door"},
+                {"attributes.arc_display_type": "window"},
+            ],
+            msg="Incorrect filters",
+        )
+
+
+class TestArchivistListPartition(TestArchivistMethods):
+    """
+    Test Archivist list method with partition
+    """
+
+    maxDiff = None
+
+    def test_list_partition(self):
+        """
+        Test unordered partitioned list
+        """
+        with mock.patch.object(self.arch.session, "get") as mock_get:
+            mock_get.side_effect = windowed
+            events = list(
+                self.arch.events.list(
+                    page_size=2, attrs={"arc_display_type": "open"}, partition=PARTITION
+                )
+            )
+            self.assertEqual(
+                sorted(e["identity"] for e in events),
+                sorted(
+                    f"{f[SINCE]}/{i}" for f in PARTITION.filters() for i in range(4)
+                ),
+                msg="Incorrect events",
+            )
+            self.assertEqual(
+                mock_get.call_count,
+                8,
+                msg="Incorrect number of requests",
+            )
+            for a in mock_get.call_args_list:
+                params = a[1]["params"]
+                self.assertEqual(
+                    params["event_attributes.arc_display_type"],
+                    "open",
+                    msg="Selector must be kept",
+                )
+                self.assertEqual(
+                    params["page_size"],
+                    2,
+                    msg="page_size must be kept",
+                )
+
+    def test_list_partition_ordered(self):
+        """
+        Test ordered partitioned list
+        """
+        partition = TimePartition(
+            since=PARTITION.since,
+            before=PARTITION.before,
+            count=4,
+            ordered=True,
+        )
+        with mock.patch.object(self.arch.session, "get") as mock_get:
+            mock_get.side_effect = windowed
+            events = [
+                e["timestamp_accepted"]
+                for e in self.arch.events.list(page_size=2, partition=partition)
+            ]
+            self.assertEqual(
+                len(events),
+                16,
+                msg="Incorrect number of events",
+            )
+            self.assertEqual(
+                events,
+                sorted(events),
+                msg="Events must be ordered",
+            )
+
+    def test_list_partition_ordered_no_order_by(self):
+        """
+        Test ordered value partition needs order_by
+        """
+        with self.assertRaises(ArchivistBadFieldError):
+            list(
+                self.arch.assets.list(
+                    partition=ValuePartition(
+                        "attributes.arc_display_type", ("door",), ordered=True
+                    )
+                )
+            )
+
+    def test_list_partition_with_cursor(self):
+        """
+        Test partition cannot be used with cursor
+        """
+        with self.assertRaises(ArchivistBadFieldError):
+            list(self.arch.events.list(partition=PARTITION, cursor=ListCursor()))
+
+    def test_list_partition_with_error(self):
+        """
+        Test error in one partition
+        """
+
+        def failing(url, *, params, **kwargs):
+            if params[SINCE] == "2023-01-01T12:00:00Z":
+                return MockResponse(400)
+
+            return windowed(url, params=params, **kwargs)
+
+        with mock.patch.object(self.arch.session, "get") as mock_get:
+            mock_get.side_effect = failing
+            with self.assertRaises(ArchivistBadRequestError):
+                list(self.arch.events.list(page_size=2, partition=PARTITION))
@@ -0,0 +1,231 @@
+"""
+Test poller
+"""
+
+from copy import copy
+from os import environ
+from threading import Thread
+from unittest import TestCase, mock
+
+from archivist.archivist import Archivist
+from archivist.errors import ArchivistUnconfirmedError
+from archivist.hooks import Hooks
+from archivist.logger import set_logger
+from archivist.poller import AdaptiveSchedule, Deadline, Poller
+from archivist.proof_mechanism import ProofMechanism
+
+from .mock_response import MockResponse
+from .testassetsconstants import IDENTITY, RESPONSE, RESPONSE_PENDING
+
+# pylint: disable=missing-docstring
+# pylint: disable=protected-access
+
+if "RKVST_LOGLEVEL" in environ and environ["RKVST_LOGLEVEL"]:
+    set_logger(environ["RKVST_LOGLEVEL"])
+
+
+class Waits(Hooks):
+    def __init__(self):
+        self.waits = []
+
+    def on_wait(self, label, identity, elapsed, ok):
+        self.waits.append((label, identity, ok))
+
+
+class TestPoller(TestCase):
+    """
+    Test Poller
+    """
+
+    def setUp(self):
+        self.now = 0.0
+
+        def sleep(secs):
+            self.now += secs
+
+        for name, value in (("monotonic", lambda: self.now), ("sleep", sleep)):
+            patch = mock.patch(f"archivist.poller.{name}", value)
+            patch.start()
+            self.addCleanup(patch.stop)
+
+        self.hooks = Waits()
+
+    def test_deadline(self):
+        """
+        Test deadline
+        """
+        deadline = Deadline(10, self.now)
+        self.now += 4
+        self.assertEqual(
+            (deadline.elapsed, deadline.remaining, deadline.expired),
+            (4, 6, False),
+            msg="Incorrect deadline",
+        )
+        self.now += 7
+        self.assertEqual(
+            (deadline.remaining, deadline.expired),
+            (0, True),
+            msg="deadline must have expired",
+        )
+
+    def test_poller_poll(self):
+        """
+        Test poll returns the first value
+        """
+        results = iter((None, None, "done"))
+        poller = Poller(100, hooks=[self.hooks])
+        self.assertEqual(
+            poller.poll("upload", "x", lambda: next(results), ValueError),
+            "done",
+            msg="Incorrect result",
+        )
+        self.assertEqual(
+            self.hooks.waits,
+            [("upload", "x", True)],
+            msg="wait must be reported",
+        )
+
+    def test_poller_giveup(self):
+        """
+        Test poll gives up at the deadline
+        """
+        poller = Poller(10, cap=2, hooks=[self.hooks])
+        with self.assertRaises(ValueError) as ex:
+            poller.poll("upload", "x", lambda: None, ValueError)
+
+        self.assertEqual(
+            ex.exception.args[0],
+            10,
+            msg="must give up at the deadline",
+        )
+        self.assertEqual(
+            self.hooks.waits,
+            [("upload", "x", False)],
+            msg="timeout must be reported",
+        )
+
+    def test_adaptive_schedule_percentiles(self):
+        """
+        Test learned percentiles
+        """
+        schedule = AdaptiveSchedule(window=100, min_samples=4)
+        key = ProofMechanism.SIMPLE_HASH.name
+        for latency in range(3):
+            schedule.observe(key, latency + 1.0)
+
+        self.assertEqual(
+            schedule.percentiles(key),
+            {},
+            msg="too few samples to learn",
+        )
+        for latency in range(3, 100):
+            schedule.observe(key, latency + 1.0)
+
+        self.assertEqual(
+            schedule.percentiles(key),
+            {"p50": 50.0, "p75": 75.0, "p90": 90.0, "p99": 99.0},
+            msg="Incorrect percentiles",
+        )
+        self.assertEqual(
+            schedule.stats(),
+            {key: schedule.percentiles(key)},
+            msg="Incorrect stats",
+        )
+        self.assertEqual(
+            schedule.percentiles(ProofMechanism.KHIPU.name),
+            {},
+            msg="each proof mechanism has its own distribution",
+        )
+
+    def test_poller_adaptive(self):
+        """
+        Test polls are scheduled at the learned percentiles
+        """
+        schedule = AdaptiveSchedule(min_samples=1, percentiles=(50, 90))
+        schedule.observe("khipu", 3.2)
+        schedule.observe("khipu", 4.0)
+        polls = []
+
+        def check():
+            polls.append(self.now)
+            return "done" if self.now >= 3.5 else None
+
+        poller = Poller(100, schedule=schedule)
+        self.assertEqual(
+            poller.poll("confirmation", "x", check, ValueError, key=lambda: "khipu"),
+            "done",
+            msg="Incorrect result",
+        )
+        self.assertEqual(
+            polls,
+            [0.0, 3.2, 4.0],
+            msg="polls must be scheduled at the learned percentiles",
+        )
+        self.assertEqual(
+            sorted(schedule._latencies["khipu"]),
+            [3.2, 3.6, 4.0],
+            msg="latency must be learned",
+        )
+
+
+class TestPollerArchivist(TestCase):
+    """
+    Test independent deadlines of Archivist instances
+    """
+
+    def test_poller_independent_max_time(self):
+        """
+        Test concurrent waits with different max_time
+        """
+        errors = {}
+
+        def wait(max_time):
+            with Archivist("url", "authauthauth", max_time=max_time) as arch:
+                arch._poller = Poller(max_time, base=0.01)
+                with mock.patch.object(arch.session, "get") as mock_get:
+                    mock_get.return_value = MockResponse(200, **RESPONSE_PENDING)
+                    with self.assertRaises(ArchivistUnconfirmedError) as ex:
+                        arch.assets.wait_for_confirmation("assets/xxxxxxxx")
+
+                    errors[max_time] = ex.exception
+
+        threads = [Thread(target=wait, args=(t,)) for t in (0.05, 0.3)]
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        for max_time, error in errors.items():
+            elapsed = float(str(error).split(" after ")[1].split()[0])
+            self.assertAlmostEqual(
+                elapsed,
+                max_time,
+                delta=0.05,
+                msg="each wait must have its own deadline",
+            )
+
+    def test_poller_learns_proof_mechanism(self):
+        """
+        Test confirmation latency is learned per proof mechanism
+        """
+        with Archivist("url", "authauthauth", max_time=10) as arch:
+            arch._poller = Poller(10, base=0.01, schedule=AdaptiveSchedule())
+            with mock.patch.object(arch.session, "get") as mock_get:
+                mock_get.return_value = MockResponse(
+                    200,
+                    proof_mechanism=ProofMechanism.KHIPU.name,
+                    **RESPONSE,
+                )
+                arch.assets.wait_for_confirmation(IDENTITY)
+
+            self.assertEqual(
+                list(arch.poller.schedule._latencies),
+                [ProofMechanism.KHIPU.name],
+                msg="latency must be keyed by proof mechanism",
+            )
+            self.assertIs(
+                copy(arch).poller.schedule,
+                arch.poller.schedule,
+                msg="copies must share the learned latencies",
+            )
@@ -0,0 +1,167 @@
+"""
+Test connection pool options
+"""
+
+from copy import copy
+from os import environ
+from threading import Barrier, Thread
+from unittest import TestCase
+
+from archivist.archivist import Archivist
+from archivist.archivistpublic import ArchivistPublic
+from archivist.logger import set_logger
+from archivist.pool import PoolOptions, POOL_CONNECTIONS, POOL_MAXSIZE
+
+# pylint: disable=missing-docstring
+# pylint: disable=protected-access
+
+if "RKVST_LOGLEVEL" in environ and environ["RKVST_LOGLEVEL"]:
+    set_logger(environ["RKVST_LOGLEVEL"])
+
+
+class TestPoolOptions(TestCase):
+    """
+    Test PoolOptions
+    """
+
+    def test_pool_options_default(self):
+        """
+        Test default pool options
+        """
+        session = PoolOptions().session()
+        adapter = session.get_adapter("https://app.rkvst.io")
+        self.assertEqual(
+            adapter._pool_connections,
+            POOL_CONNECTIONS,
+            msg="Incorrect pool connections",
+        )
+        self.assertEqual(
+            adapter._pool_maxsize,
+            POOL_MAXSIZE,
+            msg="Incorrect pool maxsize",
+        )
+        self.assertFalse(
+            adapter._pool_block,
+            msg="pool must not block",
+        )
+        self.assertEqual(
+            session.headers["Connection"],
+            "keep-alive",
+            msg="Connection header must be keep-alive",
+        )
+        session.close()
+
+    def test_pool_options(self):
+        """
+        Test pool options
+        """
+        session = PoolOptions(
+            connections=2,
+            maxsize=32,
+            block=True,
+            keep_alive=False,
+        ).session()
+        for url in ("https://app.rkvst.io", "http://localhost"):
+            adapter = session.get_adapter(url)
+            self.assertEqual(
+                adapter._pool_connections,
+                2,
+                msg="Incorrect pool connections",
+            )
+            self.assertEqual(
+                adapter._pool_maxsize,
+                32,
+                msg="Incorrect pool maxsize",
+            )
+            self.assertTrue(
+                adapter._pool_block,
+                msg="pool must block",
+            )
+
+        self.assertEqual(
+            session.headers["Connection"],
+            "close",
+            msg="Connection header must be close",
+        )
+        session.close()
+
+
+class TestArchivistPool(TestCase):
+    """
+    Test pool options in Archivist
+    """
+
+    def test_archivist_pool(self):
+        """
+        Test archivist with pool options
+        """
+        pool = PoolOptions(maxsize=32)
+        with Archivist("https://app.rkvst.io", "authauthauth", pool=pool) as arch:
+            self.assertEqual(
+                arch.pool,
+                pool,
+                msg="Incorrect pool",
+            )
+            self.assertEqual(
+                arch.session.get_adapter(arch.url)._pool_maxsize,
+                32,
+                msg="Incorrect pool maxsize",
+            )
+            self.assertEqual(
+                copy(arch).pool,
+                pool,
+                msg="Incorrect copied pool",
+            )
+            self.assertEqual(
+                arch.Public.pool,
+                pool,
+                msg="Incorrect public pool",
+            )
+
+    def test_public_pool(self):
+        """
+        Test public with pool options
+        """
+        pool = PoolOptions(block=True)
+        with ArchivistPublic(pool=pool) as public:
+            self.assertEqual(
+                copy(public).pool,
+                pool,
+                msg="Incorrect copied pool",
+            )
+
+    def test_archivist_session_shared(self):
+        """
+        Test that all threads share the same session
+        """
+        threads = 16
+        barrier = Barrier(threads)
+        sessions = []
+
+        with Archivist("https://app.rkvst.io", "authauthauth") as arch:
+
+            def get_session():
+                barrier.wait()
+                sessions.append(arch.session)
+
+            workers = [Thread(target=get_session) for _ in range(threads)]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+
+            self.assertEqual(
+                len(sessions),
+                threads,
+                msg="Incorrect number of sessions",
+            )
+            self.assertEqual(
+                len(set(id(s) for s in sessions)),
+                1,
+                msg="All threads must share one session",
+            )
+
+        self.assertIsNone(
+            arch._session,
+            msg="session must be closed",
+        )
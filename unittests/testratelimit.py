@@ -0,0 +1,199 @@
+"""
+Test rate limiter
+"""
+
+from os import environ
+from os.path import join
+from tempfile import TemporaryDirectory
+from unittest import TestCase, mock
+
+from archivist.archivist import Archivist
+from archivist.constants import HEADERS_RETRY_AFTER
+from archivist.logger import set_logger
+from archivist.ratelimit import RateLimiter
+from archivist.retry import RetryPolicy
+
+from .mock_response import MockResponse
+
+# pylint: disable=missing-docstring
+# pylint: disable=protected-access
+
+if "RKVST_LOGLEVEL" in environ and environ["RKVST_LOGLEVEL"]:
+    set_logger(environ["RKVST_LOGLEVEL"])
+
+
+class Clock:
+    """fake clock where sleeping advances time"""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+
+    def time(self):
+        return self.now
+
+    def sleep(self, secs):
+        self.slept.append(secs)
+        self.now += secs
+
+
+class TestRateLimiter(TestCase):
+    """
+    Test RateLimiter
+    """
+
+    def setUp(self):
+        self.clock = Clock()
+        patches = (
+            mock.patch("archivist.ratelimit.time", self.clock.time),
+            mock.patch("archivist.ratelimit.sleep", self.clock.sleep),
+        )
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def test_ratelimit_burst(self):
+        """
+        Test requests wait when the burst is used
+        """
+        limiter = RateLimiter(rate=10, burst=2)
+        for _ in range(4):
+            limiter.acquire()
+
+        self.assertAlmostEqual(
+            sum(self.clock.slept),
+            0.2,
+            msg="Incorrect wait",
+        )
+
+    def test_ratelimit_fractional_rate(self):
+        """
+        Test a rate below one request per second still sends requests
+        """
+        limiter = RateLimiter(rate=0.5)
+        for _ in range(3):
+            limiter.acquire()
+
+        self.assertAlmostEqual(
+            sum(self.clock.slept),
+            4.0,
+            msg="Incorrect wait",
+        )
+        with self.assertRaises(ValueError):
+            RateLimiter(rate=0.5, burst=0.5)
+
+    def test_ratelimit_429(self):
+        """
+        Test 429 decreases the rate once and blocks until reset
+        """
+        limiter = RateLimiter(rate=10, min_rate=4)
+        limiter.update(429, 2.0)
+        limiter.update(429, 2.0)
+        self.assertEqual(
+            limiter.rate,
+            5,
+            msg="rate must only be decreased once",
+        )
+        limiter.acquire()
+        self.assertAlmostEqual(
+            sum(self.clock.slept),
+            2.0,
+            msg="must wait for reset",
+        )
+        self.clock.now += 10
+        limiter.update(429)
+        self.assertEqual(
+            limiter.rate,
+            4,
+            msg="rate must not be less than min_rate",
+        )
+
+    def test_ratelimit_increase(self):
+        """
+        Test successful requests increase the rate
+        """
+        limiter = RateLimiter(rate=10, max_rate=11, increase=5)
+        limiter.update(200)
+        self.assertAlmostEqual(
+            limiter.rate,
+            10.5,
+            msg="Incorrect additive increase",
+        )
+        for _ in range(10):
+            limiter.update(200)
+
+        self.assertEqual(
+            limiter.rate,
+            11,
+            msg="rate must not be more than max_rate",
+        )
+        limiter.update(404)
+        self.assertEqual(
+            limiter.rate,
+            11,
+            msg="other errors must not change rate",
+        )
+
+    def test_ratelimit_file(self):
+        """
+        Test limiters with the same file share the bucket
+        """
+        with TemporaryDirectory() as tmpdir:
+            path = join(tmpdir, "ratelimit")
+            first = RateLimiter(rate=10, burst=2, path=path)
+            second = RateLimiter(rate=10, burst=2, path=path)
+            first.acquire()
+            first.acquire()
+            second.acquire()
+            self.assertAlmostEqual(
+                sum(self.clock.slept),
+                0.1,
+                msg="bucket must be shared",
+            )
+            second.update(429, 1.0)
+            self.assertEqual(
+                first.rate,
+                5,
+                msg="rate must be shared",
+            )
+
+
+class TestArchivistRateLimit(TestCase):
+    """
+    Test rate limiter in Archivist
+    """
+
+    def test_archivist_ratelimit(self):
+        """
+        Test every request is rate limited
+        """
+        limiter = RateLimiter(rate=100)
+        with Archivist(
+            "https://app.rkvst.io",
+            "authauthauth",
+            retry=RetryPolicy(base=0.001, cap=0.01),
+            rate_limiter=limiter,
+        ) as arch:
+            self.assertIs(
+                arch.Public.rate_limiter,
+                limiter,
+                msg="limiter must be shared",
+            )
+            with mock.patch.object(arch.session, "get") as mock_get, mock.patch.object(
+                limiter, "acquire", wraps=limiter.acquire
+            ) as mock_acquire:
+                mock_get.side_effect = (
+                    MockResponse(429, headers={HEADERS_RETRY_AFTER: 0.01}),
+                    MockResponse(200, identity="assets/xxxxxxxx"),
+                )
+                arch.get("path/path")
+                self.assertEqual(
+                    mock_acquire.call_count,
+                    2,
+                    msg="every request must be rate limited",
+                )
+                self.assertLess(
+                    limiter.rate,
+                    100,
+                    msg="rate must be decreased",
+                )
@@ -0,0 +1,230 @@
+"""
+Test retry policy
+"""
+
+from copy import copy
+from os import environ
+from unittest import TestCase, mock
+
+from requests.exceptions import ConnectionError as RequestsConnectionError
+from requests.exceptions import ConnectTimeout
+
+from archivist.archivist import Archivist
+from archivist.constants import HEADERS_RETRY_AFTER
+from archivist.errors import (
+    Archivist5xxError,
+    ArchivistTooManyRequestsError,
+    ArchivistUnavailableError,
+)
+from archivist.logger import set_logger
+from archivist.retry import RetryPolicy
+
+from .mock_response import MockResponse
+
+# pylint: disable=missing-docstring
+# pylint: disable=protected-access
+
+if "RKVST_LOGLEVEL" in environ and environ["RKVST_LOGLEVEL"]:
+    set_logger(environ["RKVST_LOGLEVEL"])
+
+RESPONSE = {"identity": "assets/xxxxxxxx"}
+POLICY = RetryPolicy(base=0.001, cap=0.01)
+
+
+class TestRetryPolicy(TestCase):
+    """
+    Test RetryPolicy backoff
+    """
+
+    def test_retry_backoff(self):
+        """
+        Test decorrelated jitter is bounded
+        """
+        policy = RetryPolicy(base=0.5, cap=4.0)
+        wait = 0.0
+        for _ in range(100):
+            wait = policy.backoff(wait)
+            self.assertTrue(
+                0.5 <= wait <= 4.0,
+                msg=f"Incorrect wait {wait}",
+            )
+
+    def test_retry_backoff_floor(self):
+        """
+        Test retry-after is a floor on the wait even when above the cap
+        """
+        self.assertEqual(
+            RetryPolicy(base=0.5, cap=4.0).backoff(0.5, 10.0),
+            10.0,
+            msg="retry-after must be a floor",
+        )
+
+
+class TestArchivistRetry(TestCase):
+    """
+    Test Archivist retries
+    """
+
+    maxDiff = None
+
+    def setUp(self):
+        self.arch = Archivist("https://app.rkvst.io", "authauthauth", retry=POLICY)
+
+    def tearDown(self):
+        self.arch.close()
+
+    def test_retry_default(self):
+        """
+        Test default policy
+        """
+        with Archivist("https://app.rkvst.io", "authauthauth") as arch:
+            self.assertEqual(
+                arch.retry,
+                RetryPolicy(),
+                msg="Incorrect default policy",
+            )
+            self.assertEqual(
+                copy(self.arch).retry,
+                POLICY,
+                msg="Incorrect copied policy",
+            )
+            self.assertEqual(
+                self.arch.Public.retry,
+                POLICY,
+                msg="Incorrect public policy",
+            )
+
+    def test_retry_get_5xx(self):
+        """
+        Test GET is retried after 503 and 502
+        """
+        with mock.patch.object(self.arch.session, "get") as mock_get:
+            mock_get.side_effect = (
+                MockResponse(503),
+                MockResponse(502),
+                MockResponse(200, **RESPONSE),
+            )
+            self.assertEqual(
+                self.arch.get("path/path"),
+                RESPONSE,
+                msg="Incorrect response",
+            )
+            self.assertEqual(
+                self.arch.retries,
+                {"5xx": 2},
+                msg="Incorrect retry counts",
+            )
+
+    def test_retry_get_connection_error_and_fail(self):
+        """
+        Test GET is retried after connection errors until retries are exhausted
+        """
+        with mock.patch.object(self.arch.session, "get") as mock_get:
+            mock_get.side_effect = RequestsConnectionError("reset")
+            with self.assertRaises(RequestsConnectionError):
+                self.arch.get("path/path")
+
+            self.assertEqual(
+                mock_get.call_count,
+                POLICY.retries + 1,
+                msg="Incorrect number of attempts",
+            )
+
+    def test_retry_post_5xx(self):
+        """
+        Test POST is not retried after 5xx
+        """
+        with mock.patch.object(self.arch.session, "post") as mock_post:
+            mock_post.return_value = MockResponse(503)
+            with self.assertRaises(ArchivistUnavailableError):
+                self.arch.post("path/path", {"field": "value"})
+
+            self.assertEqual(
+                mock_post.call_count,
+                1,
+                msg="POST must not be retried",
+            )
+
+    def test_retry_post_5xx_retry_writes(self):
+        """
+        Test POST is retried after 5xx when retry_writes is set
+        """
+        with Archivist(
+            "https://app.rkvst.io",
+            "authauthauth",
+            retry=RetryPolicy(base=0.001, cap=0.01, retry_writes=True),
+        ) as arch:
+            with mock.patch.object(arch.session, "post") as mock_post:
+                mock_post.side_effect = (
+                    MockResponse(500),
+                    MockResponse(200, **RESPONSE),
+                )
+                self.assertEqual(
+                    arch.post("path/path", {"field": "value"}),
+                    RESPONSE,
+                    msg="Incorrect response",
+                )
+
+    def test_retry_post_429_and_connect_timeout(self):
+        """
+        Test POST is retried when the request was not processed
+        """
+        with mock.patch.object(self.arch.session, "post") as mock_post:
+            mock_post.side_effect = (
+                MockResponse(429, headers={HEADERS_RETRY_AFTER: 0.01}),
+                ConnectTimeout("timeout"),
+                MockResponse(200, **RESPONSE),
+            )
+            self.assertEqual(
+                self.arch.post("path/path", {"field": "value"}),
+                RESPONSE,
+                msg="Incorrect response",
+            )
+            self.assertEqual(
+                self.arch.retries,
+                {"429": 1, "connect_timeout": 1},
+                msg="Incorrect retry counts",
+            )
+
+    def test_retry_429_no_header(self):
+        """
+        Test 429 without retry-after is not retried
+        """
+        with mock.patch.object(self.arch.session, "get") as mock_get:
+            mock_get.return_value = MockResponse(429)
+            with self.assertRaises(ArchivistTooManyRequestsError):
+                self.arch.get("path/path")
+
+            self.assertEqual(
+                mock_get.call_count,
+                1,
+                msg="429 without retry-after must not be retried",
+            )
+
+    def test_retry_budget(self):
+        """
+        Test retries stop when the budget is exhausted
+        """
+        with Archivist(
+            "https://app.rkvst.io",
+            "authauthauth",
+            retry=RetryPolicy(base=0.001, cap=0.01, budget=2),
+        ) as arch:
+            with mock.patch.object(arch.session, "get") as mock_get:
+                mock_get.return_value = MockResponse(500)
+                with self.assertRaises(Archivist5xxError):
+                    arch.get("path/path")
+
+                with self.assertRaises(Archivist5xxError):
+                    arch.get("path/path")
+
+                self.assertEqual(
+                    mock_get.call_count,
+                    4,
+                    msg="Incorrect number of attempts",
+                )
+                self.assertEqual(
+                    arch.retries,
+                    {"5xx": 2, "budget_exhausted": 2},
+                    msg="Incorrect retry counts",
+                )
@@ -0,0 +1,106 @@
+"""
+Test response ring buffer
+"""
+
+from copy import copy
+from os import environ
+from unittest import TestCase, mock
+
+from archivist.archivist import Archivist
+from archivist.constants import HEADERS_CONTENT_LENGTH
+from archivist.logger import set_logger
+from archivist.ringbuffer import ResponseRecord, RingBufferMode
+
+from .mock_response import MockResponse
+
+# pylint: disable=missing-docstring
+# pylint: disable=protected-access
+
+if "RKVST_LOGLEVEL" in environ and environ["RKVST_LOGLEVEL"]:
+    set_logger(environ["RKVST_LOGLEVEL"])
+
+
+class TestRingBuffer(TestCase):
+    """
+    Test response ring buffer modes
+    """
+
+    def test_ringbuffer_full(self):
+        """
+        Test full responses are retained by default
+        """
+        with Archivist("https://app.rkvst.io", "authauthauth") as arch:
+            self.assertEqual(
+                arch.ring_buffer,
+                RingBufferMode.FULL,
+                msg="Incorrect default mode",
+            )
+            with mock.patch.object(arch.session, "get") as mock_get:
+                responses = [MockResponse(200, n=n) for n in range(12)]
+                mock_get.side_effect = responses
+                for _ in responses:
+                    arch.get("path/path")
+
+            self.assertEqual(
+                arch.last_response(responses=20),
+                responses[::-1][: arch.RING_BUFFER_MAX_LEN],
+                msg="Incorrect responses",
+            )
+
+    def test_ringbuffer_metadata(self):
+        """
+        Test only metadata is retained
+        """
+        with Archivist(
+            "https://app.rkvst.io",
+            "authauthauth",
+            ring_buffer=RingBufferMode.METADATA,
+        ) as arch:
+            with mock.patch.object(arch.session, "get") as mock_get:
+                mock_get.return_value = MockResponse(
+                    200,
+                    headers={HEADERS_CONTENT_LENGTH: "123"},
+                    identity="assets/xxxxxxxx",
+                )
+                arch.get("path/path")
+
+            (record,) = arch.last_response()
+            self.assertIsInstance(
+                record,
+                ResponseRecord,
+                msg="Incorrect record type",
+            )
+            self.assertEqual(
+                (record.method, record.url, record.status_code, record.size, record.ok),
+                ("get", "url", 200, 123, True),
+                msg="Incorrect record",
+            )
+            self.assertEqual(
+                copy(arch).ring_buffer,
+                RingBufferMode.METADATA,
+                msg="mode must be copied",
+            )
+            self.assertEqual(
+                arch.Public.ring_buffer,
+                RingBufferMode.METADATA,
+                msg="mode must be passed to Public",
+            )
+
+    def test_ringbuffer_off(self):
+        """
+        Test nothing is retained
+        """
+        with Archivist(
+            "https://app.rkvst.io",
+            "authauthauth",
+            ring_buffer=RingBufferMode.OFF,
+        ) as arch:
+            with mock.patch.object(arch.session, "get") as mock_get:
+                mock_get.return_value = MockResponse(200)
+                arch.get("path/path")
+
+            self.assertEqual(
+                arch.last_response(),
+                [],
+                msg="nothing must be retained",
+            )
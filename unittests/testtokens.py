@@ -0,0 +1,325 @@
+"""
+Test token manager
+"""
+
+from copy import copy
+from os import environ, listdir, stat
+from os.path import join
+from stat import S_IMODE
+from tempfile import TemporaryDirectory
+from threading import Event, Thread
+from unittest import TestCase, mock
+
+from archivist.archivist import Archivist
+from archivist.errors import ArchivistError
+from archivist.logger import set_logger
+from archivist.tokencache import FileTokenCache, _token_key
+from archivist.tokens import _TokenManager
+
+# pylint: disable=missing-docstring
+# pylint: disable=protected-access
+# pylint: disable=too-few-public-methods
+
+if "RKVST_LOGLEVEL" in environ and environ["RKVST_LOGLEVEL"]:
+    set_logger(environ["RKVST_LOGLEVEL"])
+
+
+class Fetch:
+    """fake appidp token method that counts calls"""
+
+    def __init__(self, expires_in=100):
+        self.expires_in = expires_in
+        self.calls = 0
+        self.release = Event()
+        self.release.set()
+        self.error = None
+
+    def __call__(self):
+        self.release.wait(timeout=5)
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+
+        return {"access_token": f"token{self.calls}", "expires_in": self.expires_in}
+
+
+class TestTokenManager(TestCase):
+    """
+    Test token manager
+    """
+
+    def setUp(self):
+        self.now = 1000.0
+        patch = mock.patch("archivist.tokens.time", lambda: self.now)
+        patch.start()
+        self.addCleanup(patch.stop)
+        self.fetch = Fetch()
+        self.tokens = _TokenManager(self.fetch, expiry_margin=10, refresh_ratio=0.2)
+
+    def wait_for_refresh(self):
+        with self.tokens._refresh_lock:
+            pass
+
+    def test_tokens_cached(self):
+        """
+        Test token is only fetched once whilst valid
+        """
+        for _ in range(3):
+            self.assertEqual(
+                self.tokens.token(),
+                "token1",
+                msg="Incorrect token",
+            )
+
+        self.assertEqual(
+            self.fetch.calls,
+            1,
+            msg="token must be fetched once",
+        )
+        self.assertEqual(
+            self.tokens.expires_at,
+            1090.0,
+            msg="Incorrect expiry",
+        )
+
+    def test_tokens_background_refresh(self):
+        """
+        Test token near expiry is refreshed in the background
+        """
+        self.tokens.token()
+        self.now += 85
+        self.fetch.release.clear()
+        self.assertEqual(
+            self.tokens.token(),
+            "token1",
+            msg="current token must be returned whilst refreshing",
+        )
+        self.assertEqual(
+            self.tokens.token(),
+            "token1",
+            msg="current token must be returned whilst refreshing",
+        )
+        self.fetch.release.set()
+        self.wait_for_refresh()
+        self.assertEqual(
+            (self.tokens.token(), self.fetch.calls),
+            ("token2", 2),
+            msg="token must be refreshed once",
+        )
+
+    def test_tokens_background_refresh_fails(self):
+        """
+        Test failed background refresh keeps the current token
+        """
+        self.tokens.token()
+        self.now += 85
+        self.fetch.error = ArchivistError("unavailable")
+        with self.assertLogs("archivist.tokens", level="WARNING"):
+            self.tokens.token()
+            self.wait_for_refresh()
+
+        self.assertEqual(
+            self.tokens.token(),
+            "token1",
+            msg="current token must be kept",
+        )
+        self.assertEqual(
+            self.fetch.calls,
+            2,
+            msg="refresh must not be retried immediately",
+        )
+
+    def test_tokens_single_flight(self):
+        """
+        Test concurrent requests for an expired token make one token request
+        """
+        self.fetch.release.clear()
+        results = []
+        threads = [
+            Thread(target=lambda: results.append(self.tokens.token())) for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+
+        self.fetch.release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(
+            results,
+            ["token1"] * 8,
+            msg="Incorrect tokens",
+        )
+        self.assertEqual(
+            self.fetch.calls,
+            1,
+            msg="token must be fetched once",
+        )
+
+
+class TestFileTokenCache(TestCase):
+    """
+    Test token manager with a file token cache
+    """
+
+    def setUp(self):
+        self.now = 1000.0
+        patch = mock.patch("archivist.tokens.time", lambda: self.now)
+        patch.start()
+        self.addCleanup(patch.stop)
+        tmpdir = TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(tmpdir.cleanup)
+        self.directory = join(tmpdir.name, "tokens")
+        self.cache = FileTokenCache(self.directory)
+        self.key = _token_key("https://app.rkvst.io", "client_id")
+
+    def manager(self, fetch):
+        return _TokenManager(fetch, cache=self.cache, key=self.key)
+
+    def test_token_cache_shared(self):
+        """
+        Test a valid token is reused by another manager
+        """
+        first, second = Fetch(), Fetch()
+        self.assertEqual(
+            self.manager(first).token(),
+            "token1",
+            msg="Incorrect token",
+        )
+        self.now += 50
+        self.assertEqual(
+            self.manager(second).token(),
+            "token1",
+            msg="token must be read from cache",
+        )
+        self.assertEqual(
+            second.calls,
+            0,
+            msg="token must not be fetched",
+        )
+        self.assertEqual(
+            self.manager(second).expires_at,
+            0.0,
+            msg="cache must only be read when a token is needed",
+        )
+
+    def test_token_cache_expired(self):
+        """
+        Test a cached token near expiry is not reused
+        """
+        self.manager(Fetch()).token()
+        self.now += 85
+        second = Fetch()
+        second.calls = 1
+        self.assertEqual(
+            self.manager(second).token(),
+            "token2",
+            msg="token must be fetched",
+        )
+        self.assertEqual(
+            self.manager(Fetch()).token(),
+            "token2",
+            msg="new token must be cached",
+        )
+
+    def test_token_cache_permissions(self):
+        """
+        Test token files are only accessible by the owner
+        """
+        self.manager(Fetch()).token()
+        self.assertEqual(
+            listdir(self.directory),
+            [f"{self.key}.json"],
+            msg="Incorrect token file",
+        )
+        self.assertEqual(
+            S_IMODE(stat(self.directory).st_mode),
+            0o700,
+            msg="Incorrect directory permissions",
+        )
+        self.assertEqual(
+            S_IMODE(stat(join(self.directory, f"{self.key}.json")).st_mode),
+            0o600,
+            msg="Incorrect file permissions",
+        )
+
+    def test_token_cache_corrupt(self):
+        """
+        Test a corrupt token file is ignored
+        """
+        self.manager(Fetch()).token()
+        with open(
+            join(self.directory, f"{self.key}.json"), mode="w", encoding="utf-8"
+        ) as fd:
+            fd.write("{corrupt")
+
+        second = Fetch()
+        with self.assertLogs("archivist.tokencache", level="WARNING"):
+            self.manager(second).token()
+
+        self.assertEqual(
+            second.calls,
+            1,
+            msg="token must be fetched",
+        )
+
+
+class TestArchivistTokens(TestCase):
+    """
+    Test token manager in Archivist
+    """
+
+    def test_archivist_tokens_copy(self):
+        """
+        Test copies share the app registration token
+        """
+        with Archivist("https://app.rkvst.io", ("client_id", "secret")) as arch:
+            with mock.patch.object(arch.appidp, "token") as mock_token:
+                mock_token.return_value = {"access_token": "token", "expires_in": 600}
+                arch1 = copy(arch)
+                self.assertEqual(
+                    (arch.auth, arch1.auth),
+                    ("token", "token"),
+                    msg="Incorrect auth",
+                )
+                self.assertEqual(
+                    mock_token.call_count,
+                    1,
+                    msg="token must be shared",
+                )
+
+    def test_archivist_token_cache(self):
+        """
+        Test instances share the token through the cache
+        """
+        with TemporaryDirectory() as tmpdir:
+            cache = FileTokenCache(tmpdir)
+            calls = []
+            for _ in range(2):
+                with Archivist(
+                    "https://app.rkvst.io",
+                    ("client_id", "secret"),
+                    token_cache=cache,
+                ) as arch:
+                    with mock.patch.object(arch.appidp, "token") as mock_token:
+                        mock_token.return_value = {
+                            "access_token": "token",
+                            "expires_in": 600,
+                        }
+                        self.assertEqual(
+                            arch.auth,
+                            "token",
+                            msg="Incorrect auth",
+                        )
+                        calls.append(mock_token.call_count)
+
+            self.assertEqual(
+                calls,
+                [1, 0],
+                msg="token must only be fetched once",
+            )
+            self.assertEqual(
+                listdir(tmpdir),
+                [f"{_token_key('https://app.rkvst.io', 'client_id')}.json"],
+                msg="Incorrect token file",
+            )